@@ -0,0 +1,81 @@
+"""
+Import-time regression benchmark.
+
+Runs `import pipedrive` plus a constant lookup in fresh interpreters and fails
+when the median exceeds the budget or when a heavy dependency is imported.
+`--target` picks the lookup, e.g. `pipedrive.Person.CustomFields.job_title`
+to time a cold import of `pipedrive.person`.
+
+    python benchmarks/import_time.py [--budget-ms 30] [--runs 15] [--target ...]
+"""
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["requests", "urllib3", "charset_normalizer", "chardet"]
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import pipedrive
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed_ms": elapsed * 1000,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+DEFAULT_TARGET = "pipedrive.Deal.Stage.sales_sql"
+
+
+def measure(runs: int, target: str = DEFAULT_TARGET) -> tuple[list[float], list[str]]:
+    timings = []
+    loaded = set()
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET % (target, HEAVY_MODULES)],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["elapsed_ms"])
+        loaded.update(result["loaded"])
+
+    return timings, sorted(loaded)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=30.0)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--target", default=DEFAULT_TARGET)
+    args = parser.parse_args()
+
+    timings, loaded = measure(args.runs, args.target)
+    median = statistics.median(timings)
+
+    print(f"import pipedrive, {args.target}: median {median:.2f} ms, min {min(timings):.2f} ms")
+
+    if loaded:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(loaded)}")
+        return 1
+
+    if median > args.budget_ms:
+        print(f"FAIL: median above budget of {args.budget_ms:.2f} ms")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
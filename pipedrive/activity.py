@@ -0,0 +1,470 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .pagination import iter_pages
+from .scheduling import BACKGROUND, prioritized
+from .tracking import TrackedModel
+from .unit_of_work import UpdateBuffer
+
+if TYPE_CHECKING:
+    from .watch import Watcher
+
+
+class Activity(TrackedModel):
+    @dataclass
+    class Type:
+        meeting = "meeting"
+        no_show = "no_show"
+        follow_up = "task"
+        proposal_sent = "deadline"
+        contract_sent = "contract_sent"
+        email = "email"
+        call = "call"
+        start_trial = "start_trial"
+        start_a_poc = "lunch"
+        signup = "sign_up"
+        contact_sent = "contact_sent"
+        task = "task1"
+        petit_comite = "petit_comite"
+        trial_ended = "trial_ended"
+
+    _tracked_fields = (
+        "deal_id",
+        "lead_id",
+        "subject",
+        "type",
+        "due_date",
+        "due_time",
+        "duration",
+        "note",
+        "done",
+        "participants_ids",
+    )
+
+    def __init__(self, **kwargs):
+        """
+        :param id: int
+        :param deal_id: int
+        :param lead_id: str
+        :param subject: str
+        :param type: str
+        :param due_date: str
+        :param due_time: str
+        :param duration: str
+        :param org_id: int
+        :param person_id: int
+        :param user_id: int
+        :param note: str
+        :param done: bool
+        :param participants_ids: list[int]
+        """
+
+        self.id = kwargs.get("id", None)
+        self.deal_id = kwargs.get("deal_id", None)
+        self.lead_id = kwargs.get("lead_id", None)
+        self.subject = kwargs.get("subject", None)
+        self.type = kwargs.get("type", None)
+        self.due_date = kwargs.get("due_date", None)
+        self.due_time = kwargs.get("due_time", None)
+        self.duration = kwargs.get("duration", None)
+        self.org_id = kwargs.get("org_id", None)
+        self.person_id = kwargs.get("person_id", None)
+        self.user_id = kwargs.get("user_id", None)
+        self.note = kwargs.get("note", None)
+        self.done = kwargs.get("done", False)
+
+        if "participants_ids" in kwargs:
+            self.participants_ids = (
+                kwargs["participants_ids"]
+                if kwargs["participants_ids"] is not None
+                else []
+            )
+        elif self.person_id is not None:
+            self.participants_ids = [self.person_id]
+        else:
+            self.participants_ids = []
+
+        self.mark_loaded()
+
+    @staticmethod
+    def create(**kwargs) -> "Activity":
+        """
+        Create a new activity in Pipedrive.
+
+        :param deal_id: int
+        :param lead_id: str
+        :param subject: str
+        :param type: str
+        :param note: str
+        :param due_date: str
+        :param due_time: str
+        :param duration: str
+        :param participants_ids: list[int]
+        :param done: bool
+        :return: Activity
+        """
+
+        if ("deal_id" not in kwargs and "lead_id" not in kwargs) or "subject" not in kwargs:
+            print("deal_id or lead_id and subject are required")
+            return None
+
+        url = encode_url(entity="activities")
+
+        data = {
+            "subject": kwargs["subject"],
+            "type": kwargs.get("type", "Meeting"),
+            "note": kwargs.get("note", None),
+            "due_date": kwargs.get("due_date", None),
+            "due_time": kwargs.get("due_time", None),
+            "duration": kwargs.get("duration", None),
+            "done": kwargs.get("done", False),
+        }
+
+        if "deal_id" in kwargs:
+            data["deal_id"] = kwargs["deal_id"]
+        if "lead_id" in kwargs:
+            data["lead_id"] = kwargs["lead_id"]
+
+        if "participants_ids" in kwargs:
+            data["participants"] = [
+                {"person_id": id, "primary_flag": False}
+                for id in kwargs["participants_ids"]
+            ]
+            data["participants"][0]["primary_flag"] = True
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating task - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return Activity(
+                id=response_json["data"]["id"],
+                deal_id=response_json["data"].get("deal_id"),
+                lead_id=response_json["data"].get("lead_id"),
+                subject=response_json["data"]["subject"],
+                type=response_json["data"]["type"],
+                due_date=response_json["data"]["due_date"],
+                due_time=response_json["data"]["due_time"],
+                duration=response_json["data"]["duration"],
+                org_id=response_json["data"]["org_id"],
+                person_id=response_json["data"]["person_id"],
+                user_id=response_json["data"].get("user_id"),
+                participants_ids=[
+                    r["person_id"] for r in response_json["data"]["participants"]
+                ]
+                if response_json["data"]["participants"] is not None
+                else None,
+                note=response_json["data"]["note"],
+                done=response_json["data"]["done"],
+            )
+
+    @staticmethod
+    def from_dict(data: dict) -> "Activity":
+        activity = Activity(**Activity._v1_kwargs(data))
+        activity.__dict__["_participants_read"] = True
+        return activity
+
+    @staticmethod
+    def _v1_kwargs(data: dict) -> dict:
+        return dict(
+            id=data["id"],
+            deal_id=data.get("deal_id"),
+            lead_id=data.get("lead_id"),
+            subject=data["subject"],
+            type=data["type"],
+            due_date=data["due_date"],
+            due_time=data["due_time"],
+            duration=data["duration"],
+            org_id=data["org_id"],
+            person_id=data["person_id"],
+            user_id=data.get("user_id"),
+            participants_ids=[r["person_id"] for r in data["participants"]]
+            if data["participants"] is not None
+            else None,
+            note=data["note"],
+            done=data["done"],
+        )
+
+    @staticmethod
+    @prioritized(BACKGROUND)
+    def get_all_activities() -> list["Activity"]:
+        url = encode_url(entity="activities", params={"limit": 500})
+
+        response = api.get(url)
+        response_json = response.json()
+
+        data = response_json["data"]
+        additional_data = response_json.get(
+            "additional_data", {"pagination": {"more_items_in_collection": False}}
+        )
+
+        while additional_data["pagination"]["more_items_in_collection"]:
+            new_url = url + f'&start={additional_data["pagination"]["next_start"]}'
+            response = api.get(new_url)
+            response_json = response.json()
+
+            data += response_json["data"]
+            additional_data = response_json.get(
+                "additional_data", {"pagination": {"more_items_in_collection": False}}
+            )
+
+        if data:
+            return [Activity.from_dict(result) for result in data]
+        else:
+            return []
+
+    @staticmethod
+    def iter_range(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        user_id: Optional[int] = None,
+        done: Optional[bool] = None,
+        type: Union[str, list[str], None] = None,
+        limit: int = 500,
+    ) -> Iterator["Activity"]:
+        """
+        Stream activities due in a date window, filtered server-side.
+
+        :param start_date: str YYYY-MM-DD, inclusive
+        :param end_date: str YYYY-MM-DD, inclusive
+        :param user_id: int owner, 0 for all users (default: the token's user)
+        :param done: bool, None for both
+        :param type: str or list[str] activity type keys, e.g. Activity.Type.meeting
+        :param limit: int page size
+        :return: Iterator[Activity]
+        """
+
+        params = {"limit": limit}
+
+        if start_date is not None:
+            params["start_date"] = start_date
+        if end_date is not None:
+            params["end_date"] = end_date
+        if user_id is not None:
+            params["user_id"] = user_id
+        if done is not None:
+            params["done"] = int(done)
+        if type is not None:
+            params["type"] = type if isinstance(type, str) else ",".join(type)
+
+        url = encode_url(entity="activities", params=params)
+
+        for page in iter_pages(url):
+            for result in page:
+                yield Activity.from_dict(result)
+
+    @staticmethod
+    def watch(**kwargs) -> "Watcher":
+        """
+        Stream activity changes by polling `recents`. Iterate with `for` or
+        `async for`; keyword arguments are passed to `Watcher`.
+
+        :return: Watcher yielding WatchEvents of Activities
+        """
+
+        from .watch import Watcher
+
+        return Watcher("activity", Activity.from_dict, **kwargs)
+
+    def update(self, **kwargs) -> "Activity":
+        """
+        Update an activity in Pipedrive.
+
+        :param deal_id: int
+        :param lead_id: str
+        :param subject: str
+        :param type: str
+        :param note: str
+        :param due_date: str
+        :param due_time: str
+        :param duration: str
+        :param participants_ids: list[int]
+        :param done: bool
+        :return: Activity
+        """
+
+        buffer = UpdateBuffer.current()
+        if buffer is not None:
+            return buffer.enqueue(self, kwargs)
+
+        data = Activity._update_payload(kwargs)
+
+        if "note" in kwargs:
+            note = kwargs["note"]
+            data["note"] = self.note + " / " + note if self.note is not None else note
+
+        if "participants_ids" in kwargs:
+            participants_ids = list(
+                set(kwargs["participants_ids"]).union(self.participants_ids)
+            )
+            data["participants"] = Activity._participants_payload(participants_ids)
+
+        result = self._put(data)
+
+        if result is not None:
+            return Activity.from_dict(result)
+
+    def save(self) -> Optional["Activity"]:
+        """
+        Send the fields changed since the activity was loaded and update this
+        object in place from the response. No request is made when nothing
+        changed. Unlike `update`, `note` and `participants_ids` are sent as
+        they are on the object instead of being appended.
+
+        :return: Activity self, or None if there's an error
+        """
+
+        changes = self.changed_fields()
+        if not changes:
+            return self
+
+        data = Activity._update_payload(changes)
+
+        if "note" in changes:
+            data["note"] = changes["note"]
+        if "participants_ids" in changes:
+            data["participants"] = Activity._participants_payload(
+                changes["participants_ids"] or []
+            )
+
+        result = self._put(data)
+        if result is None:
+            return None
+
+        self._patch(Activity._v1_kwargs(result))
+        return self
+
+    def set_participants(
+        self, participants_ids: Iterable[int], refresh: bool = False
+    ) -> Optional["Activity"]:
+        """
+        Make `participants_ids` the activity's participants. The current
+        list is read once (activities loaded from Pipedrive already carry
+        it), and nothing is sent when it already matches.
+
+        Participants that stay keep their order, so the primary participant
+        only changes if it is removed.
+
+        :param participants_ids: list[int] person ids
+        :param refresh: bool read the current participants again first
+        :return: Activity self, or None if there's an error
+        """
+
+        if refresh or not self.__dict__.get("_participants_read"):
+            url = encode_url(entity="activities", entity_id=self.id)
+
+            try:
+                response = api.get(url)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Error retrieving activity - {e}")
+                return None
+
+            self._patch(Activity._v1_kwargs(response.json()["data"]))
+            self.__dict__["_participants_read"] = True
+
+        wanted = list(dict.fromkeys(participants_ids))
+        current = self.participants_ids or []
+
+        if set(wanted) == set(current):
+            return self
+
+        participants_ids = [id for id in current if id in wanted]
+        participants_ids += [id for id in wanted if id not in participants_ids]
+
+        result = self._put(
+            {"participants": Activity._participants_payload(participants_ids)}
+        )
+        if result is None:
+            return None
+
+        self._patch(Activity._v1_kwargs(result))
+        return self
+
+    @staticmethod
+    def _update_payload(kwargs: dict) -> dict:
+        data = {}
+
+        if "deal_id" in kwargs:
+            data["deal_id"] = kwargs["deal_id"]
+        if "lead_id" in kwargs:
+            data["lead_id"] = kwargs["lead_id"]
+        if "subject" in kwargs:
+            data["subject"] = kwargs["subject"]
+        if "type" in kwargs:
+            data["type"] = kwargs["type"]
+        if "due_date" in kwargs:
+            data["due_date"] = kwargs["due_date"]
+        if "due_time" in kwargs:
+            data["due_time"] = kwargs["due_time"]
+        if "duration" in kwargs:
+            data["duration"] = kwargs["duration"]
+        if "done" in kwargs:
+            data["done"] = kwargs["done"]
+
+        return data
+
+    @staticmethod
+    def _participants_payload(participants_ids: list[int]) -> list[dict]:
+        participants = [
+            {"person_id": id, "primary_flag": False} for id in participants_ids
+        ]
+        if participants:
+            participants[0]["primary_flag"] = True
+        return participants
+
+    def _put(self, data: dict) -> Optional[dict]:
+        url = encode_url(entity="activities", entity_id=self.id)
+
+        try:
+            response = api.put(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error updating activity - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return response_json["data"]
+
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "deal_id": self.deal_id,
+            "lead_id": self.lead_id,
+            "subject": self.subject,
+            "type": self.type,
+            "due_date": self.due_date,
+            "due_time": self.due_time,
+            "duration": self.duration,
+            "org_id": self.org_id,
+            "person_id": self.person_id,
+            "user_id": self.user_id,
+            "note": self.note,
+            "done": self.done,
+            "participants_ids": self.participants_ids,
+        }
+
+    @staticmethod
+    def current_date():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def current_time():
+        return datetime.now(timezone.utc).strftime("%H:%M")
@@ -0,0 +1,196 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional, Union
+
+from .activity import Activity
+
+Moment = Union[datetime, date, str]
+
+
+def _to_datetime(value: Moment) -> datetime:
+    """Naive UTC datetime from a datetime, date or "YYYY-MM-DD[ HH:MM]" string."""
+
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return value
+
+
+def _duration(value: Optional[str]) -> timedelta:
+    """Parse Pipedrive durations, "HH:MM" or a number of minutes."""
+
+    if not value:
+        return timedelta()
+
+    if ":" in value:
+        hours, minutes = value.split(":")[:2]
+        return timedelta(hours=int(hours), minutes=int(minutes))
+
+    return timedelta(minutes=int(value))
+
+
+def activity_interval(activity: Activity) -> Optional[tuple[datetime, datetime]]:
+    """
+    The [start, end) UTC interval an activity occupies.
+
+    Activities without `due_time` span their whole `due_date`; activities
+    without a due date have no interval.
+    """
+
+    if not activity.due_date:
+        return None
+
+    day = datetime.fromisoformat(activity.due_date)
+
+    if not activity.due_time:
+        return day, day + timedelta(days=1)
+
+    start = datetime.combine(day.date(), time.fromisoformat(activity.due_time))
+    return start, start + _duration(activity.duration)
+
+
+class ActivityIndex:
+    """
+    Static interval index over activity due windows.
+
+    Activities are sorted by start and laid out as an implicit balanced tree
+    where each node stores the latest end in its subtree, so window and
+    conflict queries cost O(log n + k) for k matches.
+
+        index = ActivityIndex(Activity.iter_range("2024-05-01", "2024-05-31"))
+        index.overlapping("2024-05-06 14:00", "2024-05-06 15:00")
+    """
+
+    def __init__(self, activities: Iterable[Activity]):
+        entries = []
+        for activity in activities:
+            interval = activity_interval(activity)
+            if interval is not None:
+                entries.append((interval[0], interval[1], activity))
+
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._activities = [entry[2] for entry in entries]
+        self._max_end = list(self._ends)
+
+        self._build(0, len(entries))
+
+    def __len__(self) -> int:
+        return len(self._activities)
+
+    def _build(self, lo: int, hi: int) -> Optional[datetime]:
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) // 2
+        latest = self._ends[mid]
+
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > latest:
+                latest = child
+
+        self._max_end[mid] = latest
+        return latest
+
+    def _search(self, start: datetime, end: datetime) -> list[int]:
+        matches = []
+        stack = [(0, len(self._activities))]
+
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= start:
+                continue
+
+            stack.append((lo, mid))
+
+            if self._starts[mid] < end:
+                if self._ends[mid] > start:
+                    matches.append(mid)
+                stack.append((mid + 1, hi))
+
+        matches.sort()
+        return matches
+
+    def overlapping(
+        self, start: Moment, end: Moment, user_id: Optional[int] = None
+    ) -> list[Activity]:
+        """
+        Activities whose interval intersects [start, end), ordered by start.
+
+        :param start: datetime, date or ISO string (UTC)
+        :param end: datetime, date or ISO string (UTC)
+        :param user_id: int only activities owned by this user
+        :return: list[Activity]
+        """
+
+        return [
+            self._activities[i]
+            for i in self._search(_to_datetime(start), _to_datetime(end))
+            if user_id is None or self._activities[i].user_id == user_id
+        ]
+
+    def at(self, moment: Moment, user_id: Optional[int] = None) -> list[Activity]:
+        """Activities in progress at `moment`."""
+
+        moment = _to_datetime(moment)
+        return self.overlapping(moment, moment + timedelta(microseconds=1), user_id)
+
+    def on(self, day: Union[date, str], user_id: Optional[int] = None) -> list[Activity]:
+        """Activities touching a calendar day (UTC)."""
+
+        start = _to_datetime(day)
+        return self.overlapping(start, start + timedelta(days=1), user_id)
+
+    def conflicts_with(
+        self, activity: Activity, user_id: Optional[int] = None
+    ) -> list[Activity]:
+        """
+        Indexed activities overlapping `activity`, excluding itself.
+
+        :param activity: Activity, indexed or not
+        :param user_id: int defaults to the activity's owner
+        :return: list[Activity]
+        """
+
+        interval = activity_interval(activity)
+        if interval is None:
+            return []
+
+        if user_id is None:
+            user_id = activity.user_id
+
+        return [
+            other
+            for other in self.overlapping(interval[0], interval[1], user_id)
+            if other is not activity
+            and (activity.id is None or other.id != activity.id)
+        ]
+
+    def conflicts(self) -> list[tuple[Activity, Activity]]:
+        """
+        Every pair of overlapping activities with the same owner, by a sweep
+        over the start-sorted entries.
+        """
+
+        pairs = []
+        active = {}
+
+        for start, end, activity in zip(self._starts, self._ends, self._activities):
+            running = [
+                entry for entry in active.get(activity.user_id, []) if entry[0] > start
+            ]
+            pairs.extend((other, activity) for _, other in running)
+            running.append((end, activity))
+            active[activity.user_id] = running
+
+        return pairs
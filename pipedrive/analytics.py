@@ -0,0 +1,309 @@
+"""
+Pipeline analytics over columnar deal data.
+
+A `DealFrame` holds one list per field instead of one object per deal.
+Timestamps are parsed once per column, ids are translated to names through
+lookup tables once per distinct value, and every aggregate is one pass over
+zipped columns:
+
+    frame = DealFrame.from_deals(Deal.get_all_deals())
+    frame.stage_distribution(Deal.Pipeline.sales)
+    frame.weighted_value(by=("owner", "pipeline"))
+    frame.win_rates(by="owner")
+    frame.stage_aging()
+"""
+
+import gzip
+import json
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Union
+
+from .deal import Deal
+
+COLUMNS = (
+    "id",
+    "owner_id",
+    "pipeline_id",
+    "stage_id",
+    "status",
+    "value",
+    "weighted_value",
+    "add_time",
+    "won_time",
+    "stage_change_time",
+)
+
+# stage id -> Deal.Stage attribute name
+STAGE_NAMES = {
+    stage_id: name
+    for name, stage_id in vars(Deal.Stage).items()
+    if not name.startswith("_") and isinstance(stage_id, int)
+}
+
+# group-by key -> (column, id -> label table)
+KEYS = {
+    "owner": ("owner_id", Deal.OWNER_NAMES),
+    "pipeline": ("pipeline_id", Deal.PIPELINE_NAMES),
+    "stage": ("stage_id", STAGE_NAMES),
+    "status": ("status", {}),
+}
+
+DAY = 86400.0
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """
+    Epoch seconds of a Pipedrive "YYYY-MM-DD HH:MM:SS" UTC string (v1) or
+    "YYYY-MM-DDTHH:MM:SSZ" string (v2), NaN if missing.
+    """
+
+    if not value:
+        return math.nan
+
+    # fromisoformat only accepts a "Z" suffix from Python 3.11 on.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    return moment.timestamp()
+
+
+def _parse_times(values: list) -> array:
+    parsed = {}
+    return array(
+        "d",
+        (
+            parsed[value] if value in parsed else parsed.setdefault(value, _timestamp(value))
+            for value in values
+        ),
+    )
+
+
+def _to_float(value) -> float:
+    return float(value) if value not in (None, "") else 0.0
+
+
+def _median(values: list) -> float:
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class DealFrame:
+    """Column-oriented deal snapshot."""
+
+    def __init__(self, columns: dict):
+        """
+        :param columns: dict column name -> list of values, all the same length
+        """
+
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self.columns = {name: list(columns.get(name, [])) for name in COLUMNS}
+        size = lengths.pop() if lengths else 0
+        for name, values in self.columns.items():
+            if not values and size:
+                self.columns[name] = [None] * size
+
+        self._numbers: dict = {}
+        self._times: dict = {}
+        self._labels: dict = {}
+
+    @staticmethod
+    def from_deals(deals: Iterable[Deal]) -> "DealFrame":
+        columns = {name: [] for name in COLUMNS}
+        appends = [(columns[name].append, name) for name in COLUMNS]
+
+        for deal in deals:
+            for append, name in appends:
+                append(getattr(deal, name, None))
+
+        return DealFrame(columns)
+
+    @staticmethod
+    def from_rows(rows: Iterable[dict]) -> "DealFrame":
+        """Build from `Deal.to_dict()` rows, e.g. a `pipedrive.export` NDJSON file."""
+
+        columns = {name: [] for name in COLUMNS}
+        appends = [(columns[name].append, name) for name in COLUMNS]
+
+        for row in rows:
+            for append, name in appends:
+                append(row.get(name))
+
+        return DealFrame(columns)
+
+    @staticmethod
+    def read_ndjson(path: str) -> "DealFrame":
+        """Load a deals export written by `pipedrive.export` (optionally gzipped)."""
+
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            return DealFrame.from_rows(json.loads(line) for line in file if line.strip())
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def number(self, name: str) -> array:
+        """A numeric column as floats, missing values as 0, converted once."""
+
+        if name not in self._numbers:
+            self._numbers[name] = array("d", map(_to_float, self.columns[name]))
+        return self._numbers[name]
+
+    def time(self, name: str) -> array:
+        """A time column as epoch seconds, missing values as NaN, parsed once."""
+
+        if name not in self._times:
+            self._times[name] = _parse_times(self.columns[name])
+        return self._times[name]
+
+    def labels(self, key: str) -> list:
+        """
+        Group labels for `key` ("owner", "pipeline", "stage" or "status").
+        Ids missing from the lookup table are kept as ids.
+        """
+
+        if key not in self._labels:
+            if key not in KEYS:
+                raise ValueError(f"Unknown key {key}, expected one of {', '.join(KEYS)}")
+
+            column, table = KEYS[key]
+            values = self.columns[column]
+            names = {value: table.get(value, value) for value in set(values)}
+            self._labels[key] = [names[value] for value in values]
+
+        return self._labels[key]
+
+    def where(self, **equals) -> "DealFrame":
+        """
+        Rows whose columns equal the given values, e.g. `where(status="open")`.
+        A list or set value matches any of its items.
+        """
+
+        keep = range(len(self))
+        for name, expected in equals.items():
+            column = self.columns[name]
+            if isinstance(expected, (list, set, frozenset, tuple)):
+                expected = frozenset(expected)
+                keep = [i for i in keep if column[i] in expected]
+            else:
+                keep = [i for i in keep if column[i] == expected]
+
+        return self.take(keep)
+
+    def take(self, rows: list) -> "DealFrame":
+        """A new frame with the given row positions."""
+
+        return DealFrame(
+            {name: [values[i] for i in rows] for name, values in self.columns.items()}
+        )
+
+    def _keys(self, by: Union[str, tuple]) -> list:
+        if isinstance(by, str):
+            return self.labels(by)
+        return list(zip(*(self.labels(key) for key in by)))
+
+    def count(self, by: Union[str, tuple]) -> dict:
+        """Number of deals per group."""
+
+        counts = {}
+        for key in self._keys(by):
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def sum(self, column: str, by: Union[str, tuple]) -> dict:
+        """Sum of a numeric column per group."""
+
+        totals = {}
+        for key, value in zip(self._keys(by), self.number(column)):
+            totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def stage_distribution(self, pipeline_id: Optional[int] = None) -> dict:
+        """
+        Open deals per stage name, optionally for one pipeline.
+
+        :param pipeline_id: int e.g. Deal.Pipeline.sales
+        :return: dict stage name -> count
+        """
+
+        frame = self.where(status="open")
+        if pipeline_id is not None:
+            frame = frame.where(pipeline_id=pipeline_id)
+        return frame.count("stage")
+
+    def weighted_value(self, by: Union[str, tuple] = ("owner", "pipeline")) -> dict:
+        """Open weighted value per group, e.g. per (owner, pipeline)."""
+
+        return self.where(status="open").sum("weighted_value", by)
+
+    def win_rates(self, by: Union[str, tuple] = "owner") -> dict:
+        """
+        won / (won + lost) per group, ignoring open deals.
+
+        :return: dict group -> float
+        """
+
+        won = {}
+        closed = {}
+
+        for key, status in zip(self._keys(by), self.columns["status"]):
+            if status == "won":
+                won[key] = won.get(key, 0) + 1
+            elif status != "lost":
+                continue
+            closed[key] = closed.get(key, 0) + 1
+
+        return {key: won.get(key, 0) / total for key, total in closed.items()}
+
+    def stage_aging(
+        self, now: Optional[datetime] = None, by: Union[str, tuple] = "stage"
+    ) -> dict:
+        """
+        Days open deals have spent in their current stage, since
+        `stage_change_time` or, when they never moved, `add_time`.
+
+        :param now: datetime defaults to the current time
+        :param by: group key(s)
+        :return: dict group -> {"count", "mean_days", "median_days", "max_days"}
+        """
+
+        reference = (now or datetime.now(timezone.utc)).timestamp()
+        if now is not None and now.tzinfo is None:
+            reference = now.replace(tzinfo=timezone.utc).timestamp()
+
+        ages = {}
+        for key, status, changed, added in zip(
+            self._keys(by),
+            self.columns["status"],
+            self.time("stage_change_time"),
+            self.time("add_time"),
+        ):
+            if status != "open":
+                continue
+
+            since = changed if changed == changed else added
+            if since != since:
+                continue
+
+            ages.setdefault(key, []).append((reference - since) / DAY)
+
+        return {
+            key: {
+                "count": len(days),
+                "mean_days": sum(days) / len(days),
+                "median_days": _median(days),
+                "max_days": max(days),
+            }
+            for key, days in ages.items()
+        }
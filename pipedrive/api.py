@@ -0,0 +1,68 @@
+from typing import Optional
+
+from .client import get_client
+
+
+CONTENT_TYPE = "application/json"
+
+
+def encode_url(
+    entity: str,
+    action: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    subpath: Optional[str] = None,
+    params: Optional[dict] = None,
+    version: Optional[str] = "v1",
+) -> str:
+    """
+    Encode URL with query parameters for the active client.
+
+    :param entity: str
+    :param action: str
+    :param entity_id: str
+    :param subpath: str
+    :param params: dict
+    :param version: str
+    :return: str
+    """
+
+    return get_client().encode_url(
+        entity=entity,
+        action=action,
+        entity_id=entity_id,
+        subpath=subpath,
+        params=params,
+        version=version,
+    )
+
+
+def request(method: str, url: str, **kwargs):
+    """
+    Send an HTTP request to Pipedrive through the active client.
+
+    `requests` (and urllib3, charset detection, ...) is imported when the
+    client opens its session on the first call instead of at package import,
+    so scripts that only use constants such as `Deal.Stage` never pay for it.
+
+    :param method: str
+    :param url: str
+    :return: requests.Response
+    """
+
+    return get_client().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url: str, **kwargs):
+    return request("DELETE", url, **kwargs)
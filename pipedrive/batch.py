@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional
+
+from . import api
+from .api import encode_url
+from .concurrency import map_concurrent
+
+# Largest number of ids accepted by the v2 `ids` filter.
+ID_CHUNK_SIZE = 100
+
+_raise_errors: ContextVar[bool] = ContextVar("pipedrive_raise_fetch_errors", default=False)
+
+
+def chunked(items: list, size: int) -> list[list]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+@contextmanager
+def raise_fetch_errors() -> Iterator[None]:
+    """
+    Make `fetch_by_ids`, and the `get_many` methods built on it, raise when a
+    chunk fails instead of leaving its ids out, for callers that must tell
+    a failed request from records that do not exist.
+    """
+
+    token = _raise_errors.set(True)
+    try:
+        yield
+    finally:
+        _raise_errors.reset(token)
+
+
+def fetch_by_ids(
+    entity: str,
+    ids: Iterable[int],
+    params: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+) -> dict[int, dict]:
+    """
+    Fetch full v2 records for the given ids, `ID_CHUNK_SIZE` ids per request,
+    with the chunks requested concurrently.
+
+    :param entity: str e.g. "deals"
+    :param ids: Iterable[int]
+    :param params: dict extra query parameters
+    :return: dict[int, dict] raw records keyed by id, missing ids are absent
+    """
+
+    unique_ids = list(dict.fromkeys(id for id in ids if id is not None))
+
+    def fetch(chunk: list[int]) -> list[dict]:
+        chunk_params = dict(params or {})
+        chunk_params["ids"] = ",".join(str(id) for id in chunk)
+        chunk_params["limit"] = len(chunk)
+
+        url = encode_url(entity=entity, params=chunk_params, version="v2")
+
+        try:
+            response = api.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            if _raise_errors.get():
+                raise
+            print(f"Error fetching {entity} by ids - {e}")
+            return []
+
+        return response.json().get("data") or []
+
+    records = {}
+    for page in map_concurrent(
+        fetch, chunked(unique_ids, ID_CHUNK_SIZE), max_workers=max_workers
+    ):
+        for record in page:
+            records[record["id"]] = record
+
+    return records
@@ -0,0 +1,307 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from urllib.parse import urlencode
+
+from .env_config import envs
+from .rate_limit import ConcurrencyLimiter, RateLimiter
+from .scheduling import BACKGROUND, RequestMetrics, current_priority
+
+# Times a BACKGROUND request is sent again after a 429.
+THROTTLED_RETRIES = 3
+DEFAULT_RETRY_AFTER = 2.0
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """
+    Immutable connection settings for one Pipedrive account.
+
+    :param company_domain: str subdomain, as in https://<company_domain>.pipedrive.com
+    :param api_key: str
+    :param versions: tuple[str] API versions whose base URLs are precomputed
+    :param pool_size: int maximum pooled connections per host
+    :param rate_limit: float requests per second, None for no limit
+    :param timeout: float seconds, None to wait forever
+    :param reserved: float share of the rate budget kept for INTERACTIVE
+        requests
+    :param adaptive_concurrency: bool adapt the requests in flight (at most
+        `pool_size`) to 429s, rate-limit headers and latency
+    """
+
+    company_domain: str
+    api_key: str = field(repr=False)
+    versions: tuple = ("v1", "v2")
+    pool_size: int = 10
+    rate_limit: Optional[float] = None
+    timeout: Optional[float] = None
+    reserved: float = 0.2
+    adaptive_concurrency: bool = True
+    base_urls: dict = field(init=False, repr=False, compare=False)
+    token_query: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not self.company_domain:
+            raise ValueError("company_domain is required")
+
+        object.__setattr__(
+            self,
+            "base_urls",
+            {version: self.base_url(version) for version in self.versions},
+        )
+        object.__setattr__(
+            self, "token_query", urlencode({"api_token": self.api_key})
+        )
+
+    def base_url(self, version: str = "v1") -> str:
+        return f"https://{self.company_domain}.pipedrive.com/api/{version}"
+
+
+class Client:
+    """
+    A Pipedrive account: frozen configuration, connection pool and rate budget.
+
+    Several clients can coexist in one process. Entity methods use the client
+    activated in the current context, falling back to one built from the
+    environment:
+
+        with Client("acme", "token").activate():
+            deals = Deal.get_all_deals()
+
+    Context variables are not inherited by new threads, so call `activate()`
+    inside each worker when syncing accounts in parallel.
+    """
+
+    def __init__(self, company_domain: str, api_key: str, **kwargs):
+        """
+        :param company_domain: str
+        :param api_key: str
+        :param versions: tuple[str]
+        :param pool_size: int
+        :param rate_limit: float requests per second
+        :param timeout: float seconds
+        :param reserved: float share of the rate budget for INTERACTIVE requests
+        :param adaptive_concurrency: bool cap requests in flight with an AIMD
+            `ConcurrencyLimiter`, see `concurrency`
+        """
+
+        self.config = ClientConfig(
+            company_domain=company_domain, api_key=api_key, **kwargs
+        )
+        self.rate_limiter = (
+            RateLimiter(self.config.rate_limit, reserved=self.config.reserved)
+            if self.config.rate_limit is not None
+            else None
+        )
+        # Shared by every thread sending through this client: thread pools,
+        # prefetched pages, hydration and bulk writes.
+        self.concurrency = (
+            ConcurrencyLimiter(self.config.pool_size)
+            if self.config.adaptive_concurrency
+            else None
+        )
+        self.metrics = RequestMetrics()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @staticmethod
+    def from_env(**kwargs) -> "Client":
+        return Client(envs.company_domain, envs.api_key, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"Client(company_domain={self.config.company_domain!r})"
+
+    def encode_url(
+        self,
+        entity: str,
+        action: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        subpath: Optional[str] = None,
+        params: Optional[dict] = None,
+        version: Optional[str] = "v1",
+    ) -> str:
+        """
+        Encode URL with query parameters.
+
+        :param entity: str
+        :param action: str
+        :param entity_id: str
+        :param subpath: str
+        :param params: dict
+        :param version: str
+        :return: str
+        """
+
+        base_url = self.config.base_urls.get(version) or self.config.base_url(version)
+        url = f"{base_url}/{entity}"
+
+        if action is not None:
+            url = f"{url}/{action}"
+        elif entity_id is not None:
+            url = f"{url}/{entity_id}"
+
+        if subpath is not None:
+            url = f"{url}/{subpath}"
+
+        if params:
+            return f"{url}?{urlencode(params)}&{self.config.token_query}"
+
+        return f"{url}?{self.config.token_query}"
+
+    @property
+    def session(self):
+        """A `requests.Session` sized to `pool_size`, created on first use."""
+
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.config.pool_size,
+                        pool_maxsize=self.config.pool_size,
+                    )
+                    session.mount("https://", adapter)
+                    self._session = session
+
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Send a request with the priority of the current context (see
+        `pipedrive.scheduling`), recording its queue wait and latency in
+        `metrics`.
+
+        With `adaptive_concurrency`, the request takes a slot of
+        `concurrency` once it has a rate token and reports back how it went:
+        429s, errors, a low `x-ratelimit-remaining` or rising latency shrink
+        the number of requests in flight, smooth responses grow it back.
+
+        A 429 pauses all but INTERACTIVE requests for the time the response
+        asks for; BACKGROUND requests are then sent again, the others return
+        the 429 to the caller.
+        """
+
+        level = current_priority()
+        kwargs.setdefault("timeout", self.config.timeout)
+
+        for attempt in range(THROTTLED_RETRIES + 1):
+            queued = time.perf_counter()
+            # Rate token first: a request waiting out a 429 pause must not
+            # hold a slot that an INTERACTIVE request could use.
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(level)
+            if self.concurrency is not None:
+                started = self.concurrency.acquire(level)
+
+            sent = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except Exception:
+                if self.concurrency is not None:
+                    self.concurrency.release(
+                        started, time.perf_counter() - sent, failed=True
+                    )
+                raise
+
+            latency = time.perf_counter() - sent
+            throttled = response.status_code == 429
+            if self.concurrency is not None:
+                self.concurrency.release(
+                    started,
+                    latency,
+                    throttled=throttled,
+                    budget=header_budget(response),
+                )
+            self.metrics.record(level, sent - queued, latency, throttled)
+
+            if not throttled:
+                break
+
+            retry_after = _retry_after(response)
+            if self.rate_limiter is not None:
+                self.rate_limiter.pause(retry_after)
+            if level != BACKGROUND or attempt == THROTTLED_RETRIES:
+                break
+            if self.rate_limiter is None:
+                time.sleep(retry_after)
+
+        return response
+
+    @contextmanager
+    def activate(self) -> Iterator["Client"]:
+        """Use this client for entity calls made in the current context."""
+
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def header_budget(response) -> Optional[float]:
+    """
+    Share of the account's rate budget left (0..1) according to the
+    `x-ratelimit-*` headers, None if the response has none.
+    """
+
+    headers = response.headers
+    try:
+        remaining = int(headers["x-ratelimit-remaining"])
+        limit = int(headers["x-ratelimit-limit"])
+        return max(0.0, remaining / limit)
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _retry_after(response) -> float:
+    headers = response.headers
+    for name in ("Retry-After", "x-ratelimit-reset"):
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return DEFAULT_RETRY_AFTER
+
+
+_current_client: ContextVar[Optional[Client]] = ContextVar(
+    "pipedrive_client", default=None
+)
+_default_client: Optional[Client] = None
+_default_client_lock = threading.Lock()
+
+
+def set_default_client(client: Optional[Client]) -> None:
+    """Replace the process-wide fallback client (None rebuilds it from env)."""
+
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
+def get_client() -> Client:
+    """Return the active client, building the default one from env once."""
+
+    global _default_client
+
+    client = _current_client.get()
+    if client is not None:
+        return client
+
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = Client.from_env()
+
+    return _default_client
@@ -0,0 +1,45 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+
+from .client import get_client
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_concurrent(
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: Optional[int] = None,
+) -> list[R]:
+    """
+    Apply `function` to every item on a thread pool, returning results in
+    input order.
+
+    Each task runs in a copy of the caller's context, so the active `Client`
+    is used by the workers too. Its `concurrency` limiter, not `max_workers`,
+    decides how many of their requests are in flight at once.
+
+    :param function: Callable
+    :param items: Iterable
+    :param max_workers: int, defaults to the active client's pool size
+    :return: list
+    """
+
+    items = list(items)
+    if not items:
+        return []
+
+    if max_workers is None:
+        max_workers = get_client().config.pool_size
+
+    if len(items) == 1 or max_workers <= 1:
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, function, item)
+            for item in items
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,1040 @@
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Callable, Iterable
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .scheduling import BACKGROUND, INTERACTIVE, prioritized
+from .tracking import TrackedModel
+
+if TYPE_CHECKING:
+    from .watch import Watcher
+
+
+def _related_id(value) -> Optional[int]:
+    """Id of a related record, given inline or as a v1 {"value": id, ...} object."""
+
+    if isinstance(value, dict):
+        return value.get("value", value.get("id"))
+    return value
+
+
+class Deal(TrackedModel):
+    @dataclass
+    class Pipeline:
+        sales = 1
+        pre_sales = 4
+        cs_upsell = 5
+        cs_accounts = 3
+
+    @dataclass
+    class Stage:
+        # pre sales pipeline
+        pre_sales_new_lead = 18
+        pre_sales_contract_sent = 29
+        pre_sales_mql = 19
+        pre_sales_engaging = 28
+
+        # sales pipeline
+        sales_sql = 16
+        sales_sqo = 37
+        sales_proving_value = 38
+        sales_negotiation = 5
+        sales_contract = 30
+        sales_won = 17
+
+        # cs accounts pipeline
+        cs_accounts_onboarding = 11
+        cs_accounts_engaging = 12
+        cs_accounts_at_risk = 31
+        cs_accounts_renew_contract = 13
+        cs_accounts_upsell_opportunity = 14
+
+        # cs upsell pipeline
+        cs_upsell_discovery = 32
+        cs_upsell_opp_mapped = 33
+        cs_upsell_poc = 34
+        cs_upsell_proposal_sent = 35
+        cs_upsell_closed_or_won = 36
+
+    @dataclass
+    class Owner:
+        jessica = 21973448
+        sophia = 21976836
+        marcelo = 21976847
+        bruno = 21985174
+        roberto = 22478491
+
+    @dataclass
+    class Channel:
+        none = "(None)"
+        rpf = "RPF"
+        personal_network = "Personal Network"
+        event = "Event"
+        google_ads = "Google Ads"
+        linkedin_ads = "Linkedin Ads"
+        website_demo = "Website Demo"
+        outbound = "Outbound"
+        product = "Product"
+        cubo = "Cubo"
+        phantombuster_auto = "Automatic Prospecting on LinkedIn"
+        free_mvp = 107
+        abstra_start = 173
+
+    @dataclass
+    class Tag:
+        trial = "In Trial"
+
+    @dataclass
+    class Milestone:
+        contact_with_influencer = 35
+        contact_with_buyer = 36
+        contact_with_technical_decision_maker = 40
+        usecase_mapped = 37
+        urgency_for_usecase = 38
+        budget_available = 39
+        pricing_presented = 84
+        capable_editors = 41
+        appoved_by_technical_decision_maker = 42
+        appoved_by_buyer = 43
+
+    @dataclass
+    class CustomFields:
+        ads_id = "67e90727a702feaee708eb4be15c896f1e4d125e"
+        campaign_id = "90ee914e411f8e76eda8b270c576fa20ce945af6"
+        ad_name = "cb5af1d8630657fc3ab4bb01c243f993141df2e7"
+        tag = "70a34135774fbab2a37608d3d4c5da3be9dfa10a"
+        use_case = "aa6cbdaafd283f46db835b902902f549e86bb915"
+        company_domain = "34d3f450e4c96e0390b8dd9a7a034e7d64c53db0"
+        abstra_cloud_org_id = "68396303430f23178b5bc6978b5b3021cf5eff47"
+        qualification_milestone = "5abfbfa90d21348b998b9c259392182130d04647"
+
+    OWNER_NAMES = {
+        Owner.jessica: "Jessica",
+        Owner.sophia: "Sophia",
+        Owner.marcelo: "Marcelo",
+        Owner.bruno: "Bruno Costa",
+        Owner.roberto: "Roberto",
+    }
+
+    PIPELINE_NAMES = {
+        Pipeline.sales: "Sales",
+        Pipeline.pre_sales: "Pre Sales",
+        Pipeline.cs_upsell: "CS Upsell",
+        Pipeline.cs_accounts: "CS Accounts",
+    }
+
+    # Stage `is_meeting_scheduled_or_after` and `move_in_pipeline` compare
+    # against: the id configured for the deal's pipeline, else the stage of
+    # that pipeline with this name.
+    MEETING_SCHEDULED_STAGE_IDS: dict = {}
+    MEETING_SCHEDULED_STAGE = "Meeting Scheduled"
+
+    _tracked_fields = (
+        "title",
+        "org_id",
+        "person_id",
+        "stage_id",
+        "pipeline_id",
+        "owner_id",
+        "channel",
+        "ads_id",
+        "campaign_id",
+        "ad_name",
+        "tag",
+        "use_case",
+        "company_domain",
+        "abstra_cloud_org_id",
+        "value",
+        "qualification_milestone",
+        "status",
+        "lost_reason",
+    )
+
+    def __init__(self, **kwargs):
+        """
+        :param id: int
+        :param title: str
+        :param org_id: int
+        :param person_id: int
+        :param ads_id: str
+        :param campaign_id: str
+        :param ad_name: str
+        :param stage_id: int
+        :param stage_change_time: str
+        :param pipeline_id: int
+        :param origin_id: str
+        :param owner_id: int
+        :param owner_name: str
+        :param won_time: str
+        :param channel: str
+        :param channel_id: str
+        :param tag: str
+        :param use_case: str
+        :param company_domain: str
+        :param abstra_cloud_org_id: str
+        :param value: int
+        :param qualification_milestone: comma separated string
+        :param status: str
+        :param lost_reason: str
+        :param expected_close_date: str
+        :param weighted_value: float
+        :param add_time: str iso format
+        :param next_activity_date: str iso format
+        :param person: Person loaded with include=["person"]
+        :param organization: Organization loaded with include=["organization"]
+        :param activities: list[Activity] loaded with include=["activities"]
+        """
+
+        self.id = kwargs.get("id", None)
+        self.title = kwargs.get("title", None)
+        self.org_id = kwargs.get("org_id", None)
+        self.person_id = kwargs.get("person_id", None)
+        self.ads_id = kwargs.get("ads_id", None)
+        self.campaign_id = kwargs.get("campaign_id", None)
+        self.stage_id = kwargs.get("stage_id", None)
+        self.stage_change_time = kwargs.get("stage_change_time", None)
+        self.pipeline_id = kwargs.get("pipeline_id", None)
+        self.owner_id = kwargs.get("owner_id", None)
+        self.origin_id = kwargs.get("origin_id", None)
+        self.owner_name = kwargs.get("owner_name", None) or self.OWNER_NAMES.get(self.owner_id)
+        self.won_time = kwargs.get("won_time", None)
+        self.channel = kwargs.get("channel", None)
+        self.channel_id = kwargs.get("channel_id", None)
+        self.ad_name = kwargs.get("ad_name", None)
+        self.tag = kwargs.get("tag", None)
+        self.use_case = kwargs.get("use_case", None)
+        self.company_domain = kwargs.get("company_domain", None)
+        self.abstra_cloud_org_id = kwargs.get("abstra_cloud_org_id", None)
+        self.value = kwargs.get("value", None)
+        self.qualification_milestone = kwargs.get("qualification_milestone", None)
+        self.status = kwargs.get("status", None)
+        self.lost_reason = kwargs.get("lost_reason", None)
+        self.expected_close_date = kwargs.get("expected_close_date", None)
+        self.weighted_value = kwargs.get("weighted_value", None)
+        self.add_time = kwargs.get("add_time", None)
+        self.next_activity_date = kwargs.get("next_activity_date", None)
+        self.person = kwargs.get("person", None)
+        self.organization = kwargs.get("organization", None)
+        self.activities = kwargs.get("activities", None)
+
+        self.mark_loaded()
+
+
+    @property
+    def deal_owner(self):
+        """
+        Owner's name from the account metadata, or `OWNER_NAMES` if it
+        cannot be loaded. The first lookup per account may load the metadata
+        from the API and cache it on disk (see `pipedrive.metadata`).
+        """
+
+        name = self._metadata_name("user_name", self.owner_id)
+        return name if name is not None else self.OWNER_NAMES.get(self.owner_id)
+
+    @property
+    def deal_pipeline(self):
+        """
+        Pipeline's name from the account metadata, or `PIPELINE_NAMES` if it
+        cannot be loaded; loads the metadata like `deal_owner`.
+        """
+
+        name = self._metadata_name("pipeline_name", self.pipeline_id)
+        return name if name is not None else self.PIPELINE_NAMES.get(self.pipeline_id)
+
+    @staticmethod
+    def _metadata_name(lookup: str, id: Optional[int]) -> Optional[str]:
+        from requests import RequestException
+
+        from .client import get_client
+        from .metadata import get_metadata
+
+        try:
+            client = get_client()
+        except ValueError:
+            # No account configured, e.g. offline analysis of saved deals.
+            return None
+
+        try:
+            metadata = get_metadata(client)
+        except (RequestException, RuntimeError, OSError):
+            return None
+
+        return getattr(metadata, lookup)(id)
+
+    def _meeting_stage(self):
+        """
+        (metadata, meeting scheduled stage of the deal's pipeline), the
+        stage None if the pipeline has none. A stage id missing from the
+        cached metadata reloads it once, since stages may have been added
+        after it was cached.
+        """
+
+        from .metadata import registry
+
+        metadata = registry.get()
+        if self.stage_id is not None and self.stage_id not in metadata.stages:
+            metadata = registry.refresh()
+
+        stage = metadata.stages.get(self.stage_id)
+        pipeline_id = stage.pipeline_id if stage is not None else self.pipeline_id
+
+        stage_id = self.MEETING_SCHEDULED_STAGE_IDS.get(pipeline_id)
+        if stage_id is not None:
+            meeting = metadata.stages.get(stage_id)
+        else:
+            meeting = metadata.stage_named(pipeline_id, self.MEETING_SCHEDULED_STAGE)
+
+        return metadata, meeting
+
+    @property
+    def is_meeting_scheduled_or_after(self):
+        """
+        True for pipelines without a meeting scheduled stage, such as the CS
+        pipelines.
+
+        :raises ValueError: if the deal's stage is missing from the account
+            metadata even after reloading it
+        """
+
+        metadata, meeting = self._meeting_stage()
+        if meeting is None:
+            return True
+        return metadata.is_at_or_after(self.stage_id, meeting.id)
+
+    @staticmethod
+    def create(**kwargs) -> "Deal":
+        """
+        Create a new deal in Pipedrive.
+
+        :param title: str
+        :param org_id: int
+        :param person_id: int
+        :param stage_id: int
+        :param pipeline_id: int
+        :param owner_id: int
+        :param origin_id: str
+        :param channel: str
+        :param channel_id: str
+        :param ads_id: str
+        :param campaign_id: str
+        :param ad_name: str
+        :param tag: str
+        :param use_case: str
+        :param company_domain: str
+        :param abstra_cloud_org_id: str
+        :param value: int
+        :param qualification_milestone: comma separated string
+        :param status: str
+        :param lost_reason: str
+        :param add_time: str iso format
+        :return: Deal
+        """
+
+        from .domains import is_generic_domain
+
+        if "title" not in kwargs:
+            print("title is required")
+            return None
+
+        company_domain = kwargs.get("company_domain", None)
+        if is_generic_domain(company_domain):
+            company_domain = None
+
+        data = {
+            "title": kwargs["title"],
+            "org_id": kwargs.get("org_id", None),
+            "person_id": kwargs.get("person_id", None),
+            "stage_id": kwargs.get("stage_id", None),
+            "pipeline_id": kwargs.get("pipeline_id", None),
+            "user_id": kwargs.get("owner_id", None),
+            "origin_id": kwargs.get("origin_id", None),
+            "channel": kwargs.get("channel", None),
+            "channel_id": kwargs.get("channel_id", None),
+            "67e90727a702feaee708eb4be15c896f1e4d125e": kwargs.get(
+                "ads_id", None
+            ),  # custom field
+            "90ee914e411f8e76eda8b270c576fa20ce945af6": kwargs.get(
+                "campaign_id", None
+            ),  # custom field
+            "cb5af1d8630657fc3ab4bb01c243f993141df2e7": kwargs.get(
+                "ad_name", None
+            ),  # custom field
+            "70a34135774fbab2a37608d3d4c5da3be9dfa10a": kwargs.get(
+                "tag", None
+            ),  # custom field
+            "aa6cbdaafd283f46db835b902902f549e86bb915": kwargs.get(
+                "use_case", None
+            ),  # custom field
+            "34d3f450e4c96e0390b8dd9a7a034e7d64c53db0": company_domain,  # custom field
+            "68396303430f23178b5bc6978b5b3021cf5eff47": kwargs.get(
+                "abstra_cloud_org_id", None
+            ),  # custom field
+            "value": kwargs.get("value", None),
+            "5abfbfa90d21348b998b9c259392182130d04647": kwargs.get(
+                "qualification_milestone", None
+            ),  # custom field
+            "status": kwargs.get("status", None),
+            "lost_reason": kwargs.get("lost_reason", None),
+            "add_time": kwargs.get("add_time", None),
+        }
+
+        url = encode_url(entity="deals")
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating deal - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return Deal(
+                id=response_json["data"]["id"],
+                title=response_json["data"]["title"],
+                org_id=response_json["data"]["org_id"]["value"]
+                if response_json["data"]["org_id"]
+                else None,
+                origin_id=response_json["data"].get("origin_id"),
+                person_id=response_json["data"]["person_id"]["value"]
+                if response_json["data"]["person_id"]
+                else None,
+                ads_id=response_json["data"][
+                    "67e90727a702feaee708eb4be15c896f1e4d125e"
+                ],
+                campaign_id=response_json["data"][
+                    "90ee914e411f8e76eda8b270c576fa20ce945af6"
+                ],
+                ad_name=response_json["data"][
+                    "cb5af1d8630657fc3ab4bb01c243f993141df2e7"
+                ],
+                stage_id=response_json["data"]["stage_id"],
+                pipeline_id=response_json["data"]["pipeline_id"],
+                owner_id=response_json["data"]["user_id"]["id"]
+                if response_json["data"]["user_id"]
+                else None,
+                channel=response_json["data"]["channel"],
+                channel_id=response_json["data"].get("channel_id"),
+                tag=response_json["data"]["70a34135774fbab2a37608d3d4c5da3be9dfa10a"],
+                use_case=response_json["data"][
+                    "aa6cbdaafd283f46db835b902902f549e86bb915"
+                ],
+                company_domain=response_json["data"][
+                    "34d3f450e4c96e0390b8dd9a7a034e7d64c53db0"
+                ],
+                abstra_cloud_org_id=response_json["data"][
+                    "68396303430f23178b5bc6978b5b3021cf5eff47"
+                ],
+                value=response_json["data"]["value"],
+                status=response_json["data"]["status"],
+                lost_reason=response_json["data"]["lost_reason"],
+                add_time=response_json["data"]["add_time"],
+                qualification_milestone=response_json["data"][
+                    "5abfbfa90d21348b998b9c259392182130d04647"
+                ],
+            )
+
+    @staticmethod
+    @prioritized(BACKGROUND)
+    def get_all_deals(include: Optional[Iterable[str]] = None) -> list["Deal"]:
+        """
+        Retrieve all deals from Pipedrive.
+
+        :param include: Iterable[str] related records to attach to each deal,
+            any of "person", "organization", "activities"
+        :return: list[Deal]
+        """
+
+        from .pagination import iter_pages, prefetch
+
+        url = encode_url(entity="deals", params={"limit": 500})
+        loader = Deal._include_loader(include, scan_activities=True)
+
+        deals = []
+        for page in prefetch(iter_pages(url)):
+            page_deals = [Deal.from_dict(result) for result in page]
+            if loader is not None:
+                loader.attach(page_deals)
+            deals += page_deals
+
+        return deals
+
+    @staticmethod
+    def get_deals_by_person_id(
+        person_id: int, include: Optional[Iterable[str]] = None
+    ) -> list["Deal"]:
+        """
+        Retrieve Deals from Pipedrive by Person_id.
+
+        :param person_id: int
+        :param include: Iterable[str] related records to attach to each deal,
+            any of "person", "organization", "activities"
+        :return: list[Deal]
+        """
+
+        from .pagination import iter_cursor_pages, prefetch
+
+        params = {"person_id": person_id}
+
+        url = encode_url(entity="deals", params=params, version="v2")
+
+        deals = [
+            Deal.from_v2_dict(result)
+            for page in prefetch(iter_cursor_pages(url))
+            for result in page
+        ]
+
+        return Deal._attach_includes(deals, include)
+
+    @staticmethod
+    def _include_loader(
+        include: Optional[Iterable[str]], scan_activities: bool = False
+    ):
+        if not include:
+            return None
+
+        from .include import IncludeLoader
+
+        return IncludeLoader(include, scan_activities=scan_activities)
+
+    @staticmethod
+    def _attach_includes(
+        deals: list["Deal"], include: Optional[Iterable[str]]
+    ) -> list["Deal"]:
+        loader = Deal._include_loader(include)
+        if loader is not None and deals:
+            loader.attach(deals)
+        return deals
+
+    @staticmethod
+    def from_dict(data: dict) -> "Deal":
+        return Deal(**Deal._v1_kwargs(data))
+
+    @staticmethod
+    def _v1_kwargs(data: dict) -> dict:
+        return dict(
+            id=data["id"],
+            title=data["title"],
+            org_id=_related_id(data["org_id"]),
+            person_id=_related_id(data["person_id"]),
+            stage_id=data["stage_id"],
+            stage_change_time=data.get("stage_change_time", None),
+            pipeline_id=data["pipeline_id"],
+            origin_id=data.get("origin_id"),
+            owner_id=data["user_id"]["id"] if data["user_id"] else None,
+            owner_name=data["user_id"]["name"] if data["user_id"] else None,
+            won_time=data.get("won_time", None),
+            channel=data["channel"],
+            channel_id=data.get("channel_id", None),
+            ads_id=data["67e90727a702feaee708eb4be15c896f1e4d125e"],
+            campaign_id=data["90ee914e411f8e76eda8b270c576fa20ce945af6"],
+            ad_name=data["cb5af1d8630657fc3ab4bb01c243f993141df2e7"],
+            tag=data["70a34135774fbab2a37608d3d4c5da3be9dfa10a"],
+            use_case=data["aa6cbdaafd283f46db835b902902f549e86bb915"],
+            company_domain=data["34d3f450e4c96e0390b8dd9a7a034e7d64c53db0"],
+            abstra_cloud_org_id=data["68396303430f23178b5bc6978b5b3021cf5eff47"],
+            value=data["value"],
+            status=data["status"],
+            lost_reason=data["lost_reason"],
+            expected_close_date=data.get("expected_close_date", None),
+            weighted_value=data.get("weighted_value", None),
+            add_time=data["add_time"],
+            qualification_milestone=data["5abfbfa90d21348b998b9c259392182130d04647"],
+            next_activity_date=data.get("next_activity_date", None),
+        )
+
+    @staticmethod
+    def from_v2_dict(data: dict) -> "Deal":
+        custom_fields = data.get("custom_fields") or {}
+
+        return Deal(
+            id=data["id"],
+            title=data["title"],
+            org_id=data.get("org_id"),
+            person_id=data.get("person_id"),
+            stage_id=data.get("stage_id"),
+            stage_change_time=data.get("stage_change_time"),
+            pipeline_id=data.get("pipeline_id"),
+            owner_id=data.get("owner_id"),
+            origin_id=data.get("origin_id"),
+            won_time=data.get("won_time"),
+            channel=data.get("channel"),
+            channel_id=data.get("channel_id"),
+            ads_id=custom_fields.get(Deal.CustomFields.ads_id),
+            campaign_id=custom_fields.get(Deal.CustomFields.campaign_id),
+            ad_name=custom_fields.get(Deal.CustomFields.ad_name),
+            tag=custom_fields.get(Deal.CustomFields.tag),
+            use_case=custom_fields.get(Deal.CustomFields.use_case),
+            company_domain=custom_fields.get(Deal.CustomFields.company_domain),
+            abstra_cloud_org_id=custom_fields.get(
+                Deal.CustomFields.abstra_cloud_org_id
+            ),
+            value=data.get("value"),
+            status=data.get("status"),
+            lost_reason=data.get("lost_reason"),
+            expected_close_date=data.get("expected_close_date"),
+            weighted_value=data.get("weighted_value"),
+            add_time=data.get("add_time"),
+            qualification_milestone=custom_fields.get(
+                Deal.CustomFields.qualification_milestone
+            ),
+            next_activity_date=data.get("next_activity_date"),
+        )
+
+    @staticmethod
+    def get_many(
+        ids: Iterable[int], include: Optional[Iterable[str]] = None
+    ) -> list["Deal"]:
+        """
+        Retrieve full Deals by id through the v2 `ids` filter, in chunks
+        requested concurrently.
+
+        :param ids: Iterable[int]
+        :param include: Iterable[str] related records to attach to each deal,
+            any of "person", "organization", "activities"
+        :return: list[Deal] in input order, ids that were not found are skipped
+        """
+
+        from .batch import fetch_by_ids
+
+        ids = list(ids)
+        records = fetch_by_ids("deals", ids)
+
+        return Deal._attach_includes(
+            [Deal.from_v2_dict(records[id]) for id in ids if id in records], include
+        )
+
+    @staticmethod
+    def filter(
+        filter_function: Callable[["Deal"], bool] = lambda _: True,
+        include: Optional[Iterable[str]] = None,
+    ) -> list["Deal"]:
+        """
+        Retrieve the deals accepted by `filter_function`.
+
+        :param filter_function: Callable[[Deal], bool]
+        :param include: Iterable[str] related records to attach to each
+            matching deal, any of "person", "organization", "activities"
+        :return: list[Deal]
+        """
+
+        from .pagination import iter_pages, prefetch
+
+        url = encode_url(entity="deals", params={"limit": 200})
+        # Activities per matching deal: a filter usually keeps a few deals,
+        # and scanning every activity of the account would cost far more.
+        loader = Deal._include_loader(include)
+
+        filtered_deals = []
+
+        for page in prefetch(iter_pages(url)):
+            if page:
+                deal_list = [Deal.from_dict(result) for result in page]
+                matches = list(filter(filter_function, deal_list))
+                if loader is not None and matches:
+                    loader.attach(matches)
+                filtered_deals = filtered_deals + matches
+
+        return filtered_deals
+
+    @staticmethod
+    def watch(**kwargs) -> "Watcher":
+        """
+        Stream deal changes by polling `recents`, for loops that would
+        otherwise call `filter` over and over:
+
+            for event in Deal.watch(filter_function=lambda deal: deal.pipeline_id == 1):
+                ...
+
+        Iterate with `for` or `async for`. Keyword arguments are passed to
+        `Watcher` (min_interval, max_interval, since, baseline, filter_function).
+
+        :return: Watcher yielding WatchEvents of Deals
+        """
+
+        from .watch import Watcher
+
+        return Watcher("deal", Deal.from_dict, **kwargs)
+
+    @staticmethod
+    @prioritized(INTERACTIVE)
+    def retrieve_by(
+        company_domain: Optional[str] = None,
+        abstra_cloud_org_id: Optional[str] = None,
+        hydrate: bool = False,
+        include: Optional[Iterable[str]] = None,
+    ) -> list["Deal"]:
+        """
+        Retrieve Deals from Pipedrive by Company_domain.
+
+        :param company_domain: str
+        :param abstra_cloud_org_id: str
+        :param hydrate: bool load the full records with `Deal.get_many` now;
+            otherwise the Deals load them lazily, in one batch, when a field
+            missing from the search results is first read
+        :param include: Iterable[str] related records to attach to each deal,
+            any of "person", "organization", "activities"
+        :return: list[Deal]
+        """
+
+        from .domains import is_generic_domain
+        from .pagination import iter_search_pages, prefetch
+        from .proxy import lazy_records
+
+        if abstra_cloud_org_id is None and company_domain is None:
+            return []
+
+        if abstra_cloud_org_id is None:
+            if company_domain is None or is_generic_domain(company_domain):
+                return []
+
+        params = {
+            "fields": "custom_fields",
+        }
+
+        if company_domain is not None:
+            params["term"] = company_domain
+        elif abstra_cloud_org_id is not None:
+            params["term"] = abstra_cloud_org_id
+
+        url = encode_url(entity="deals", action="search", params=params)
+
+        # Each page is decoded while the next one is fetched.
+        records = [
+            {
+                "id": result["item"]["id"],
+                "title": result["item"]["title"],
+                "org_id": result["item"]["organization"]["id"]
+                if result["item"]["organization"]
+                else None,
+                "person_id": result["item"]["person"]["id"]
+                if result["item"]["person"]
+                else None,
+                "owner_id": result["item"]["owner"]["id"]
+                if result["item"]["owner"]
+                else None,
+                "stage_id": result["item"]["stage"]["id"],
+                **{
+                    name: result["item"][name]
+                    for name in ("value", "status")
+                    if name in result["item"]
+                },
+            }
+            for page in prefetch(iter_search_pages(url))
+            for result in page
+        ]
+
+        if records and hydrate:
+            return Deal.get_many((record["id"] for record in records), include=include)
+
+        if records:
+            return Deal._attach_includes(lazy_records(Deal, records), include)
+        else:
+            return []
+
+    def update(self, **kwargs) -> "Deal":
+        """
+        Update a deal in Pipedrive.
+
+        :param title: str
+        :param org_id: int
+        :param person_id: int
+        :param stage_id: int
+        :param pipeline_id: int
+        :param owner_id: int
+        :param channel: int
+        :param ads_id: str
+        :param campaign_id: str
+        :param ad_name: str
+        :param tag: str
+        :param use_case: str
+        :param company_domain: str
+        :param abstra_cloud_org_id: str
+        :param value: int
+        :param qualification_milestone: comma separated string
+        :param status: str
+        :param lost_reason: str
+        :return: Deal"""
+
+        from .unit_of_work import UpdateBuffer
+
+        buffer = UpdateBuffer.current()
+        if buffer is not None:
+            return buffer.enqueue(self, kwargs)
+
+        result = self._put(Deal._update_payload(kwargs))
+
+        if result is not None:
+            return Deal.from_dict(result)
+
+    def save(self) -> Optional["Deal"]:
+        """
+        Send the fields changed since the deal was loaded and update this
+        object in place from the response. No request is made when nothing
+        changed.
+
+        :return: Deal self, or None if there's an error
+        """
+
+        changes = self.changed_fields()
+        if not changes:
+            return self
+
+        result = self._put(Deal._update_payload(changes))
+        if result is None:
+            return None
+
+        self._patch(Deal._v1_kwargs(result))
+        return self
+
+    @staticmethod
+    def _update_payload(kwargs: dict) -> dict:
+        data = {}
+
+        if "title" in kwargs:
+            data["title"] = kwargs["title"]
+        if "org_id" in kwargs:
+            data["org_id"] = kwargs["org_id"]
+        if "person_id" in kwargs:
+            data["person_id"] = kwargs["person_id"]
+        if "stage_id" in kwargs:
+            data["stage_id"] = kwargs["stage_id"]
+        if "pipeline_id" in kwargs:
+            data["pipeline_id"] = kwargs["pipeline_id"]
+        if "owner_id" in kwargs:
+            data["user_id"] = kwargs["owner_id"]
+        if "channel" in kwargs:
+            data["channel"] = kwargs["channel"]
+        if "ads_id" in kwargs:
+            data["67e90727a702feaee708eb4be15c896f1e4d125e"] = kwargs["ads_id"]
+        if "campaign_id" in kwargs:
+            data["90ee914e411f8e76eda8b270c576fa20ce945af6"] = kwargs["campaign_id"]
+        if "ad_name" in kwargs:
+            data["cb5af1d8630657fc3ab4bb01c243f993141df2e7"] = kwargs["ad_name"]
+        if "tag" in kwargs:
+            data["70a34135774fbab2a37608d3d4c5da3be9dfa10a"] = kwargs["tag"]
+        if "use_case" in kwargs:
+            data["aa6cbdaafd283f46db835b902902f549e86bb915"] = kwargs["use_case"]
+        if "company_domain" in kwargs:
+            data["34d3f450e4c96e0390b8dd9a7a034e7d64c53db0"] = kwargs["company_domain"]
+        if "abstra_cloud_org_id" in kwargs:
+            data["68396303430f23178b5bc6978b5b3021cf5eff47"] = kwargs[
+                "abstra_cloud_org_id"
+            ]
+        if "value" in kwargs:
+            data["value"] = kwargs["value"]
+        if "qualification_milestone" in kwargs:
+            data["5abfbfa90d21348b998b9c259392182130d04647"] = kwargs[
+                "qualification_milestone"
+            ]
+        if "status" in kwargs:
+            data["status"] = kwargs["status"]
+        if "lost_reason" in kwargs:
+            data["lost_reason"] = kwargs["lost_reason"]
+
+        return data
+
+    def _put(self, data: dict) -> Optional[dict]:
+        url = encode_url(entity="deals", entity_id=self.id)
+
+        try:
+            response = api.put(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error updating deal - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return response_json["data"]
+
+        return None
+
+    def move_in_pipeline(self) -> "Deal":
+        metadata, meeting = self._meeting_stage()
+        if meeting is None or metadata.is_at_or_after(self.stage_id, meeting.id):
+            return self
+
+        return self.update(stage_id=meeting.id)
+
+    def add_participant(self, participant_id: int) -> Optional[bool]:
+        """
+        Add a participant to a deal in Pipedrive.
+
+        :param participant_id: int person id
+        :return: True if successful, None if there's an error
+        """
+
+        url = encode_url(entity="deals", entity_id=self.id, subpath="participants")
+        data = {"person_id": participant_id}
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error adding participant to deal - {e}")
+            return None
+
+        participants = self.__dict__.get("_participants")
+        if participants is not None:
+            participant = response.json().get("data") or {}
+            participants[participant_id] = participant.get("id")
+
+        return True
+
+    def participants(self, refresh: bool = False) -> Optional[list[int]]:
+        """
+        Person ids of the deal's participants, read once and cached on the
+        deal; the participant methods below keep the cache current.
+
+        :param refresh: bool read them again
+        :return: list[int], None if there's an error
+        """
+
+        if refresh or self.__dict__.get("_participants") is None:
+            from .pagination import iter_pages
+
+            url = encode_url(
+                entity="deals",
+                entity_id=self.id,
+                subpath="participants",
+                params={"limit": 500},
+            )
+
+            participants = {}
+            try:
+                for page in iter_pages(url):
+                    for participant in page:
+                        person_id = _related_id(participant.get("person_id"))
+                        participants[person_id] = participant.get("id")
+            except Exception as e:
+                print(f"Error retrieving deal participants - {e}")
+                return None
+
+            self.__dict__["_participants"] = participants
+
+        return list(self.__dict__["_participants"])
+
+    def add_participants(self, participant_ids: Iterable[int]) -> Optional[bool]:
+        """
+        Add the persons that are not participants yet, concurrently.
+        Persons already on the deal cost no request, so re-running a sync
+        is free.
+
+        :param participant_ids: Iterable[int] person ids
+        :return: True if successful, None if there's an error
+        """
+
+        current = self.participants()
+        if current is None:
+            return None
+
+        return self._change_participants(
+            added=[id for id in dict.fromkeys(participant_ids) if id not in current],
+            removed=[],
+        )
+
+    def remove_participants(self, participant_ids: Iterable[int]) -> Optional[bool]:
+        current = self.participants()
+        if current is None:
+            return None
+
+        return self._change_participants(
+            added=[], removed=[id for id in dict.fromkeys(participant_ids) if id in current]
+        )
+
+    def set_participants(self, participant_ids: Iterable[int]) -> Optional[bool]:
+        """
+        Make `participant_ids` the deal's participants, adding and removing
+        only the difference.
+
+        :param participant_ids: Iterable[int] person ids
+        :return: True if successful, None if there's an error
+        """
+
+        current = self.participants()
+        if current is None:
+            return None
+
+        wanted = list(dict.fromkeys(participant_ids))
+        return self._change_participants(
+            added=[id for id in wanted if id not in current],
+            removed=[id for id in current if id not in wanted],
+        )
+
+    def _change_participants(self, added: list[int], removed: list[int]) -> Optional[bool]:
+        from .concurrency import map_concurrent
+
+        # Participants added without a record id in the response are looked
+        # up again here, once: the workers below share the cached dict, so
+        # none of them may replace it.
+        cached = self.__dict__["_participants"]
+        if any(cached.get(id) is None for id in removed):
+            if self.participants(refresh=True) is None:
+                return None
+
+        changes = [(self.add_participant, id) for id in added]
+        changes += [(self._remove_participant, id) for id in removed]
+
+        results = map_concurrent(lambda change: change[0](change[1]), changes)
+        return True if all(results) else None
+
+    def _remove_participant(self, participant_id: int) -> Optional[bool]:
+        record_id = self.__dict__["_participants"].get(participant_id)
+        if record_id is None:
+            return True
+
+        url = encode_url(
+            entity="deals",
+            entity_id=self.id,
+            subpath=f"participants/{record_id}",
+        )
+
+        try:
+            response = api.delete(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error removing participant from deal - {e}")
+            return None
+
+        self.__dict__["_participants"].pop(participant_id, None)
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "org_id": self.org_id,
+            "person_id": self.person_id,
+            "ads_id": self.ads_id,
+            "campaign_id": self.campaign_id,
+            "ad_name": self.ad_name,
+            "stage_id": self.stage_id,
+            "stage_change_time": self.stage_change_time,
+            "pipeline_id": self.pipeline_id,
+            "owner_id": self.owner_id,
+            "owner_name": self.owner_name,
+            "won_time": self.won_time,
+            "channel": self.channel,
+            "weighted_value": self.weighted_value,
+            "tag": self.tag,
+            "use_case": self.use_case,
+            "company_domain": self.company_domain,
+            "abstra_cloud_org_id": self.abstra_cloud_org_id,
+            "value": self.value,
+            "qualification_milestone": self.qualification_milestone,
+            "status": self.status,
+            "lost_reason": self.lost_reason,
+            "expected_close_date": self.expected_close_date,
+            "add_time": self.add_time,
+            "next_activity_date": self.next_activity_date,
+        }
@@ -0,0 +1,318 @@
+"""
+Duplicate-person detection and bulk merging.
+
+Persons are streamed page by page and joined on their normalized emails
+and phones in a single pass. Only a few integers per person are kept
+(position, id and ranking counters), plus one dictionary entry per distinct
+email or phone:
+
+    candidates = find_duplicates()      # every person in the account
+    report = merge_duplicates(candidates, dry_run=True)
+    print(report.merges, "merges planned")
+
+    merge_duplicates(candidates, dry_run=False)
+"""
+
+import json
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .concurrency import map_concurrent
+from .pagination import iter_pages, prefetch
+from .phones import DEFAULT_COUNTRY_CODE, normalize_phone
+from .scheduling import BACKGROUND, prioritized
+
+EMAIL = "email"
+PHONE = "phone"
+
+# Groups larger than this usually come from placeholder values shared by
+# unrelated persons ("-", a switchboard number) and are never merged.
+MAX_GROUP_SIZE = 20
+
+
+@dataclass
+class MergeCandidate:
+    """
+    :param survivor_id: int person kept, the one with most deals and
+        activities (the oldest on ties); the counts come from the raw
+        records, so for Person objects it is the oldest
+    :param duplicate_ids: list[int] persons to merge into the survivor
+    :param reasons: list[str] kinds of keys the persons share, "email" and/or "phone"
+    :param shared_keys: int matching emails and phones found between them
+    """
+
+    survivor_id: int
+    duplicate_ids: list[int]
+    reasons: list[str]
+    shared_keys: int
+
+    @property
+    def confidence(self) -> tuple:
+        """Sort key: shared emails first, then more shared keys."""
+
+        return (EMAIL in self.reasons, self.shared_keys, -len(self.duplicate_ids))
+
+
+@dataclass
+class MergeReport:
+    """
+    :param candidates: int groups considered
+    :param merges: int merges planned (dry run) or attempted
+    :param merged: int merges that succeeded
+    :param failed: int merges that failed
+    :param skipped: int groups larger than `max_group_size`
+    :param errors: list[str]
+    :param plan: list[tuple[int, int]] (duplicate id, survivor id) merges in order
+    """
+
+    candidates: int = 0
+    merges: int = 0
+    merged: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    plan: list = field(default_factory=list)
+
+
+def iter_person_records(page_size: int = 500) -> Iterator[dict]:
+    """Raw v1 person records of the whole account, one page in memory at a time."""
+
+    url = encode_url(entity="persons", params={"limit": page_size})
+    for page in prefetch(iter_pages(url)):
+        yield from page
+
+
+def _values(record, name: str, plural: str) -> list:
+    if isinstance(record, dict):
+        return [
+            entry.get("value") if isinstance(entry, dict) else entry
+            for entry in record.get(name) or []
+        ]
+
+    values = list(getattr(record, plural, None) or [])
+    single = getattr(record, name, None)
+    if single and single not in values:
+        values.append(single)
+    return values
+
+
+def _stat(record, name: str) -> int:
+    if isinstance(record, dict):
+        return record.get(name) or 0
+    return getattr(record, name, None) or 0
+
+
+def _keys(record, kinds: tuple, country_code: str) -> set:
+    """
+    Normalized emails and E.164 phones of a person. Plain strings keep the
+    join table small; phones are told apart by their leading "+".
+    """
+
+    keys = set()
+
+    if EMAIL in kinds:
+        for email in _values(record, "email", "emails"):
+            email = (email or "").strip().casefold()
+            if "@" in email and not email.startswith("+"):
+                keys.add(email)
+
+    if PHONE in kinds:
+        for phone in _values(record, "phone", "phones"):
+            number = normalize_phone(phone, country_code)
+            if number is not None:
+                keys.add(number)
+
+    return keys
+
+
+def _kind(key: str) -> str:
+    return PHONE if key.startswith("+") else EMAIL
+
+
+class _DisjointSet:
+    """Union-find over person positions, stored in a flat array."""
+
+    def __init__(self):
+        self.parent = array("l")
+
+    def add(self) -> int:
+        position = len(self.parent)
+        self.parent.append(position)
+        return position
+
+    def find(self, position: int) -> int:
+        parent = self.parent
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def union(self, a: int, b: int) -> None:
+        a = self.find(a)
+        b = self.find(b)
+        if a != b:
+            # The earlier position becomes the root, so roots are stable.
+            self.parent[max(a, b)] = min(a, b)
+
+
+@prioritized(BACKGROUND)
+def find_duplicates(
+    records: Optional[Iterable] = None,
+    keys: tuple = (EMAIL, PHONE),
+    default_country_code: str = DEFAULT_COUNTRY_CODE,
+) -> list[MergeCandidate]:
+    """
+    Group persons sharing a normalized email or phone, best candidates first.
+
+    :param records: Iterable of raw v1 person dicts or Persons, defaults to
+        streaming every person of the account. The survivor ranking reads
+        `open_deals_count`, `closed_deals_count` and `activities_count`,
+        which Persons only have if set on them.
+    :param keys: tuple kinds of keys to join on, "email" and/or "phone"
+    :param default_country_code: str country of phones stored without one
+    :return: list[MergeCandidate]
+    """
+
+    if records is None:
+        records = iter_person_records()
+
+    sets = _DisjointSet()
+    ids = array("q")
+    deals = array("l")
+    activities = array("l")
+
+    # key -> position of the first person having it
+    first: dict = {}
+    # root position -> {kind: shared keys}, only for persons that joined
+    shared: dict = {}
+
+    for record in records:
+        position = sets.add()
+        ids.append(record["id"] if isinstance(record, dict) else record.id)
+        deals.append(_stat(record, "open_deals_count") + _stat(record, "closed_deals_count"))
+        activities.append(_stat(record, "activities_count"))
+
+        for key in _keys(record, keys, default_country_code):
+            other = first.setdefault(key, position)
+            if other == position:
+                continue
+
+            root, other_root = sets.find(position), sets.find(other)
+            counts = shared.pop(root, {})
+            if other_root != root:
+                for kind, count in shared.pop(other_root, {}).items():
+                    counts[kind] = counts.get(kind, 0) + count
+            kind = _kind(key)
+            counts[kind] = counts.get(kind, 0) + 1
+
+            sets.union(position, other)
+            shared[sets.find(position)] = counts
+
+    del first
+
+    groups: dict = {root: [] for root in shared}
+    for position in range(len(ids)):
+        root = sets.find(position)
+        if root in groups:
+            groups[root].append(position)
+
+    candidates = []
+    for root, positions in groups.items():
+        positions.sort(key=lambda position: (-deals[position], -activities[position], ids[position]))
+        counts = shared[root]
+        candidates.append(
+            MergeCandidate(
+                survivor_id=ids[positions[0]],
+                duplicate_ids=[ids[position] for position in positions[1:]],
+                reasons=sorted(counts),
+                shared_keys=sum(counts.values()),
+            )
+        )
+
+    candidates.sort(key=lambda candidate: candidate.confidence, reverse=True)
+    return candidates
+
+
+def merge_person(person_id: int, merge_with_id: int) -> Optional[bool]:
+    """
+    Merge `person_id` into `merge_with_id`, which is kept.
+
+    :return: True if successful, None if there's an error
+    """
+
+    url = encode_url(entity="persons", entity_id=person_id, subpath="merge")
+
+    try:
+        response = api.put(
+            url,
+            data=json.dumps({"merge_with_id": merge_with_id}),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Error merging person {person_id} into {merge_with_id} - {e}")
+        return None
+
+    return True
+
+
+@prioritized(BACKGROUND)
+def merge_duplicates(
+    candidates: Iterable[MergeCandidate],
+    dry_run: bool = True,
+    require_email: bool = False,
+    max_group_size: int = MAX_GROUP_SIZE,
+    max_workers: Optional[int] = None,
+) -> MergeReport:
+    """
+    Merge each candidate's duplicates into its survivor. Groups run in
+    parallel (within the active client's rate limit); merges of one group
+    run in order, since they all write to the same survivor.
+
+    :param candidates: Iterable[MergeCandidate] from `find_duplicates`
+    :param dry_run: bool only fill in the report's plan
+    :param require_email: bool skip groups that only share phones
+    :param max_group_size: int skip larger groups
+    :param max_workers: int concurrent groups, defaults to the client's pool size
+    :return: MergeReport
+    """
+
+    report = MergeReport()
+    groups = []
+
+    for candidate in candidates:
+        report.candidates += 1
+        if require_email and EMAIL not in candidate.reasons:
+            continue
+        if len(candidate.duplicate_ids) + 1 > max_group_size:
+            report.skipped += 1
+            continue
+
+        groups.append(candidate)
+        for duplicate_id in candidate.duplicate_ids:
+            report.plan.append((duplicate_id, candidate.survivor_id))
+
+    report.merges = len(report.plan)
+    if dry_run:
+        return report
+
+    def merge_group(candidate: MergeCandidate) -> list:
+        return [
+            (duplicate_id, merge_person(duplicate_id, candidate.survivor_id))
+            for duplicate_id in candidate.duplicate_ids
+        ]
+
+    for candidate, results in zip(groups, map_concurrent(merge_group, groups, max_workers)):
+        for duplicate_id, result in results:
+            if result:
+                report.merged += 1
+            else:
+                report.failed += 1
+                report.errors.append(
+                    f"person {duplicate_id} into {candidate.survivor_id} failed"
+                )
+
+    return report
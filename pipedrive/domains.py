@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+GENERIC_DOMAINS = generic_email_domains = frozenset([
+    "aol.com",
+    "aol.com.br",
+    "bol.com",
+    "bol.com.br",
+    "countermail.com",
+    "countermail.com.br",
+    "disroot.org",
+    "disroot.org.br",
+    "fastmail.com",
+    "fastmail.com.br",
+    "gmail.com",
+    "gmail.com.br",
+    "gmx.com",
+    "gmx.com.br",
+    "hotmail.com",
+    "hotmail.com.br",
+    "hushmail.com",
+    "hushmail.com.br",
+    "icloud.com",
+    "icloud.com.br",
+    "keemail.me",
+    "keemail.me.br",
+    "kolabnow.com",
+    "kolabnow.com.br",
+    "lavabit.com",
+    "lavabit.com.br",
+    "live.com",
+    "live.com.br",
+    "mail.com",
+    "mail.com.br",
+    "mail.ru",
+    "mail.ru.br",
+    "mailbox.org",
+    "mailbox.org.br",
+    "msn.com",
+    "msn.com.br",
+    "outlook.com",
+    "outlook.com.br",
+    "posteo.de",
+    "posteo.de.br",
+    "protonmail.com",
+    "protonmail.com.br",
+    "rippermail.com",
+    "rippermail.com.br",
+    "runbox.com",
+    "runbox.com.br",
+    "tutanota.com",
+    "tutanota.com.br",
+    "uol.com",
+    "uol.com.br",
+    "yahoo.com",
+    "yahoo.com.br",
+    "yandex.com",
+    "yandex.com.br",
+    "ymail.com",
+    "ymail.com.br",
+    "zoho.com",
+    "zoho.com.br",
+])
+
+# Multi-label public suffixes. Any other domain falls back to the public
+# suffix list default rule: the last label alone is the public suffix.
+PUBLIC_SUFFIXES = frozenset([
+    "ac.uk",
+    "co.in",
+    "co.jp",
+    "co.nz",
+    "co.uk",
+    "co.za",
+    "com.ar",
+    "com.au",
+    "com.br",
+    "com.cn",
+    "com.co",
+    "com.mx",
+    "com.pe",
+    "com.pt",
+    "com.tr",
+    "com.uy",
+    "edu.br",
+    "gov.br",
+    "gov.uk",
+    "ind.br",
+    "ltd.uk",
+    "net.au",
+    "net.br",
+    "org.au",
+    "org.br",
+    "org.uk",
+    "plc.uk",
+])
+
+_MAX_SUFFIX_LABELS = max(suffix.count(".") + 1 for suffix in PUBLIC_SUFFIXES)
+
+
+@dataclass(frozen=True)
+class DomainInfo:
+    """
+    :param domain: str normalized domain of the email address
+    :param registrable_domain: str domain one label below its public suffix
+    :param is_generic: bool True for free mail providers such as gmail.com
+    """
+
+    domain: str
+    registrable_domain: str
+    is_generic: bool
+
+    @property
+    def company_domain(self) -> Optional[str]:
+        return None if self.is_generic else self.registrable_domain
+
+
+def normalize_domain(domain: Optional[str]) -> Optional[str]:
+    if not domain:
+        return None
+
+    domain = domain.strip().strip(".").lower()
+    return domain or None
+
+
+def email_domain(email: Optional[str]) -> Optional[str]:
+    """Normalized domain part of an email address, or None if there is none."""
+
+    if not email:
+        return None
+
+    _, at, domain = email.strip().rstrip(">").rpartition("@")
+    if not at:
+        return None
+
+    return normalize_domain(domain)
+
+
+@lru_cache(maxsize=65536)
+def _classify_domain(domain: str) -> DomainInfo:
+    labels = domain.split(".")
+    registrable = domain
+
+    if len(labels) > 1:
+        suffix_labels = 1
+        for size in range(min(_MAX_SUFFIX_LABELS, len(labels) - 1), 1, -1):
+            if ".".join(labels[-size:]) in PUBLIC_SUFFIXES:
+                suffix_labels = size
+                break
+        registrable = ".".join(labels[-suffix_labels - 1 :])
+
+    return DomainInfo(
+        domain=domain,
+        registrable_domain=registrable,
+        is_generic=domain in GENERIC_DOMAINS or registrable in GENERIC_DOMAINS,
+    )
+
+
+def classify_domain(domain: Optional[str]) -> Optional[DomainInfo]:
+    domain = normalize_domain(domain)
+    if domain is None:
+        return None
+
+    return _classify_domain(domain)
+
+
+def classify(email: Optional[str]) -> Optional[DomainInfo]:
+    domain = email_domain(email)
+    if domain is None:
+        return None
+
+    return _classify_domain(domain)
+
+
+def classify_many(emails: Iterable[Optional[str]]) -> list[Optional[DomainInfo]]:
+    """
+    Classify emails in bulk, in input order.
+
+    Each distinct domain is classified once per call, so a batch of millions
+    of signups costs one dict lookup per email for the common providers.
+
+    :param emails: Iterable[str]
+    :return: list[DomainInfo | None]
+    """
+
+    seen = {}
+    results = []
+    append = results.append
+
+    for email in emails:
+        domain = email_domain(email)
+        if domain is None:
+            append(None)
+            continue
+
+        info = seen.get(domain)
+        if info is None:
+            info = seen[domain] = _classify_domain(domain)
+        append(info)
+
+    return results
+
+
+def registrable_domain(domain: Optional[str]) -> Optional[str]:
+    info = classify_domain(domain)
+    return info.registrable_domain if info is not None else None
+
+
+def is_generic_domain(domain: Optional[str]) -> bool:
+    info = classify_domain(domain)
+    return info is not None and info.is_generic
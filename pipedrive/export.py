@@ -0,0 +1,452 @@
+"""
+Stream Pipedrive collections to NDJSON, CSV or Parquet files.
+
+Records go from each fetched page straight to the file, so memory stays
+bounded by the page size whatever the size of the account:
+
+    export("deals", "deals.ndjson.gz")
+
+    python -m pipedrive.export deals deals.csv --compression zstd
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from .api import encode_url
+from .pagination import iter_pages, prefetch
+from .scheduling import BACKGROUND, prioritized
+
+FORMATS = ("ndjson", "csv", "parquet")
+COMPRESSIONS = ("gzip", "zstd")
+
+_FORMAT_EXTENSIONS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+_COMPRESSION_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def _decoders() -> dict:
+    from .activity import Activity
+    from .deal import Deal
+    from .lead import Lead
+    from .organization import Organization
+    from .person import Person
+
+    # entity -> (collection params, v1 decoder)
+    return {
+        "deals": ({}, Deal.from_dict),
+        "persons": ({}, Person.from_dict),
+        "organizations": ({}, Organization.from_dict),
+        "activities": ({"user_id": 0}, Activity.from_dict),
+        "leads": ({}, Lead.from_dict),
+    }
+
+
+ENTITIES = ("deals", "persons", "organizations", "activities", "leads")
+
+
+def iter_rows(entity: str, page_size: int = 500) -> Iterator[list[dict]]:
+    """
+    Yield the `to_dict()` rows of an entity collection, one page at a time.
+
+    :param entity: str one of ENTITIES
+    :param page_size: int records per request
+    :return: Iterator[list[dict]]
+    """
+
+    decoders = _decoders()
+    if entity not in decoders:
+        raise ValueError(f"Unknown entity {entity}, expected one of {', '.join(ENTITIES)}")
+
+    params, decode = decoders[entity]
+    url = encode_url(entity=entity, params={**params, "limit": page_size})
+
+    for page in prefetch(iter_pages(url)):
+        yield [decode(result).to_dict() for result in page]
+
+
+def _guess(path: str, format: Optional[str], compression: Optional[str]):
+    root, extension = os.path.splitext(path)
+
+    if compression is None and extension in _COMPRESSION_EXTENSIONS:
+        compression = _COMPRESSION_EXTENSIONS[extension]
+    if extension in _COMPRESSION_EXTENSIONS:
+        extension = os.path.splitext(root)[1]
+
+    if format is None:
+        format = _FORMAT_EXTENSIONS.get(extension)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format for {path}, expected one of {', '.join(FORMATS)}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression}, expected one of {', '.join(COMPRESSIONS)}")
+
+    return format, compression
+
+
+def _zstd_compressor():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the zstandard package") from e
+
+    return zstandard.ZstdCompressor()
+
+
+class _Stream:
+    """Binary output with optional compression and fsync checkpoints."""
+
+    def __init__(self, path: str, compression: Optional[str]):
+        compressor = _zstd_compressor() if compression == "zstd" else None
+        self.raw = open(path, "wb")
+
+        if compression == "gzip":
+            self.stream = gzip.GzipFile(fileobj=self.raw, mode="wb")
+        elif compressor is not None:
+            self.stream = compressor.stream_writer(self.raw, closefd=False)
+        else:
+            self.stream = self.raw
+
+    def write(self, data: bytes) -> None:
+        self.stream.write(data)
+
+    def checkpoint(self) -> None:
+        """Push everything written so far to disk, as a decodable prefix."""
+
+        if self.stream is not self.raw:
+            if isinstance(self.stream, gzip.GzipFile):
+                self.stream.flush()
+            else:
+                import zstandard
+
+                self.stream.flush(zstandard.FLUSH_FRAME)
+
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+
+    def close(self) -> None:
+        if self.stream is not self.raw:
+            self.stream.close()
+        if not self.raw.closed:
+            self.raw.flush()
+            os.fsync(self.raw.fileno())
+            self.raw.close()
+
+
+def _flat(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class _NdjsonWriter:
+    def __init__(self, stream: _Stream):
+        self.stream = stream
+
+    def write(self, rows: list[dict]) -> None:
+        self.stream.write(
+            "".join(
+                json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows
+            ).encode()
+        )
+
+    def close(self) -> None:
+        pass
+
+
+class _CsvWriter:
+    def __init__(self, stream: _Stream):
+        self.stream = stream
+        self.fields: Optional[list] = None
+
+    def write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        if self.fields is None:
+            self.fields = list(rows[0])
+            writer.writerow(self.fields)
+
+        for row in rows:
+            writer.writerow([_flat(row.get(name)) for name in self.fields])
+
+        self.stream.write(buffer.getvalue().encode())
+
+    def close(self) -> None:
+        pass
+
+
+class _ParquetWriter:
+    """
+    One row group per page; nested values are stored as JSON strings.
+
+    Column types follow the data rather than the first page alone. A page
+    that does not fit the types so far widens them (null to any type, int
+    to float, any other mix to string) and the row groups already written
+    are copied, one at a time, into a file with the wider schema. A column
+    can only widen a few times, so an export is copied at most a handful of
+    times. Columns that are empty in every record keep the null type.
+    """
+
+    def __init__(self, path: str, compression: Optional[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet export requires the pyarrow package") from e
+
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = path
+        self.compression = compression or "none"
+        self.schema = None
+        self.writer = None
+
+    def _table(self, rows: list[dict]):
+        pyarrow = self.pyarrow
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        arrays = []
+
+        for name in names:
+            values = [_flat(row.get(name)) for row in rows]
+            try:
+                array = pyarrow.array(values)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                array = pyarrow.array(
+                    [None if value is None else str(value) for value in values],
+                    pyarrow.string(),
+                )
+            arrays.append(array)
+
+        return pyarrow.Table.from_arrays(arrays, names=names)
+
+    def _wider(self, a, b):
+        types = self.pyarrow.types
+
+        if a == b or types.is_null(b):
+            return a
+        if types.is_null(a):
+            return b
+        if types.is_integer(a) and types.is_integer(b):
+            return self.pyarrow.int64()
+        if (types.is_integer(a) or types.is_floating(a)) and (
+            types.is_integer(b) or types.is_floating(b)
+        ):
+            return self.pyarrow.float64()
+        return self.pyarrow.string()
+
+    def _widen(self, schema):
+        fields = {field.name: field.type for field in self.schema}
+        for field in schema:
+            fields[field.name] = self._wider(fields.get(field.name, self.pyarrow.null()), field.type)
+        return self.pyarrow.schema(list(fields.items()))
+
+    def _conform(self, table, schema):
+        pyarrow = self.pyarrow
+        return pyarrow.Table.from_arrays(
+            [
+                table[field.name].cast(field.type)
+                if field.name in table.column_names
+                else pyarrow.nulls(table.num_rows, field.type)
+                for field in schema
+            ],
+            schema=schema,
+        )
+
+    def _open(self, schema) -> None:
+        self.schema = schema
+        self.writer = self.parquet.ParquetWriter(
+            self.path, schema, compression=self.compression
+        )
+
+    def _rewrite(self, schema) -> None:
+        self.writer.close()
+        previous = f"{self.path}.previous"
+        os.replace(self.path, previous)
+
+        try:
+            self._open(schema)
+            written = self.parquet.ParquetFile(previous)
+            for index in range(written.num_row_groups):
+                self.writer.write_table(
+                    self._conform(written.read_row_group(index), schema)
+                )
+        finally:
+            os.remove(previous)
+
+    def write(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+
+        table = self._table(rows)
+
+        if self.writer is None:
+            self._open(table.schema)
+        else:
+            schema = self._widen(table.schema)
+            if not schema.equals(self.schema):
+                self._rewrite(schema)
+
+        self.writer.write_table(self._conform(table, self.schema))
+
+    def checkpoint(self) -> None:
+        # Parquet footers are only written on close; a partial file is not
+        # readable, so there is nothing useful to sync before that.
+        pass
+
+    def close(self) -> None:
+        if self.writer is None:
+            self.parquet.write_table(self.pyarrow.table({}), self.path)
+        else:
+            self.writer.close()
+
+    def abort(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+@dataclass
+class ExportReport:
+    """
+    :param path: str written file
+    :param rows: int records written
+    :param pages: int pages fetched
+    :param checkpoints: int fsyncs before the final one
+    :param seconds: float wall time
+    """
+
+    path: str
+    rows: int = 0
+    pages: int = 0
+    checkpoints: int = 0
+    seconds: float = 0.0
+
+
+@prioritized(BACKGROUND)
+def export(
+    entity: str,
+    path: str,
+    format: Optional[str] = None,
+    compression: Optional[str] = None,
+    checkpoint_rows: int = 10000,
+    page_size: int = 500,
+    progress: Optional[Callable[[ExportReport], None]] = None,
+) -> ExportReport:
+    """
+    Stream an entity collection to a file.
+
+    The file is written as `<path>.part` and renamed when complete, so
+    `path` only ever holds a finished export. NDJSON and CSV output is
+    fsynced every `checkpoint_rows` records.
+
+    :param entity: str one of ENTITIES
+    :param path: str output file
+    :param format: str "ndjson", "csv" or "parquet", defaults to the extension
+    :param compression: str "gzip" or "zstd", defaults to the extension
+        (".gz", ".zst"); Parquet uses it as its column codec
+    :param checkpoint_rows: int records between fsyncs
+    :param page_size: int records per request
+    :param progress: callable receiving the report after each page
+    :return: ExportReport
+    """
+
+    format, compression = _guess(path, format, compression)
+    partial = f"{path}.part"
+    report = ExportReport(path=path)
+    started = time.perf_counter()
+
+    stream = None
+    if format == "parquet":
+        writer = _ParquetWriter(partial, compression)
+        checkpoint = writer.checkpoint
+    else:
+        stream = _Stream(partial, compression)
+        writer = (_CsvWriter if format == "csv" else _NdjsonWriter)(stream)
+        checkpoint = stream.checkpoint
+
+    try:
+        since_checkpoint = 0
+        for rows in iter_rows(entity, page_size):
+            writer.write(rows)
+
+            report.pages += 1
+            report.rows += len(rows)
+            since_checkpoint += len(rows)
+
+            if since_checkpoint >= checkpoint_rows:
+                checkpoint()
+                report.checkpoints += 1
+                since_checkpoint = 0
+
+            if progress is not None:
+                report.seconds = time.perf_counter() - started
+                progress(report)
+
+        writer.close()
+        if stream is not None:
+            stream.close()
+    except BaseException:
+        try:
+            if stream is not None:
+                stream.close()
+            else:
+                writer.abort()
+        finally:
+            # A failed export leaves nothing behind, not even a partial file.
+            if os.path.exists(partial):
+                os.remove(partial)
+        raise
+
+    os.replace(partial, path)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pipedrive.export",
+        description="Stream a Pipedrive collection to NDJSON, CSV or Parquet.",
+    )
+    parser.add_argument("entity", choices=ENTITIES)
+    parser.add_argument("path", help="output file; the extension picks the format")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--compression", choices=COMPRESSIONS)
+    parser.add_argument("--checkpoint-rows", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    def progress(report: ExportReport) -> None:
+        print(f"\r{report.rows} rows, {report.pages} pages", end="", file=sys.stderr)
+
+    report = export(
+        args.entity,
+        args.path,
+        format=args.format,
+        compression=args.compression,
+        checkpoint_rows=args.checkpoint_rows,
+        page_size=args.page_size,
+        progress=progress,
+    )
+
+    print(
+        f"\nwrote {report.rows} {args.entity} to {report.path} in {report.seconds:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
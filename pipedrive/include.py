@@ -0,0 +1,100 @@
+from typing import Iterable, Optional
+
+from .activity import Activity
+from .api import encode_url
+from .concurrency import map_concurrent
+from .organization import Organization
+from .pagination import iter_pages
+from .person import Person
+
+INCLUDES = ("person", "organization", "activities")
+
+
+class IncludeLoader:
+    """
+    Attach related records to Deals page by page.
+
+    Referenced persons and organizations are fetched through `get_many`,
+    deduplicated across every page the loader sees. Activities are loaded
+    per deal, concurrently, or, for full listings (`scan_activities`), by
+    streaming the activities collection once and grouping it by deal.
+
+        loader = IncludeLoader(["person", "organization"])
+        for page in pages:
+            loader.attach(page)
+    """
+
+    def __init__(self, include: Iterable[str], scan_activities: bool = False):
+        """
+        :param include: Iterable[str] any of "person", "organization", "activities"
+        :param scan_activities: bool stream all activities once instead of
+            requesting them per deal
+        """
+
+        self.include = frozenset(include)
+
+        unknown = self.include.difference(INCLUDES)
+        if unknown:
+            raise ValueError(
+                f"Unknown include {', '.join(sorted(unknown))}, expected any of {', '.join(INCLUDES)}"
+            )
+
+        self.scan_activities = scan_activities
+        self.persons: dict = {}
+        self.organizations: dict = {}
+        self.activities: Optional[dict] = None
+
+    def attach(self, deals: list) -> list:
+        if "person" in self.include:
+            self._load(Person, self.persons, (deal.person_id for deal in deals))
+            for deal in deals:
+                deal.person = self.persons.get(deal.person_id)
+
+        if "organization" in self.include:
+            self._load(Organization, self.organizations, (deal.org_id for deal in deals))
+            for deal in deals:
+                deal.organization = self.organizations.get(deal.org_id)
+
+        if "activities" in self.include:
+            activities = self._load_activities([deal.id for deal in deals])
+            for deal in deals:
+                deal.activities = activities.get(deal.id, [])
+
+        return deals
+
+    @staticmethod
+    def _load(entity_class: type, cache: dict, ids: Iterable[Optional[int]]) -> None:
+        missing = [id for id in dict.fromkeys(ids) if id is not None and id not in cache]
+        if not missing:
+            return
+
+        for record in entity_class.get_many(missing):
+            cache[record.id] = record
+
+        for id in missing:
+            cache.setdefault(id, None)
+
+    def _load_activities(self, deal_ids: list[int]) -> dict:
+        if self.scan_activities:
+            if self.activities is None:
+                self.activities = {}
+                for activity in Activity.iter_range(user_id=0):
+                    self.activities.setdefault(activity.deal_id, []).append(activity)
+            return self.activities
+
+        if self.activities is None:
+            self.activities = {}
+
+        missing = [id for id in dict.fromkeys(deal_ids) if id not in self.activities]
+        for id, activities in zip(missing, map_concurrent(_deal_activities, missing)):
+            self.activities[id] = activities
+
+        return self.activities
+
+
+def _deal_activities(deal_id: int) -> list[Activity]:
+    url = encode_url(
+        entity="deals", entity_id=deal_id, subpath="activities", params={"limit": 500}
+    )
+
+    return [Activity.from_dict(result) for page in iter_pages(url) for result in page]
@@ -0,0 +1,257 @@
+import json
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .client import get_client
+from .concurrency import map_concurrent
+from .pagination import iter_pages
+
+LEADS_PAGE_SIZE = 500
+
+# Observed size of the leads collection per account, used to plan bulk lookups.
+_lead_counts: dict = {}
+
+
+class Lead:
+
+    @dataclass
+    class Channel:
+        phantombuster_auto = 97
+        abstra_start = 173
+        outbound = 33
+        inbound = 174
+        event = 29
+        personal_network = 28
+        yc_referral = 95
+        customer_referral = 65
+        prospect_referral = 66
+        investor_intro = 103
+        previous_customer = 101
+        linkedin_automatic_prospecting = 97
+        rfp = 27
+        google_ads = 30
+        linkedin_ads = 31
+        cubo = 76
+        product = 89
+        linkedin_content = 93
+        website_demo = 32
+
+    def __init__(self, **kwargs) -> None:
+        """
+        :param id: int
+        :param title: str
+        :param owner_id: int
+        :param person_id: int
+        :param org_id: int
+        :param origin_id: str
+        :param channel: str
+        :param channel_id: str
+        """
+
+        self.id = kwargs.get("id", None)
+        self.title = kwargs.get("title", None)
+        self.owner_id = kwargs.get("owner_id", None)
+        self.person_id = kwargs.get("person_id", None)
+        self.org_id = kwargs.get("org_id", None)
+        self.origin_id = kwargs.get("origin_id", None)
+        self.channel = kwargs.get("channel", None)
+        self.channel_id = kwargs.get("channel_id", None)
+
+    @staticmethod
+    def create(**kwargs) -> "Lead":
+        """
+        :param title: str
+        :param owner_id: int
+        :param person_id: int
+        :param org_id: int
+        :param origin_id: str 
+        :param channel: str
+        :param channel_id: str
+        """
+
+        if "title" not in kwargs:
+            print("title is required")
+            return None
+
+        data = {
+            "title": kwargs["title"],
+            "owner_id": kwargs.get("owner_id", None),
+            "person_id": kwargs.get("person_id", None),
+            "organization_id": kwargs.get("org_id", None),
+            "origin_id": kwargs.get("origin_id", None),
+            "channel": kwargs.get("channel", None),
+            "channel_id": kwargs.get("channel_id", None),
+        }
+
+        url = encode_url(entity="leads")
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating lead - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return Lead(
+                id=response_json["data"]["id"],
+                title=response_json["data"]["title"],
+                owner_id=response_json["data"].get("owner_id"),
+                person_id=response_json["data"].get("person_id"),
+                org_id=response_json["data"].get("organization_id"),
+                origin_id=response_json["data"].get("origin_id"),
+                channel=response_json["data"].get("channel"),
+                channel_id=response_json["data"].get("channel_id"),
+            )
+        
+    @staticmethod
+    def from_dict(data: dict) -> "Lead":
+        return Lead(
+            id=data["id"],
+            title=data["title"],
+            owner_id=data.get("owner_id"),
+            person_id=data.get("person_id"),
+            org_id=data.get("organization_id"),
+            origin_id=data.get("origin_id"),
+            channel=data.get("channel"),
+            channel_id=data.get("channel_id"),
+        )
+
+    @staticmethod
+    def _get_leads(params: dict) -> list["Lead"]:
+        url = encode_url(entity="leads", params={"limit": LEADS_PAGE_SIZE, **params})
+
+        return [
+            Lead.from_dict(result) for page in iter_pages(url) for result in page
+        ]
+
+    @staticmethod
+    def get_lead_by_person_id(person_id: int) -> list["Lead"]:
+        """
+        Retrieve Leads from Pipedrive by Person_id.
+
+        :param person_id: int
+        :return: list[Lead]
+        """
+
+        return Lead._get_leads({"person_id": person_id})
+
+    @staticmethod
+    def get_lead_by_org_id(org_id: int) -> list["Lead"]:
+        """
+        Retrieve Leads from Pipedrive by Org_id.
+
+        :param org_id: int
+        :return: list[Lead]
+        """
+
+        return Lead._get_leads({"organization_id": org_id})
+
+    @staticmethod
+    def get_leads_for_persons(person_ids: Iterable[int]) -> dict[int, list["Lead"]]:
+        """
+        Retrieve the Leads of many persons at once.
+
+        :param person_ids: Iterable[int]
+        :return: dict[int, list[Lead]] keyed by every requested person id
+        """
+
+        return Lead._get_leads_for("person_id", person_ids)
+
+    @staticmethod
+    def get_leads_for_orgs(org_ids: Iterable[int]) -> dict[int, list["Lead"]]:
+        """
+        Retrieve the Leads of many organizations at once.
+
+        :param org_ids: Iterable[int]
+        :return: dict[int, list[Lead]] keyed by every requested organization id
+        """
+
+        return Lead._get_leads_for("organization_id", org_ids)
+
+    @staticmethod
+    def _get_leads_for(field: str, ids: Iterable[int]) -> dict[int, list["Lead"]]:
+        """
+        Pick the cheaper of two plans, counted in requests:
+
+        - filter: one filtered request per id, sent concurrently;
+        - scan: stream the whole leads collection once into an id -> leads map.
+
+        The scan costs one request per page, so it wins when the collection
+        has fewer pages than there are ids. The collection size is remembered
+        per account after a scan. When it is unknown, the scan is tried with a
+        budget of len(ids) pages and abandoned for the filter plan once the
+        budget runs out, so at worst the lookup costs twice the best plan.
+        """
+
+        leads = {id: [] for id in ids if id is not None}
+        if not leads:
+            return leads
+
+        account = get_client().config.company_domain
+        known_count = _lead_counts.get(account)
+
+        if known_count is not None:
+            scan_pages = max(1, math.ceil(known_count / LEADS_PAGE_SIZE))
+            budget = scan_pages if scan_pages <= len(leads) else 0
+        else:
+            budget = len(leads)
+
+        if budget and Lead._scan_leads(field, leads, budget):
+            return leads
+
+        for id, found in zip(
+            leads,
+            map_concurrent(lambda id: Lead._get_leads({field: id}), leads),
+        ):
+            leads[id] = found
+
+        return leads
+
+    @staticmethod
+    def _scan_leads(field: str, leads: dict, budget: int) -> bool:
+        """
+        Fill `leads` from a full scan of at most `budget` pages.
+
+        :return: bool False, with `leads` left empty, if the budget ran out
+        """
+
+        account = get_client().config.company_domain
+        url = encode_url(entity="leads", params={"limit": LEADS_PAGE_SIZE})
+        count = 0
+
+        for pages, page in enumerate(iter_pages(url), start=1):
+            count += len(page)
+            for result in page:
+                matches = leads.get(result.get(field))
+                if matches is not None:
+                    matches.append(Lead.from_dict(result))
+
+            # A full page means there is probably more to read.
+            if pages >= budget and len(page) == LEADS_PAGE_SIZE:
+                _lead_counts[account] = max(count + 1, _lead_counts.get(account, 0))
+                for matches in leads.values():
+                    matches.clear()
+                return False
+
+        _lead_counts[account] = count
+        return True
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "owner_id": self.owner_id,
+            "person_id": self.person_id,
+            "org_id": self.org_id,
+            "origin_id": self.origin_id,
+            "channel": self.channel,
+            "channel_id": self.channel_id,
+        }
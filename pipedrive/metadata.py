@@ -0,0 +1,390 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from .client import Client, get_client
+from .concurrency import map_concurrent
+from .pagination import iter_pages
+
+DEFAULT_TTL = 3600.0
+
+# Seconds a failed load is remembered, so lookups during an outage do not
+# each send the metadata requests again.
+FAILURE_TTL = 60.0
+
+# collection -> v1 endpoint
+ENDPOINTS = {
+    "users": "users",
+    "pipelines": "pipelines",
+    "stages": "stages",
+    "activity_types": "activityTypes",
+}
+
+
+@dataclass(frozen=True)
+class UserInfo:
+    id: int
+    name: str
+    email: Optional[str] = None
+    active: bool = True
+
+
+@dataclass(frozen=True)
+class PipelineInfo:
+    id: int
+    name: str
+    order_nr: int = 0
+    active: bool = True
+
+
+@dataclass(frozen=True)
+class StageInfo:
+    id: int
+    name: str
+    pipeline_id: int
+    order_nr: int = 0
+
+
+@dataclass(frozen=True)
+class ActivityTypeInfo:
+    id: int
+    key: str
+    name: str
+    active: bool = True
+
+
+def _user(data: dict) -> UserInfo:
+    return UserInfo(
+        id=data["id"],
+        name=data.get("name"),
+        email=data.get("email"),
+        active=bool(data.get("active_flag", True)),
+    )
+
+
+def _pipeline(data: dict) -> PipelineInfo:
+    return PipelineInfo(
+        id=data["id"],
+        name=data.get("name"),
+        order_nr=data.get("order_nr") or 0,
+        active=bool(data.get("active", data.get("active_flag", True))),
+    )
+
+
+def _stage(data: dict) -> StageInfo:
+    return StageInfo(
+        id=data["id"],
+        name=data.get("name"),
+        pipeline_id=data.get("pipeline_id"),
+        order_nr=data.get("order_nr") or 0,
+    )
+
+
+def _activity_type(data: dict) -> ActivityTypeInfo:
+    return ActivityTypeInfo(
+        id=data["id"],
+        key=data.get("key_string"),
+        name=data.get("name"),
+        active=bool(data.get("active_flag", True)),
+    )
+
+
+_DECODERS = {
+    "users": _user,
+    "pipelines": _pipeline,
+    "stages": _stage,
+    "activity_types": _activity_type,
+}
+
+_RECORD_CLASSES = {
+    "users": UserInfo,
+    "pipelines": PipelineInfo,
+    "stages": StageInfo,
+    "activity_types": ActivityTypeInfo,
+}
+
+
+class Metadata:
+    """
+    Immutable snapshot of an account's users, pipelines, stages and activity
+    types, indexed for O(1) lookups.
+    """
+
+    def __init__(
+        self,
+        users: list,
+        pipelines: list,
+        stages: list,
+        activity_types: list,
+        loaded_at: Optional[float] = None,
+    ):
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+
+        self.users = {user.id: user for user in users}
+        self.pipelines = {pipeline.id: pipeline for pipeline in pipelines}
+        self.stages = {stage.id: stage for stage in stages}
+        self.activity_types = {type.key: type for type in activity_types}
+
+        self._pipeline_stages: dict = {}
+        for stage in sorted(stages, key=lambda stage: (stage.order_nr, stage.id)):
+            self._pipeline_stages.setdefault(stage.pipeline_id, []).append(stage)
+
+        # Position of each stage within its pipeline, so ordering comparisons
+        # do not depend on gaps in order_nr.
+        self._stage_rank = {
+            stage.id: rank
+            for pipeline_stages in self._pipeline_stages.values()
+            for rank, stage in enumerate(pipeline_stages)
+        }
+        self._stage_by_name = {
+            (stage.pipeline_id, stage.name.casefold()): stage
+            for stage in stages
+            if stage.name
+        }
+
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+    def user_name(self, user_id: Optional[int]) -> Optional[str]:
+        user = self.users.get(user_id)
+        return user.name if user is not None else None
+
+    def pipeline_name(self, pipeline_id: Optional[int]) -> Optional[str]:
+        pipeline = self.pipelines.get(pipeline_id)
+        return pipeline.name if pipeline is not None else None
+
+    def stage_name(self, stage_id: Optional[int]) -> Optional[str]:
+        stage = self.stages.get(stage_id)
+        return stage.name if stage is not None else None
+
+    def pipeline_stages(self, pipeline_id: int) -> list[StageInfo]:
+        """Stages of a pipeline in board order."""
+
+        return list(self._pipeline_stages.get(pipeline_id, []))
+
+    def stage_named(self, pipeline_id: int, name: str) -> Optional[StageInfo]:
+        """Stage of a pipeline by its (case-insensitive) name."""
+
+        return self._stage_by_name.get((pipeline_id, name.casefold()))
+
+    def stage_rank(self, stage_id: int) -> Optional[int]:
+        """0-based position of a stage within its pipeline."""
+
+        return self._stage_rank.get(stage_id)
+
+    def compare_stages(self, stage_id: int, other_stage_id: int) -> int:
+        """
+        -1, 0 or 1 as `stage_id` comes before, is, or comes after
+        `other_stage_id` in their pipeline.
+
+        :raises ValueError: if either stage is unknown or they belong to
+            different pipelines
+        """
+
+        stage = self.stages.get(stage_id)
+        other = self.stages.get(other_stage_id)
+
+        if stage is None or other is None:
+            raise ValueError(f"Unknown stage {stage_id if stage is None else other_stage_id}")
+        if stage.pipeline_id != other.pipeline_id:
+            raise ValueError(
+                f"Stages {stage_id} and {other_stage_id} belong to different pipelines"
+            )
+
+        rank = self._stage_rank[stage_id]
+        other_rank = self._stage_rank[other_stage_id]
+        return (rank > other_rank) - (rank < other_rank)
+
+    def is_at_or_after(self, stage_id: int, other_stage_id: int) -> bool:
+        return self.compare_stages(stage_id, other_stage_id) >= 0
+
+    def to_dict(self) -> dict:
+        return {
+            "loaded_at": self.loaded_at,
+            "users": [asdict(user) for user in self.users.values()],
+            "pipelines": [asdict(pipeline) for pipeline in self.pipelines.values()],
+            "stages": [asdict(stage) for stage in self.stages.values()],
+            "activity_types": [asdict(type) for type in self.activity_types.values()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Metadata":
+        return Metadata(
+            loaded_at=data["loaded_at"],
+            **{
+                name: [record_class(**record) for record in data[name]]
+                for name, record_class in _RECORD_CLASSES.items()
+            },
+        )
+
+
+def _fetch(client: Client) -> Metadata:
+    def load(name: str) -> list:
+        url = client.encode_url(entity=ENDPOINTS[name], params={"limit": 500})
+        with client.activate():
+            return [_DECODERS[name](result) for page in iter_pages(url) for result in page]
+
+    names = list(ENDPOINTS)
+    collections = dict(zip(names, map_concurrent(load, names)))
+
+    # Every account has at least one user, pipeline and stage; an empty list
+    # means a listing went wrong, and caching it would hide that for a whole TTL.
+    empty = [name for name in ("users", "pipelines", "stages") if not collections[name]]
+    if empty:
+        raise RuntimeError(
+            f"Could not load metadata for {client.config.company_domain}: "
+            f"no {', '.join(empty)}"
+        )
+
+    return Metadata(**collections)
+
+
+def _default_cache_dir() -> str:
+    return os.environ.get("PIPEDRIVE_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "pipedrive"
+    )
+
+
+class MetadataRegistry:
+    """
+    Account metadata loaded once per account and kept for `ttl` seconds,
+    in memory and in a JSON file, so short-lived scripts do not reload it
+    on every run.
+
+        metadata = registry.get()
+        metadata.user_name(deal.owner_id)
+        metadata.is_at_or_after(deal.stage_id, meeting_stage.id)
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        cache_dir: Optional[str] = None,
+        failure_ttl: float = FAILURE_TTL,
+    ):
+        """
+        :param ttl: float seconds before metadata is reloaded
+        :param cache_dir: str directory of the JSON cache, defaults to
+            $PIPEDRIVE_CACHE_DIR or ~/.cache/pipedrive; "" disables it
+        :param failure_ttl: float seconds after a failed load before the API
+            is tried again; expired metadata (or the error) is served meanwhile
+        """
+
+        self.ttl = ttl
+        self.cache_dir = _default_cache_dir() if cache_dir is None else cache_dir
+        self.failure_ttl = failure_ttl
+        self._metadata: dict = {}
+        # account -> (time of the failed load, its error)
+        self._failures: dict = {}
+        # One lock per account, so a slow load does not hold up lookups
+        # for the other accounts.
+        self._locks: dict = {}
+        self._lock = threading.Lock()
+
+    def _account_lock(self, client: Client) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(client.config.company_domain, threading.Lock())
+
+    def _path(self, client: Client) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"metadata-{client.config.company_domain}.json")
+
+    def _read(self, client: Client) -> Optional[Metadata]:
+        path = self._path(client)
+        if path is None:
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                return Metadata.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, client: Client, metadata: Metadata) -> None:
+        path = self._path(client)
+        if path is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.part"
+            with open(partial, "w", encoding="utf-8") as file:
+                json.dump(metadata.to_dict(), file)
+            os.replace(partial, path)
+        except OSError as e:
+            print(f"Error writing metadata cache - {e}")
+
+    def get(self, client: Optional[Client] = None) -> Metadata:
+        """
+        Metadata of the client's account (default: the active client),
+        loaded from memory, the cache file or the API, in that order.
+        """
+
+        client = client or get_client()
+        account = client.config.company_domain
+
+        with self._account_lock(client):
+            metadata = self._metadata.get(account)
+            if metadata is not None and metadata.age() < self.ttl:
+                return metadata
+
+            stale = metadata
+            metadata = self._read(client)
+            if metadata is None or metadata.age() >= self.ttl:
+                failed_at, error = self._failures.get(account, (None, None))
+                if failed_at is not None and time.time() - failed_at < self.failure_ttl:
+                    metadata = stale or metadata
+                    if metadata is None:
+                        raise error
+                    return metadata
+
+                try:
+                    metadata = _fetch(client)
+                except Exception as e:
+                    self._failures[account] = (time.time(), e)
+                    # Keep serving expired metadata rather than failing
+                    # every lookup while the API is unavailable.
+                    metadata = stale or metadata
+                    if metadata is None:
+                        raise
+                else:
+                    self._failures.pop(account, None)
+                    self._write(client, metadata)
+
+            self._metadata[account] = metadata
+            return metadata
+
+    def refresh(self, client: Optional[Client] = None) -> Metadata:
+        """Reload from the API, e.g. after adding a user or a stage."""
+
+        self.invalidate(client)
+        client = client or get_client()
+
+        with self._account_lock(client):
+            metadata = self._metadata[client.config.company_domain] = _fetch(client)
+            self._failures.pop(client.config.company_domain, None)
+            self._write(client, metadata)
+            return metadata
+
+    def invalidate(self, client: Optional[Client] = None) -> None:
+        client = client or get_client()
+
+        with self._account_lock(client):
+            self._metadata.pop(client.config.company_domain, None)
+
+            path = self._path(client)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+
+registry = MetadataRegistry()
+
+
+def get_metadata(client: Optional[Client] = None) -> Metadata:
+    """Metadata of the active client's account, from the default registry."""
+
+    return registry.get(client)
@@ -0,0 +1,239 @@
+"""
+Local fuzzy matching of organization and person names.
+
+Names are normalized (case, accents, punctuation and legal suffixes such as
+"Inc" or "Ltda" removed) and split into character trigrams; an inverted index
+from trigram to records answers top-k similarity queries without API calls:
+
+    index = NameIndex.organizations()
+
+    index.search("ACME, Inc.")     # [Match(record=<Acme Inc>, score=1.0, ...), ...]
+    index.best("Acme Incorporated", threshold=0.8)
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+# Trailing words that do not tell two companies apart.
+LEGAL_SUFFIXES = frozenset([
+    "ag",
+    "bv",
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "eireli",
+    "gmbh",
+    "inc",
+    "incorporated",
+    "limited",
+    "llc",
+    "ltd",
+    "ltda",
+    "me",
+    "plc",
+    "sa",
+    "sas",
+    "srl",
+])
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: Optional[str], legal_suffixes: frozenset = LEGAL_SUFFIXES) -> str:
+    """
+    "ACME, Inc." -> "acme"; "Café & Co" -> "cafe and".
+
+    :param name: str
+    :param legal_suffixes: frozenset trailing words to drop
+    :return: str lowercase words separated by single spaces
+    """
+
+    if not name:
+        return ""
+
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().replace("&", " and ")
+    # "S.A." and "S/A" become "sa" before splitting into words.
+    text = re.sub(r"\b(\w)[./](\w)\b\.?", r"\1\2", text)
+
+    words = _NON_WORD.sub(" ", text).split()
+    while len(words) > 1 and words[-1] in legal_suffixes:
+        words.pop()
+
+    return " ".join(words)
+
+
+def trigrams(text: str) -> frozenset:
+    """Character trigrams of a normalized name, padded at word boundaries."""
+
+    if not text:
+        return frozenset()
+
+    padded = f"  {text} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+class Match(NamedTuple):
+    """
+    :param record: Organization, Person, ...
+    :param score: float Jaccard similarity of the trigram sets, 0..1
+    :param name: str normalized name of the record
+    """
+
+    record: Any
+    score: float
+    name: str
+
+
+class NameIndex:
+    """
+    Trigram inverted index over the names of a set of records.
+
+    Queries only look at records sharing one of the query's rarest trigrams
+    (any record scoring at least `threshold` must), so a lookup costs a few
+    short posting lists rather than a scan of every name.
+    """
+
+    def __init__(
+        self,
+        records: Iterable = (),
+        key: Callable[[Any], Optional[str]] = lambda record: record.name,
+    ):
+        """
+        :param records: Iterable of Organizations, Persons, ...
+        :param key: Callable returning the name of a record
+        """
+
+        self.key = key
+        self._records: list = []
+        self._names: list[str] = []
+        self._grams: list[frozenset] = []
+        self._postings: dict[str, list[int]] = {}
+        self._exact: dict[str, list[int]] = {}
+        self._positions: dict = {}
+
+        for record in records:
+            self.add(record)
+
+    @staticmethod
+    def organizations(organizations: Optional[Iterable] = None) -> "NameIndex":
+        """Index of organization names, by default every organization."""
+
+        if organizations is None:
+            from .organization import Organization
+
+            organizations = Organization.get_all_organizations()
+
+        return NameIndex(organizations)
+
+    @staticmethod
+    def persons(persons: Optional[Iterable] = None) -> "NameIndex":
+        """Index of person names, by default every person."""
+
+        if persons is None:
+            from .person import Person
+
+            persons = Person.get_all_persons()
+
+        return NameIndex(persons)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, record) -> None:
+        """Index a record, replacing the one with the same id."""
+
+        id = getattr(record, "id", None)
+        if id is not None and id in self._positions:
+            self.remove(id)
+
+        name = normalize_name(self.key(record))
+        grams = trigrams(name)
+        position = len(self._records)
+
+        self._records.append(record)
+        self._names.append(name)
+        self._grams.append(grams)
+        self._positions[id if id is not None else ("position", position)] = position
+
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+        if name:
+            self._exact.setdefault(name, []).append(position)
+
+    def remove(self, id) -> None:
+        position = self._positions.pop(id)
+
+        for gram in self._grams[position]:
+            self._postings[gram].remove(position)
+        if self._names[position]:
+            self._exact[self._names[position]].remove(position)
+
+        # The slot stays allocated so other positions remain valid.
+        self._records[position] = None
+        self._names[position] = ""
+        self._grams[position] = frozenset()
+
+    def exact(self, name: str) -> list:
+        """Records whose normalized name equals that of `name`."""
+
+        return [
+            self._records[position]
+            for position in self._exact.get(normalize_name(name), ())
+        ]
+
+    def search(self, name: str, limit: int = 5, threshold: float = 0.5) -> list[Match]:
+        """
+        The `limit` records most similar to `name`, best first.
+
+        :param name: str
+        :param limit: int
+        :param threshold: float minimum score, 0..1
+        :return: list[Match]
+        """
+
+        query = trigrams(normalize_name(name))
+        if not query:
+            return []
+
+        postings = self._postings
+        grams = sorted(query, key=lambda gram: len(postings.get(gram, ())))
+
+        # A record sharing fewer than threshold * len(query) trigrams cannot
+        # reach the threshold, so it has to appear in the postings of the
+        # rarest len(query) - ceil(threshold * len(query)) + 1 trigrams.
+        prefix = len(grams) - math.ceil(threshold * len(grams)) + 1
+        candidates = set()
+        for gram in grams[:prefix]:
+            candidates.update(postings.get(gram, ()))
+
+        # ... and have between threshold * len(query) and len(query) / threshold
+        # trigrams of its own.
+        shortest = threshold * len(query)
+        longest = len(query) / threshold if threshold > 0 else math.inf
+
+        scored = []
+        for position in candidates:
+            record_grams = self._grams[position]
+            if not shortest <= len(record_grams) <= longest:
+                continue
+            overlap = len(query & record_grams)
+            score = overlap / (len(query) + len(record_grams) - overlap)
+            if score >= threshold:
+                scored.append((score, -position))
+
+        return [
+            Match(self._records[-position], score, self._names[-position])
+            for score, position in heapq.nlargest(limit, scored)
+        ]
+
+    def best(self, name: str, threshold: float = 0.8) -> Optional[Match]:
+        """The closest record scoring at least `threshold`, if any."""
+
+        matches = self.search(name, limit=1, threshold=threshold)
+        return matches[0] if matches else None
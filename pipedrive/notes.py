@@ -0,0 +1,61 @@
+import json
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+
+
+class Notes:
+    def __init__(self, **kwargs) -> None:
+        """
+        :param id: str
+        :param deal_id: int
+        :param lead_id: int
+        :param content: str
+        """
+
+        self.id = kwargs.get("id", None)
+        self.deal_id = kwargs.get("deal_id", None)
+        self.lead_id = kwargs.get("lead_id", None)
+        self.content = kwargs.get("content", None)
+
+    @staticmethod
+    def create(**kwargs) -> "Notes":
+        """
+        Create a new note in Pipedrive.
+
+        :param deal_id: int
+        :param lead_id: int
+        :param content: str
+        :return: Notes
+        """
+
+        if ("deal_id" not in kwargs and "lead_id" not in kwargs) or "content" not in kwargs:
+            print("deal_id or lead_id and content are required")
+            return None
+
+        url = encode_url(entity="notes")
+
+        data = {
+            "deal_id": kwargs.get("deal_id"),
+            "lead_id": kwargs.get("lead_id"),
+            "content": kwargs["content"]
+        }
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating note - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return Notes(
+                id=response_json["data"]["id"],
+                deal_id=response_json["data"].get("deal_id"),
+                lead_id=response_json["data"].get("lead_id"),
+                content=response_json["data"]["content"],
+            )
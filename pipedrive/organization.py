@@ -0,0 +1,201 @@
+import json
+from dataclasses import dataclass
+from typing import Iterable
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .batch import fetch_by_ids
+from .pagination import iter_pages
+from .proxy import lazy_records
+from .scheduling import BACKGROUND, INTERACTIVE, prioritized
+
+
+class Organization:
+
+    @dataclass
+    class CustomFields:
+        linkedin = "e6b50efd95fed42b00f5b9c4a68b0e7abf935f9a"
+        website = "1b420d4868fd8f870880be6add510fc5af54f046"
+
+    def __init__(self, **kwargs):
+        """
+        :param id: int
+        :param name: str
+        :param website: str
+        :param linkedin: str
+        :param owner_id: int
+        """
+
+        self.id = kwargs.get("id", None)
+        self.name = kwargs.get("name", None)
+        self.owner_id = kwargs.get("owner_id", None)
+        self.website = kwargs.get("website", None)
+        self.linkedin = kwargs.get("linkedin", None)
+
+    @staticmethod
+    def from_dict(data: dict) -> "Organization":
+        return Organization(
+            id=data["id"],
+            name=data.get("name"),
+            owner_id=data["owner_id"]["value"] if data.get("owner_id") else None,
+            website=data.get(Organization.CustomFields.website),
+            linkedin=data.get(Organization.CustomFields.linkedin),
+        )
+
+    @staticmethod
+    def from_v2_dict(data: dict) -> "Organization":
+        custom_fields = data.get("custom_fields") or {}
+
+        return Organization(
+            id=data["id"],
+            name=data.get("name"),
+            owner_id=data.get("owner_id"),
+            website=custom_fields.get(Organization.CustomFields.website),
+            linkedin=custom_fields.get(Organization.CustomFields.linkedin),
+        )
+
+    @staticmethod
+    def get_many(ids: Iterable[int]) -> list["Organization"]:
+        """
+        Retrieve full Organizations by id through the v2 `ids` filter, in
+        chunks requested concurrently.
+
+        :param ids: Iterable[int]
+        :return: list[Organization] in input order, ids that were not found are skipped
+        """
+
+        ids = list(ids)
+        records = fetch_by_ids("organizations", ids)
+
+        return [
+            Organization.from_v2_dict(records[id]) for id in ids if id in records
+        ]
+
+    @staticmethod
+    @prioritized(INTERACTIVE)
+    def retrieve_by(name: str, hydrate: bool = False) -> list["Organization"]:
+        """
+        Retrieve organizations from Pipedrive by name.
+
+        :param name: str
+        :param hydrate: bool load the full records with `Organization.get_many`
+            now; otherwise they are loaded lazily, in one batch, when a field
+            missing from the search results is first read
+        :return: list[Organization]
+        """
+
+        params = {
+            "fields": "name",
+            "term": name,
+        }
+
+        url = encode_url(entity="organizations", action="search", params=params)
+
+        response = api.get(url)
+        response_json = response.json()
+
+        data = response_json["data"].get("items", [])
+        additional_data = response_json.get(
+            "additional_data", {"pagination": {"more_items_in_collection": False}}
+        )
+
+        while additional_data["pagination"]["more_items_in_collection"]:
+            new_url = url + f'&start={additional_data["pagination"]["next_start"]}'
+            response = api.get(new_url)
+            response_json = response.json()
+
+            data += response_json["data"].get("items", [])
+            additional_data = response_json.get(
+                "additional_data", {"pagination": {"more_items_in_collection": False}}
+            )
+
+        if data and hydrate:
+            return Organization.get_many(result["item"]["id"] for result in data)
+
+        if data:
+            return lazy_records(
+                Organization,
+                [
+                    {
+                        "id": result["item"]["id"],
+                        "name": result["item"]["name"],
+                        "owner_id": result["item"]["owner"]["id"],
+                    }
+                    for result in data
+                ],
+            )
+        else:
+            return []
+
+        return []
+
+    @staticmethod
+    def create(**kwargs) -> "Organization":
+        """
+        Create a new organization in Pipedrive.
+
+        :param name: str
+        :param owner_id: int
+        :param linkedin: str
+        :param website: str
+        :return: Organization
+        """
+
+        if "name" not in kwargs:
+            print("name is required")
+            return None
+
+        data = {
+            "name": kwargs["name"],
+            "owner_id": kwargs.get("owner_id", None),
+            "e6b50efd95fed42b00f5b9c4a68b0e7abf935f9a": kwargs.get(
+                "linkedin", None
+            ),  # custom field
+            "1b420d4868fd8f870880be6add510fc5af54f046": kwargs.get(
+                "website", None
+            ),  # custom field
+        }
+
+        url = encode_url(entity="organizations")
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating organization - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            return Organization(
+                id=response_json["data"]["id"],
+                name=response_json["data"]["name"],
+                owner_id=response_json["data"]["owner_id"]["id"]
+                if response_json["data"]["owner_id"]
+                else None,
+            )
+
+        return None
+    
+    @staticmethod
+    @prioritized(BACKGROUND)
+    def get_all_organizations() -> list["Organization"]:
+        url = encode_url(entity="organizations", params={"limit": 500})
+
+        return [
+            Organization.from_dict(result)
+            for page in iter_pages(url)
+            for result in page
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner_id": self.owner_id,
+            "website": self.website,
+            "linkedin": self.linkedin,
+        }
@@ -0,0 +1,463 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Union
+
+from .concurrency import map_concurrent
+
+if TYPE_CHECKING:
+    from .activity import Activity
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    entity TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    target TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, seq);
+"""
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# Done rows whose result ids are read per query while resolving references.
+RESOLVE_CHUNK_SIZE = 500
+
+# entity -> operations its class implements
+OPERATIONS = {
+    "organization": ("create",),
+    "person": ("create",),
+    "deal": ("create", "update", "add_participant"),
+    "activity": ("create", "update"),
+    "note": ("create",),
+    "lead": ("create",),
+}
+
+
+class OutboxRef:
+    """
+    Placeholder for the id of a record created through the outbox.
+
+    Pass it as a field value (or update target) of later writes; it is
+    replaced by the real id when the write is replayed, and the dependent
+    write waits until the referenced one succeeded.
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f"OutboxRef({self.key!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, OutboxRef) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+
+def _encode(value):
+    if isinstance(value, OutboxRef):
+        return {"$ref": value.key}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _refs(value) -> list[str]:
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            return [value["$ref"]]
+        return [ref for item in value.values() for ref in _refs(item)]
+    if isinstance(value, list):
+        return [ref for item in value for ref in _refs(item)]
+    return []
+
+
+def _resolve(value, ids: dict):
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            return ids[value["$ref"]]
+        return {name: _resolve(item, ids) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, ids) for item in value]
+    return value
+
+
+def _entity_classes() -> dict:
+    from .activity import Activity
+    from .deal import Deal
+    from .lead import Lead
+    from .notes import Notes
+    from .organization import Organization
+    from .person import Person
+
+    return {
+        "organization": Organization,
+        "person": Person,
+        "deal": Deal,
+        "activity": Activity,
+        "note": Notes,
+        "lead": Lead,
+    }
+
+
+def _load_activity(id) -> Optional["Activity"]:
+    from . import api
+    from .activity import Activity
+    from .api import encode_url
+
+    try:
+        response = api.get(encode_url(entity="activities", entity_id=id))
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Error retrieving activity - {e}")
+        return None
+
+    return Activity.from_dict(response.json()["data"])
+
+
+@dataclass
+class ReplayReport:
+    """
+    :param sent: int writes attempted
+    :param succeeded: int writes applied
+    :param failed: int writes that failed this run
+    :param blocked: int writes waiting on a failed or pending dependency
+    :param errors: dict[str, str] last error by idempotency key
+    """
+
+    sent: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    blocked: int = 0
+    errors: dict = field(default_factory=dict)
+
+
+class Outbox:
+    """
+    Durable, SQLite-backed journal of writes to replay against Pipedrive.
+
+    Intake code enqueues writes, which only costs a local transaction; a
+    replayer drains the journal concurrently, under the active client's rate
+    limiter:
+
+        outbox = Outbox("intake.db")
+        person = outbox.create("person", name="Ada", email="ada@acme.com")
+        deal = outbox.create("deal", title="Acme", person_id=person)
+        outbox.add_participant(deal, person)
+
+        outbox.replay()
+
+    Writes to the same record are applied in the order they were enqueued,
+    and a write that references an `OutboxRef` waits for the referenced
+    create. Independent writes run in parallel. Every write has an
+    idempotency key, and enqueueing a key twice stores the write once. A
+    create's key defaults to a hash of its content, so re-running intake
+    does not create the record again; other writes get a fresh key, since
+    setting a field back to an earlier value is a new write. Pass
+    `idempotency_key` to dedupe those too. Delivery is at least once: a
+    process killed between a successful request and its bookkeeping will
+    resend that write.
+    """
+
+    def __init__(self, path: str = "pipedrive_outbox.db", max_attempts: int = 5):
+        """
+        :param path: str SQLite database file
+        :param max_attempts: int attempts before a write is marked failed
+        """
+
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def enqueue(
+        self,
+        entity: str,
+        operation: str,
+        payload: dict,
+        target: Union[int, str, OutboxRef, None] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> OutboxRef:
+        """
+        Journal a write.
+
+        :param entity: str "organization", "person", "deal", "activity", "note" or "lead"
+        :param operation: str "create" (any entity), "update" (deal, activity)
+            or "add_participant" (deal)
+        :param payload: dict keyword arguments of the entity method
+        :param target: id (or OutboxRef) of the record to update
+        :param idempotency_key: str defaults to a hash of the write for
+            creates, a random key otherwise
+        :return: OutboxRef to the write, usable as a placeholder id
+        :raises ValueError: if the entity does not support the operation
+        """
+
+        if operation not in OPERATIONS.get(entity, ()):
+            raise ValueError(f"Unsupported outbox write {operation} for {entity!r}")
+
+        encoded_payload = json.dumps(payload, default=_encode, sort_keys=True)
+        encoded_target = (
+            json.dumps(target, default=_encode) if target is not None else None
+        )
+
+        if idempotency_key is None and operation == "create":
+            idempotency_key = hashlib.sha256(
+                "\x1f".join(
+                    [entity, operation, encoded_target or "", encoded_payload]
+                ).encode()
+            ).hexdigest()
+        elif idempotency_key is None:
+            idempotency_key = uuid.uuid4().hex
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO outbox "
+                "(idempotency_key, entity, operation, target, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    idempotency_key,
+                    entity,
+                    operation,
+                    encoded_target,
+                    encoded_payload,
+                    now,
+                    now,
+                ),
+            )
+
+        return OutboxRef(idempotency_key)
+
+    def create(self, entity: str, idempotency_key: Optional[str] = None, **kwargs) -> OutboxRef:
+        return self.enqueue(entity, "create", kwargs, idempotency_key=idempotency_key)
+
+    def update(
+        self,
+        entity: str,
+        id: Union[int, str, OutboxRef],
+        idempotency_key: Optional[str] = None,
+        **kwargs,
+    ) -> OutboxRef:
+        return self.enqueue(
+            entity, "update", kwargs, target=id, idempotency_key=idempotency_key
+        )
+
+    def add_participant(
+        self,
+        deal_id: Union[int, OutboxRef],
+        participant_id: Union[int, OutboxRef],
+        idempotency_key: Optional[str] = None,
+    ) -> OutboxRef:
+        return self.enqueue(
+            "deal",
+            "add_participant",
+            {"participant_id": participant_id},
+            target=deal_id,
+            idempotency_key=idempotency_key,
+        )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def result_id(self, ref: OutboxRef) -> Optional[str]:
+        """Id of the record created by a replayed write, once it is done."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result_id FROM outbox WHERE idempotency_key = ? AND status = ?",
+                (ref.key, DONE),
+            ).fetchone()
+
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def replay(self, max_workers: Optional[int] = None) -> ReplayReport:
+        """
+        Drain pending writes in dependency waves, each wave sent concurrently.
+
+        :param max_workers: int concurrent requests, defaults to the client's pool size
+        :return: ReplayReport
+        """
+
+        report = ReplayReport()
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seq, idempotency_key, entity, operation, target, payload "
+                "FROM outbox WHERE status = ? ORDER BY seq",
+                (PENDING,),
+            ).fetchall()
+
+        entries = []
+        previous_in_lane = {}
+
+        for seq, key, entity, operation, target, payload in rows:
+            decoded_target = json.loads(target) if target is not None else None
+            decoded_payload = json.loads(payload)
+
+            depends_on = set(_refs(decoded_payload)) | set(_refs(decoded_target))
+
+            # Writes to the same record keep their enqueue order.
+            lane = (entity, target) if target is not None else None
+            if lane is not None:
+                if lane in previous_in_lane:
+                    depends_on.add(previous_in_lane[lane])
+                previous_in_lane[lane] = key
+
+            entries.append(
+                (key, entity, operation, decoded_target, decoded_payload, depends_on)
+            )
+
+        pending_keys = {entry[0] for entry in entries}
+        resolved = self._result_ids(
+            {key for entry in entries for key in entry[5]} - pending_keys
+        )
+
+        waiting = entries
+        while waiting:
+            ready = [entry for entry in waiting if entry[5] <= resolved.keys()]
+            if not ready:
+                break
+
+            ready_keys = {entry[0] for entry in ready}
+            waiting = [entry for entry in waiting if entry[0] not in ready_keys]
+
+            outcomes = map_concurrent(
+                lambda entry: self._apply(entry, resolved), ready, max_workers
+            )
+
+            for entry, (result_id, error) in zip(ready, outcomes):
+                report.sent += 1
+                if error is None:
+                    report.succeeded += 1
+                    resolved[entry[0]] = result_id
+                else:
+                    report.failed += 1
+                    report.errors[entry[0]] = error
+
+            self._record(ready, outcomes)
+
+        report.blocked = len(waiting)
+        return report
+
+    def run(self, interval: float = 5.0, stop: Optional[threading.Event] = None) -> None:
+        """
+        Replay continuously until `stop` is set, sleeping `interval` seconds
+        whenever the journal is empty.
+        """
+
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            report = self.replay()
+            if report.sent == 0 or report.failed:
+                stop.wait(interval)
+
+    def _result_ids(self, keys: set) -> dict:
+        """Result ids of the done writes among `keys`."""
+
+        keys = list(keys)
+        resolved = {}
+
+        with self._lock:
+            for start in range(0, len(keys), RESOLVE_CHUNK_SIZE):
+                chunk = keys[start : start + RESOLVE_CHUNK_SIZE]
+                rows = self._connection.execute(
+                    "SELECT idempotency_key, result_id FROM outbox "
+                    f"WHERE status = ? AND idempotency_key IN ({', '.join('?' * len(chunk))})",
+                    (DONE, *chunk),
+                )
+                for key, result_id in rows:
+                    resolved[key] = json.loads(result_id)
+
+        return resolved
+
+    def _apply(self, entry, resolved: dict):
+        key, entity, operation, target, payload, _ = entry
+
+        try:
+            entity_class = _entity_classes()[entity]
+            kwargs = _resolve(payload, resolved)
+            target = _resolve(target, resolved)
+
+            if operation == "create":
+                record = entity_class.create(**kwargs)
+                if record is None:
+                    return None, f"{entity} create failed"
+                return record.id, None
+
+            if operation == "update":
+                record = entity_class(id=target)
+                if entity == "activity" and ("note" in kwargs or "participants_ids" in kwargs):
+                    # Activity.update appends the note and adds to the
+                    # participants of the record it is called on.
+                    record = _load_activity(target)
+                    if record is None:
+                        return None, f"{entity} {target} could not be read"
+                record = record.update(**kwargs)
+                if record is None:
+                    return None, f"{entity} {target} update failed"
+                return target, None
+
+            if operation == "add_participant":
+                if entity_class(id=target).add_participant(**kwargs) is None:
+                    return None, f"{entity} {target} add_participant failed"
+                return target, None
+
+            return None, f"Unknown operation {operation}"
+        except Exception as e:
+            return None, str(e)
+
+    def _record(self, entries: list, outcomes: list) -> None:
+        now = time.time()
+
+        # The connection's context manager rolls back if an update raises,
+        # so a failed batch does not leave the transaction open.
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            for entry, (result_id, error) in zip(entries, outcomes):
+                if error is None:
+                    self._connection.execute(
+                        "UPDATE outbox SET status = ?, result_id = ?, attempts = attempts + 1, "
+                        "last_error = NULL, updated_at = ? WHERE idempotency_key = ?",
+                        (DONE, json.dumps(result_id), now, entry[0]),
+                    )
+                else:
+                    self._connection.execute(
+                        "UPDATE outbox SET attempts = attempts + 1, last_error = ?, "
+                        "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END, "
+                        "updated_at = ? WHERE idempotency_key = ?",
+                        (error, self.max_attempts, FAILED, now, entry[0]),
+                    )
@@ -0,0 +1,157 @@
+import contextvars
+import threading
+from queue import Full, Queue
+from typing import Iterator
+
+from . import api
+
+
+def _page_json(response) -> dict:
+    """
+    Body of a page response. Failed pages raise, since reading them as an
+    empty last page would end the listing early without a trace.
+    """
+
+    response.raise_for_status()
+    response_json = response.json()
+    if response_json.get("success") is False:
+        raise RuntimeError(f"Page request failed - {response_json.get('error')}")
+    return response_json
+
+
+def iter_pages(url: str) -> Iterator[list]:
+    """
+    Yield the `data` of each page of a v1 collection, following
+    `additional_data.pagination.next_start` one page at a time.
+
+    :param url: str encoded url, including `limit` and filters
+    :return: Iterator[list[dict]], raises if a page request fails
+    """
+
+    page_url = url
+
+    while True:
+        response_json = _page_json(api.get(page_url))
+
+        yield response_json.get("data") or []
+
+        additional_data = response_json.get("additional_data") or {}
+        pagination = additional_data.get("pagination") or {}
+        if not pagination.get("more_items_in_collection"):
+            return
+
+        page_url = url + f'&start={pagination["next_start"]}'
+
+
+def iter_cursor_pages(url: str) -> Iterator[list]:
+    """
+    Yield the `data` of each page of a v2 collection, following
+    `additional_data.next_cursor`.
+
+    :param url: str encoded url, including `limit` and filters
+    :return: Iterator[list[dict]], raises if a page request fails
+    """
+
+    page_url = url
+
+    while True:
+        response_json = _page_json(api.get(page_url))
+
+        yield response_json.get("data") or []
+
+        additional_data = response_json.get("additional_data") or {}
+        cursor = additional_data.get("next_cursor")
+        if not cursor:
+            return
+
+        page_url = url + f"&cursor={cursor}"
+
+
+def iter_search_pages(url: str) -> Iterator[list]:
+    """
+    Yield the `data.items` of each page of a v1 search endpoint, such as
+    `deals/search`.
+
+    :param url: str encoded url, including `term` and `fields`
+    :return: Iterator[list[dict]], raises if a page request fails
+    """
+
+    page_url = url
+
+    while True:
+        response_json = _page_json(api.get(page_url))
+
+        yield (response_json.get("data") or {}).get("items") or []
+
+        additional_data = response_json.get("additional_data") or {}
+        pagination = additional_data.get("pagination") or {}
+        if not pagination.get("more_items_in_collection"):
+            return
+
+        page_url = url + f'&start={pagination["next_start"]}'
+
+
+_DONE = object()
+
+
+def prefetch(pages: Iterator[list], depth: int = 2) -> Iterator[list]:
+    """
+    Run a page iterator on a background thread, at most `depth` pages ahead
+    of the consumer.
+
+    Cursor and offset pagination cannot fan out, since each request needs
+    the previous response, but the request for page N+1 can be in flight
+    while the caller decodes page N. Wall time then approaches the larger
+    of network and decode time instead of their sum. The thread runs in a
+    copy of the caller's context, so it uses the active `Client`, and
+    errors are raised in the consumer.
+
+        for page in prefetch(iter_cursor_pages(url)):
+            deals = [Deal.from_v2_dict(result) for result in page]
+
+    :param pages: Iterator[list] e.g. `iter_pages(url)`
+    :param depth: int pages buffered ahead
+    :return: Iterator[list]
+    """
+
+    queue: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except BaseException as e:
+            put((_DONE, e))
+        else:
+            put((_DONE, None))
+
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(produce,),
+        name="pipedrive-prefetch",
+        daemon=True,
+    )
+    thread.start()
+
+    try:
+        while True:
+            page, error = queue.get()
+            if page is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        # Lets the producer exit if the consumer stops early.
+        stopped.set()
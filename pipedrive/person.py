@@ -0,0 +1,490 @@
+import json
+from dataclasses import dataclass
+from typing import Iterable
+
+from . import api
+from .api import CONTENT_TYPE, encode_url
+from .scheduling import BACKGROUND, INTERACTIVE, prioritized
+
+
+def _search_payload(item: dict) -> dict:
+    """
+    Known fields of a persons/search item. Fields the item leaves empty are
+    left out, so the proxy loads them from the full record.
+    """
+
+    payload = {
+        "id": item["id"],
+        "organization_id": (item.get("organization") or {}).get("id"),
+        "owner_id": (item.get("owner") or {}).get("id"),
+    }
+    if item.get("name"):
+        payload["name"] = item["name"]
+    if item.get("primary_email"):
+        payload["email"] = item["primary_email"]
+    if item.get("emails"):
+        payload["emails"] = item["emails"]
+    if item.get("phones"):
+        payload["phone"] = item["phones"][0]
+        payload["phones"] = item["phones"]
+    return payload
+
+
+class Person:
+
+    @dataclass
+    class CustomFields:
+        job_title = "f746ba550001ac6682ab9d4e1b8f44999217250c"
+        linkedin = "275f25452ed859a914f51cad90d349f92f1756ad"
+        sector = "e5052aa69761c292859b062cee70f346716ff46d"
+        source_onboarding = "eb87b28306ef62571f3e80e27a0818a7d1100577"
+        python_experience = "d22c30eae591e77b224b8665cbf856893801f6a3"
+        use_cases = "2588c17dd2b03c93f6301c9499221fa3dd41f4f1"
+
+    def __init__(self, **kwargs):
+        """
+        :param id: int
+        :param name: str
+        :param email: str
+        :param emails: list[str]
+        :param organization_id: int
+        :param owner_id: int
+        :param phone: str primary phone
+        :param phones: list[str]
+        :param job_title: str
+        :param linkedin: str
+        :param sector: str
+        :param source_onboarding: str
+        :param python_experience: str
+        :param use_cases: str
+        """
+
+        self.id = kwargs.get("id", None)
+        self.name = kwargs.get("name", None)
+        self.email = kwargs.get("email", None)
+        self.emails = kwargs.get("emails", [])
+        self.organization_id = kwargs.get("organization_id", None)
+        self.owner_id = kwargs.get("owner_id", None)
+        self.phone = kwargs.get("phone", None)
+        self.phones = kwargs.get("phones", [])
+        self.job_title = kwargs.get("job_title", None)
+        self.linkedin = kwargs.get("linkedin", None)
+        self.sector = kwargs.get("sector", None)
+        self.source_onboarding = kwargs.get("source_onboarding", None)
+        self.python_experience = kwargs.get("python_experience", None)
+        self.use_cases = kwargs.get("use_cases", None)
+
+    @staticmethod
+    def from_dict(data: dict) -> "Person":
+        emails = data.get("email") or []
+        phones = data.get("phone") or []
+
+        primary_phone = next((p for p in phones if p.get("primary")), None)
+
+        return Person(
+            id=data["id"],
+            name=data.get("name"),
+            email=data.get("primary_email"),
+            emails=[e["value"] for e in emails if e.get("value")],
+            organization_id=data["org_id"]["value"] if data.get("org_id") else None,
+            owner_id=data["owner_id"]["value"] if data.get("owner_id") else None,
+            phone=primary_phone["value"] if primary_phone else None,
+            phones=[p["value"] for p in phones if p.get("value")],
+            job_title=data.get(Person.CustomFields.job_title),
+            linkedin=data.get(Person.CustomFields.linkedin),
+            sector=data.get(Person.CustomFields.sector),
+            source_onboarding=data.get(Person.CustomFields.source_onboarding),
+            python_experience=data.get(Person.CustomFields.python_experience),
+            use_cases=data.get(Person.CustomFields.use_cases),
+        )
+
+    @staticmethod
+    def from_v2_dict(data: dict) -> "Person":
+        custom_fields = data.get("custom_fields") or {}
+        emails = data.get("emails") or []
+        phones = data.get("phones") or []
+
+        primary_email = next((e for e in emails if e.get("primary")), None)
+        primary_phone = next((p for p in phones if p.get("primary")), None)
+
+        return Person(
+            id=data["id"],
+            name=data.get("name"),
+            email=primary_email["value"] if primary_email else None,
+            emails=[e["value"] for e in emails],
+            organization_id=data.get("org_id"),
+            owner_id=data.get("owner_id"),
+            phone=primary_phone["value"] if primary_phone else None,
+            phones=[p["value"] for p in phones if p.get("value")],
+            job_title=custom_fields.get(Person.CustomFields.job_title),
+            linkedin=custom_fields.get(Person.CustomFields.linkedin),
+            sector=custom_fields.get(Person.CustomFields.sector),
+            source_onboarding=custom_fields.get(
+                Person.CustomFields.source_onboarding
+            ),
+            python_experience=custom_fields.get(
+                Person.CustomFields.python_experience
+            ),
+            use_cases=custom_fields.get(Person.CustomFields.use_cases),
+        )
+
+    @staticmethod
+    def get_many(ids: Iterable[int]) -> list["Person"]:
+        """
+        Retrieve full Persons by id through the v2 `ids` filter, in chunks
+        requested concurrently.
+
+        :param ids: Iterable[int]
+        :return: list[Person] in input order, ids that were not found are skipped
+        """
+
+        from .batch import fetch_by_ids
+
+        ids = list(ids)
+        records = fetch_by_ids("persons", ids)
+
+        return [Person.from_v2_dict(records[id]) for id in ids if id in records]
+
+    @staticmethod
+    @prioritized(INTERACTIVE)
+    def retrieve_by(
+        query_name: str, query_value: str, hydrate: bool = False
+    ) -> list["Person"]:
+        """
+        Retrieve persons from Pipedrive by email.
+
+        :param query_name: str
+        :param query_value: str
+        :param hydrate: bool load the full records with `Person.get_many` now;
+            otherwise they are loaded lazily, in one batch, when a field
+            missing from the search results is first read
+        :return: list[Person]
+        """
+
+        from .proxy import lazy_records
+
+        params = {
+            "fields": query_name,
+            "term": query_value,
+        }
+
+        url = encode_url(entity="persons", action="search", params=params)
+
+        response = api.get(url)
+        response_json = response.json()
+
+        data = response_json["data"].get("items", [])
+        additional_data = response_json.get(
+            "additional_data", {"pagination": {"more_items_in_collection": False}}
+        )
+
+        while additional_data["pagination"]["more_items_in_collection"]:
+            new_url = url + f'&start={additional_data["pagination"]["next_start"]}'
+            response = api.get(new_url)
+            response_json = response.json()
+
+            data += response_json["data"].get("items", [])
+            additional_data = response_json.get(
+                "additional_data", {"pagination": {"more_items_in_collection": False}}
+            )
+
+        if data and hydrate:
+            return Person.get_many(result["item"]["id"] for result in data)
+
+        if data:
+            return lazy_records(
+                Person, [_search_payload(result["item"]) for result in data]
+            )
+        else:
+            return []
+
+    @staticmethod
+    def retrieve_by_phone(phone: str) -> list["Person"]:
+        """
+        Retrieve persons from Pipedrive by phone, in any format.
+
+        The number is normalized to E.164 and looked up in the phone index
+        set with `set_phone_index`, if any, before searching Pipedrive.
+
+        :param phone: str
+        :return: list[Person]
+        """
+
+        return Person.retrieve_by_phones([phone])[phone]
+
+    @staticmethod
+    @prioritized(INTERACTIVE)
+    def retrieve_by_phones(phones: Iterable[str]) -> dict[str, list["Person"]]:
+        """
+        Retrieve persons for many phone numbers, e.g. a batch of inbound
+        calls.
+
+        Numbers are normalized to E.164 so different spellings of one number
+        share a single lookup. Numbers missing from the phone index are
+        searched concurrently, and persons found are added to the index.
+
+        :param phones: Iterable[str]
+        :return: dict[str, list[Person]] keyed by the phones as given
+        """
+
+        from .concurrency import map_concurrent
+        from .phones import (
+            DEFAULT_COUNTRY_CODE,
+            get_phone_index,
+            national_number,
+            normalize_phone,
+        )
+
+        index = get_phone_index()
+        country_code = index.default_country_code if index else DEFAULT_COUNTRY_CODE
+
+        numbers = {phone: normalize_phone(phone, country_code) for phone in phones}
+
+        found = {}
+        if index is not None:
+            for number in set(numbers.values()) - {None}:
+                persons = index.get(number)
+                if persons:
+                    found[number] = persons
+
+        # term -> E.164 number; numbers that cannot be normalized are
+        # searched as given and their results are not filtered.
+        misses = {}
+        for phone, number in numbers.items():
+            if number is None:
+                misses.setdefault(phone, None)
+            elif number not in found:
+                misses.setdefault(number, number)
+
+        def search(miss: tuple) -> list["Person"]:
+            term, number = miss
+            persons = Person._search_phone(national_number(number) if number else term)
+            if number is None:
+                return persons
+            return [
+                person
+                for person in persons
+                if any(
+                    normalize_phone(value, country_code) == number
+                    for value in person.phones or [person.phone]
+                )
+            ]
+
+        for term, persons in zip(misses, map_concurrent(search, misses.items())):
+            found[term] = persons
+            if index is not None:
+                for person in persons:
+                    index.add(person)
+
+        return {phone: found.get(number or phone, []) for phone, number in numbers.items()}
+
+    @staticmethod
+    def _search_phone(term: str) -> list["Person"]:
+        from .proxy import lazy_records
+
+        params = {
+            "fields": "phone",
+            "term": term,
+        }
+
+        url = encode_url(entity="persons", action="search", params=params)
+
+        response = api.get(url)
+        response_json = response.json()
+
+        if "data" not in response_json:
+            return []
+
+        data = response_json["data"].get("items", [])
+        additional_data = response_json.get(
+            "additional_data", {"pagination": {"more_items_in_collection": False}}
+        )
+
+        while additional_data["pagination"]["more_items_in_collection"]:
+            new_url = url + f'&start={additional_data["pagination"]["next_start"]}'
+            response = api.get(new_url)
+            response_json = response.json()
+
+            data += response_json["data"].get("items", [])
+            additional_data = response_json.get(
+                "additional_data", {"pagination": {"more_items_in_collection": False}}
+            )
+
+        if data:
+            return lazy_records(
+                Person, [_search_payload(result["item"]) for result in data]
+            )
+        else:
+            return []
+
+    @staticmethod
+    def create(**kwargs) -> "Person":
+        """
+        Create a new person in Pipedrive.
+
+        :param name: str
+        :param org_id: int
+        :param email: str
+        :param emails: list[dict] [{"label": str, "value": str, primary: bool}]
+        :param phone: str
+        :param phones: list[str] or list[dict] [{"label": str, "value": str, primary: bool}]
+        :param owner_id: int
+        :param job_title: str
+        :param linkedin: str
+        :param sector: str
+        :param source_onboarding: str
+        :param python_experience: str
+        :param use_cases: str
+        :return: Person
+        """
+
+        if "name" not in kwargs:
+            print("name is required")
+            return None
+
+        email_field = kwargs.get("emails", [])
+        if len(email_field) == 0:
+            email_field = kwargs.get("email", None)
+
+        data = {
+            "name": kwargs["name"],
+            "org_id": kwargs.get("org_id", None),
+            "email": email_field,
+            "phone": Person._phones_payload(kwargs.get("phones") or kwargs.get("phone")),
+            "owner_id": kwargs.get("owner_id", None),
+            Person.CustomFields.job_title: kwargs.get(
+                "job_title", None
+            ),  # custom field
+            Person.CustomFields.linkedin: kwargs.get(
+                "linkedin", None
+            ),  # custom field
+            Person.CustomFields.sector: kwargs.get(
+                "sector", None
+            ),  # custom field
+            Person.CustomFields.source_onboarding: kwargs.get(
+                "source_onboarding", None
+            ),  # custom field
+            Person.CustomFields.python_experience: kwargs.get(
+                "python_experience", None
+            ),  # custom field
+            Person.CustomFields.use_cases: kwargs.get(
+                "use_cases", None
+            ),  # custom field
+        }
+
+        url = encode_url(entity="persons")
+
+        try:
+            response = api.post(
+                url, data=json.dumps(data), headers={"Content-Type": CONTENT_TYPE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error creating person - {e}")
+            return None
+
+        response_json = response.json()
+
+        if response_json["success"]:
+            phones = response_json["data"]["phone"] or []
+            primary_phone = next((p for p in phones if p.get("primary")), None)
+
+            person = Person(
+                id=response_json["data"]["id"],
+                name=response_json["data"]["name"],
+                email=response_json["data"]["primary_email"],
+                organization_id=response_json["data"]["org_id"],
+                owner_id=response_json["data"]["owner_id"]["id"]
+                if response_json["data"]["owner_id"]
+                else None,
+                phone=(primary_phone or phones[0])["value"] if phones else None,
+                phones=[p["value"] for p in phones if p.get("value")],
+                job_title=response_json["data"][
+                    Person.CustomFields.job_title
+                ],
+                linkedin=response_json["data"][
+                    Person.CustomFields.linkedin
+                ],
+                sector=response_json["data"][
+                    Person.CustomFields.sector
+                ],
+                source_onboarding=response_json["data"][
+                    Person.CustomFields.source_onboarding
+                ],
+                python_experience=response_json["data"][
+                    Person.CustomFields.python_experience
+                ],
+                use_cases=response_json["data"][
+                    Person.CustomFields.use_cases
+                ],
+            )
+
+            from .phones import get_phone_index
+
+            index = get_phone_index()
+            if index is not None:
+                index.add(person)
+
+            return person
+
+        return None
+
+    @staticmethod
+    def _phones_payload(phones):
+        """Phone field for create, with numbers stored in E.164 when possible."""
+
+        from .phones import DEFAULT_COUNTRY_CODE, get_phone_index, normalize_phone
+
+        if not phones:
+            return None
+
+        index = get_phone_index()
+        country_code = index.default_country_code if index else DEFAULT_COUNTRY_CODE
+
+        def normalized(value: str) -> str:
+            return normalize_phone(value, country_code) or value
+
+        if isinstance(phones, str):
+            return normalized(phones)
+
+        return [
+            {**phone, "value": normalized(phone.get("value"))}
+            if isinstance(phone, dict)
+            else {"value": normalized(phone), "primary": position == 0}
+            for position, phone in enumerate(phones)
+        ]
+
+    @staticmethod
+    @prioritized(BACKGROUND)
+    def get_all_persons() -> list["Person"]:
+        from .pagination import iter_pages
+
+        url = encode_url(entity="persons", params={"limit": 500})
+
+        return [Person.from_dict(result) for page in iter_pages(url) for result in page]
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "emails": self.emails,
+            "organization_id": self.organization_id,
+            "owner_id": self.owner_id,
+            "phone": self.phone,
+            "phones": self.phones,
+            "job_title": self.job_title,
+            "linkedin": self.linkedin,
+            "sector": self.sector,
+            "source_onboarding": self.source_onboarding,
+            "python_experience": self.python_experience,
+            "use_cases": self.use_cases,
+        }
+
+    def extract_domain(self):
+        """Registrable domain of the person's email, e.g. "acme.com.br"."""
+
+        from .domains import classify
+
+        info = classify(self.email)
+        return info.registrable_domain if info is not None else None
@@ -0,0 +1,182 @@
+"""
+Phone number normalization and a local phone -> person index.
+
+Numbers are compared in E.164 form ("+5511987654321"), so "+55 11 98765-4321",
+"(11) 98765-4321" and "5511987654321" are the same key:
+
+    index = PhoneIndex.persons()
+    set_phone_index(index)
+
+    Person.retrieve_by_phone("(11) 98765-4321")  # answered from the index
+"""
+
+import re
+import threading
+from typing import Iterable, Optional
+
+DEFAULT_COUNTRY_CODE = "55"
+
+# country code -> lengths of national significant numbers
+NATIONAL_LENGTHS = {
+    "1": (10,),
+    "44": (10,),
+    "55": (10, 11),
+    "351": (9,),
+}
+
+_EXTENSION = re.compile(r"\s*(?:ext\.?|x|ramal|#)\s*\d+\s*$", re.IGNORECASE)
+_NON_DIGIT = re.compile(r"\D")
+
+
+def normalize_phone(
+    phone: Optional[str], default_country_code: str = DEFAULT_COUNTRY_CODE
+) -> Optional[str]:
+    """
+    E.164 form of a phone number written in any common format.
+
+    Numbers without an international prefix ("+" or "00") are read as
+    national numbers of `default_country_code`, with or without the country
+    code and trunk prefix "0".
+
+    :param phone: str
+    :param default_country_code: str e.g. "55"
+    :return: str "+<digits>", None if it is not a full phone number
+    """
+
+    if not phone:
+        return None
+
+    text = _EXTENSION.sub("", str(phone)).strip()
+    digits = _NON_DIGIT.sub("", text)
+
+    if not text.startswith("+"):
+        if digits.startswith("00"):
+            digits = digits[2:]
+        else:
+            national = digits.lstrip("0")
+            lengths = NATIONAL_LENGTHS.get(default_country_code, ())
+            # "5511987654321" already carries the country code, while
+            # "5512345678" is a national number from area code 55.
+            includes_country_code = national.startswith(default_country_code) and (
+                len(national) - len(default_country_code) in lengths
+                or len(national) not in lengths
+                and len(national) > len(default_country_code) + 7
+            )
+            digits = national if includes_country_code else default_country_code + national
+
+    if not 8 <= len(digits) <= 15:
+        return None
+
+    return f"+{digits}"
+
+
+def national_number(e164: str) -> str:
+    """
+    Digits after the country code, the part every stored format of the
+    number contains.
+    """
+
+    digits = e164.lstrip("+")
+    for length in (3, 2, 1):
+        if digits[:length] in NATIONAL_LENGTHS:
+            return digits[length:]
+    return digits
+
+
+class PhoneIndex:
+    """
+    E.164 number -> persons having it among their phones.
+
+    Lookups are dictionary reads. The index is safe to share between the
+    threads of a server answering inbound calls.
+    """
+
+    def __init__(
+        self,
+        persons: Iterable = (),
+        default_country_code: str = DEFAULT_COUNTRY_CODE,
+    ):
+        """
+        :param persons: Iterable[Person]
+        :param default_country_code: str country of numbers stored without one
+        """
+
+        self.default_country_code = default_country_code
+        self._persons: dict[str, dict] = {}
+        self._numbers: dict = {}
+        self._lock = threading.Lock()
+
+        for person in persons:
+            self.add(person)
+
+    @staticmethod
+    def persons(
+        persons: Optional[Iterable] = None,
+        default_country_code: str = DEFAULT_COUNTRY_CODE,
+    ) -> "PhoneIndex":
+        """Index of every person's phones (or of `persons`)."""
+
+        if persons is None:
+            from .person import Person
+
+            persons = Person.get_all_persons()
+
+        return PhoneIndex(persons, default_country_code)
+
+    def __len__(self) -> int:
+        return len(self._persons)
+
+    def __contains__(self, phone: str) -> bool:
+        return self.normalize(phone) in self._persons
+
+    def normalize(self, phone: Optional[str]) -> Optional[str]:
+        return normalize_phone(phone, self.default_country_code)
+
+    def add(self, person) -> None:
+        """Index all phones of a person, replacing what was indexed for it."""
+
+        phones = list(getattr(person, "phones", None) or [])
+        if person.phone and person.phone not in phones:
+            phones.append(person.phone)
+
+        numbers = {self.normalize(phone) for phone in phones}
+        numbers.discard(None)
+
+        with self._lock:
+            self._remove(person.id)
+            for number in numbers:
+                self._persons.setdefault(number, {})[person.id] = person
+            self._numbers[person.id] = numbers
+
+    def remove(self, id) -> None:
+        with self._lock:
+            self._remove(id)
+
+    def _remove(self, id) -> None:
+        for number in self._numbers.pop(id, ()):
+            persons = self._persons[number]
+            persons.pop(id, None)
+            if not persons:
+                del self._persons[number]
+
+    def get(self, phone: str) -> list:
+        """Persons with this number, in any format; [] if none are indexed."""
+
+        number = self.normalize(phone)
+        if number is None:
+            return []
+        return list(self._persons.get(number, {}).values())
+
+
+_phone_index: Optional[PhoneIndex] = None
+
+
+def set_phone_index(index: Optional[PhoneIndex]) -> None:
+    """Index consulted by `Person.retrieve_by_phone` (None to disable)."""
+
+    global _phone_index
+    _phone_index = index
+
+
+def get_phone_index() -> Optional[PhoneIndex]:
+    return _phone_index
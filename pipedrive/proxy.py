@@ -0,0 +1,149 @@
+import threading
+import weakref
+from typing import Type, TypeVar
+
+from .client import Client, get_client
+
+T = TypeVar("T")
+
+
+class LazyRecord:
+    """
+    Mixin for entity objects built from partial payloads such as search
+    results.
+
+    Attributes present in the payload are plain instance attributes and cost
+    nothing. Reading any other field loads the full record through the
+    entity's `get_many`, together with the other proxies built by the same
+    `lazy_records` call that have not been loaded yet, so looping over search
+    results costs one batched fetch instead of one request per record. If
+    that fetch fails, the error is raised and the proxies stay unloaded.
+    """
+
+    def __getattr__(self, name: str):
+        state = self.__dict__
+        if (
+            name.startswith("_")
+            or state.get("_hydrated", True)
+            or name not in _entity_fields(self._entity_class)
+        ):
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+
+        state["_loader"].load()
+        return state[name]
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self.__dict__.get("_hydrated", True)
+
+
+class _Loader:
+    """
+    Proxies built by one `lazy_records` call. Each proxy holds its loader;
+    the loader only holds weak references to the proxies, so both (and the
+    client) are freed with the last proxy.
+    """
+
+    def __init__(self, client: Client, entity_class: type):
+        self.client = client
+        self.entity_class = entity_class
+        self.pending: dict = {}
+        self.lock = threading.Lock()
+
+    def add(self, proxy: LazyRecord) -> None:
+        with self.lock:
+            self.pending.setdefault(proxy.id, []).append(weakref.ref(proxy))
+
+    def load(self) -> None:
+        from .batch import raise_fetch_errors
+
+        with self.lock:
+            proxies_by_id = {}
+            for id, refs in self.pending.items():
+                proxies = [
+                    proxy
+                    for proxy in (ref() for ref in refs)
+                    if proxy is not None and not proxy.__dict__["_hydrated"]
+                ]
+                if proxies:
+                    proxies_by_id[id] = proxies
+
+            if proxies_by_id:
+                # On failure the error propagates and `pending` is kept, so
+                # the next read tries again.
+                with self.client.activate(), raise_fetch_errors():
+                    records = self.entity_class.get_many(list(proxies_by_id))
+            else:
+                records = []
+
+            self.pending = {}
+
+            loaded = {record.id: record for record in records}
+            defaults = vars(self.entity_class())
+
+            for id, proxies in proxies_by_id.items():
+                record = loaded.get(id)
+                values = vars(record) if record is not None else defaults
+                for proxy in proxies:
+                    # Keep values already set on the proxy, such as the search
+                    # payload or records attached with include=[...].
+                    state = proxy.__dict__
+                    for name, value in values.items():
+                        if not name.startswith("_"):
+                            state.setdefault(name, value)
+                    if hasattr(proxy, "mark_loaded"):
+                        proxy.mark_loaded(values)
+                    state["_hydrated"] = True
+
+
+_field_cache: dict = {}
+_proxy_classes: dict = {}
+
+
+def _entity_fields(entity_class: type) -> frozenset:
+    fields = _field_cache.get(entity_class)
+    if fields is None:
+        fields = _field_cache[entity_class] = frozenset(
+            name for name in vars(entity_class()) if not name.startswith("_")
+        )
+    return fields
+
+
+def _proxy_class(entity_class: type) -> type:
+    proxy_class = _proxy_classes.get(entity_class)
+    if proxy_class is None:
+        proxy_class = _proxy_classes[entity_class] = type(
+            f"Lazy{entity_class.__name__}",
+            (LazyRecord, entity_class),
+            {"__module__": entity_class.__module__, "_entity_class": entity_class},
+        )
+    return proxy_class
+
+
+def lazy_records(entity_class: Type[T], payloads: list[dict]) -> list[T]:
+    """
+    Build lazy proxies of `entity_class` holding only the given fields.
+
+    Every payload must contain "id". The proxies are instances of
+    `entity_class`, so existing isinstance checks and methods keep working.
+
+    :param entity_class: Organization, Person or Deal
+    :param payloads: list[dict] known field values per record
+    :return: list of proxies
+    """
+
+    proxy_class = _proxy_class(entity_class)
+    loader = _Loader(get_client(), entity_class)
+    proxies = []
+
+    for payload in payloads:
+        proxy = proxy_class.__new__(proxy_class)
+        proxy.__dict__.update(payload)
+        proxy.__dict__["_hydrated"] = False
+        proxy.__dict__["_loader"] = loader
+        loader.add(proxy)
+        proxies.append(proxy)
+
+    return proxies
@@ -0,0 +1,246 @@
+import threading
+import time
+from typing import Optional
+
+from .scheduling import INTERACTIVE, NORMAL, PRIORITY_NAMES
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how many requests a client sends per second.
+
+    Each `Client` owns its own limiter, so accounts synced in parallel do not
+    share (or exhaust) each other's budget. Within a client, waiting requests
+    are served by priority class (see `pipedrive.scheduling`), and the last
+    `reserved` share of the bucket is kept for INTERACTIVE requests.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None, reserved: float = 0.0):
+        """
+        :param rate: float requests per second
+        :param burst: int bucket capacity, defaults to one second of traffic
+        :param reserved: float share of the bucket, 0..1, only INTERACTIVE
+            requests may use
+        """
+
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not 0 <= reserved < 1:
+            raise ValueError("reserved must be in [0, 1)")
+
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.reserved = reserved
+        # A bucket of one token has nothing to reserve.
+        self._floor = min(self.capacity * reserved, self.capacity - 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._condition = threading.Condition(threading.Lock())
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _wait(self, priority: int, now: float) -> float:
+        """Seconds until a request of `priority` may be sent, 0 if now."""
+
+        if priority > INTERACTIVE and now < self._paused_until:
+            return self._paused_until - now
+
+        if any(self._waiting[level] for level in self._waiting if level < priority):
+            # Woken up again when a higher priority request is sent.
+            return 1 / self.rate
+
+        floor = 0.0 if priority == INTERACTIVE else self._floor
+        return max(0.0, (1 + floor - self._tokens) / self.rate)
+
+    def try_acquire(self, priority: int = NORMAL) -> bool:
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            if self._wait(priority, now) > 0:
+                return False
+            self._tokens -= 1
+            return True
+
+    def acquire(self, priority: int = NORMAL) -> None:
+        """Block until a request of `priority` may be sent."""
+
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait(priority, now)
+                    if wait <= 0:
+                        self._tokens -= 1
+                        return
+                    self._condition.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all but INTERACTIVE requests, e.g. after a 429."""
+
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    @property
+    def available(self) -> float:
+        with self._condition:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive cap on a client's requests in flight (AIMD).
+
+    Every request that completes normally raises the limit by 1/limit,
+    about one more slot per round of requests. A 429, a failed request, a
+    nearly exhausted rate budget (the `x-ratelimit-*` headers) or a latency
+    well above the usual minimum halves it, at most once per round trip.
+    The limit settles just below the point where the account starts to push
+    back, whatever the worker count of the code sending the requests.
+    Waiting requests are served by priority class.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        initial: Optional[int] = None,
+        decrease: float = 0.5,
+        latency_tolerance: float = 3.0,
+        low_budget: float = 0.1,
+    ):
+        """
+        :param maximum: int highest limit, usually the connection pool size
+        :param minimum: int lowest limit
+        :param initial: int starting limit, defaults to `maximum`
+        :param decrease: float factor applied to the limit on congestion
+        :param latency_tolerance: float smoothed latency, as a multiple of the
+            baseline (minimum) latency, treated as congestion
+        :param low_budget: float share of the rate budget left that is
+            treated as congestion
+        """
+
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Expected 1 <= minimum <= maximum")
+
+        self.maximum = maximum
+        self.minimum = minimum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.low_budget = low_budget
+
+        self._limit = float(initial if initial is not None else maximum)
+        self._in_flight = 0
+        self._waiting = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._baseline: Optional[float] = None
+        self._latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._increases = 0
+        self._decreases = 0
+        self._condition = threading.Condition(threading.Lock())
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, priority: int = NORMAL) -> float:
+        """
+        Block until a request of `priority` may start.
+
+        :return: float start time, to pass to `release`
+        """
+
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while self._in_flight >= self.limit or any(
+                    self._waiting[level] for level in self._waiting if level < priority
+                ):
+                    self._condition.wait()
+                self._in_flight += 1
+                return time.monotonic()
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def release(
+        self,
+        started: float,
+        latency: float,
+        throttled: bool = False,
+        failed: bool = False,
+        budget: Optional[float] = None,
+    ) -> None:
+        """
+        Record how a request went and free its slot.
+
+        :param started: float from `acquire`
+        :param latency: float seconds the server took to answer
+        :param throttled: bool the response was a 429
+        :param failed: bool the request raised (timeout, connection error)
+        :param budget: float share of the rate budget left, from the headers
+        """
+
+        with self._condition:
+            self._in_flight -= 1
+
+            if not (throttled or failed):
+                # Errors and 429s come back fast and say nothing of load.
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                elif not self._in_flight:
+                    # Only a request sent alone shows the unloaded latency;
+                    # following those picks up a slower network path.
+                    self._baseline += (latency - self._baseline) * 0.1
+                if self._latency is None:
+                    self._latency = latency
+                else:
+                    self._latency += (latency - self._latency) * 0.2
+
+            congested = (
+                throttled
+                or failed
+                or (budget is not None and budget < self.low_budget)
+                or self._latency is not None
+                and self._latency > self._baseline * self.latency_tolerance
+            )
+
+            if congested:
+                # Requests started before the last decrease report the same
+                # congestion; count it once.
+                if started >= self._last_decrease and self._limit > self.minimum:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+                    self._decreases += 1
+            elif self._limit < self.maximum:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._increases += 1
+
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "baseline_latency": self._baseline or 0.0,
+                "latency": self._latency or 0.0,
+            }
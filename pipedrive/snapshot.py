@@ -0,0 +1,359 @@
+"""
+Memory-mapped binary snapshots of entity records.
+
+A snapshot stores one fixed-width column per field (int64, float64, int8
+booleans, or uint32 indexes into a deduplicated string table) behind a small
+JSON header. Opening one maps the file and casts each column in place, so it
+costs the same for 500 or 500k records, and processes reading the same file
+share its pages:
+
+    Snapshot.write("deals.snap", Deal.get_all_deals())
+
+    snapshot = Snapshot("deals.snap")
+    snapshot[0].title            # read from the mapping
+    snapshot.column("value")     # memoryview over the int64 column
+    snapshot.get(1234).load()    # Deal built on demand
+
+Layout: b"PDSNAP\\x00\\x01", uint32 header length, header JSON, then
+8-byte aligned column arrays and the string table (uint64 offsets followed
+by UTF-8 data). Values use the writer's native byte order, recorded in the
+header.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b"PDSNAP\x00\x01"
+
+INT_NULL = -(2**63)
+STRING_NULL = 2**32 - 1
+BOOL_NULL = -1
+
+# column kind -> array typecode
+_TYPECODES = {"int": "q", "float": "d", "bool": "b", "string": "I", "json": "I"}
+
+
+def _entity_classes() -> dict:
+    from .activity import Activity
+    from .deal import Deal
+    from .lead import Lead
+    from .organization import Organization
+    from .person import Person
+
+    return {
+        "deal": Deal,
+        "person": Person,
+        "organization": Organization,
+        "activity": Activity,
+        "lead": Lead,
+    }
+
+
+def _kind(values: list) -> str:
+    types = set(map(type, values))
+    types.discard(type(None))
+
+    if not types:
+        return "string"
+    if types == {bool}:
+        return "bool"
+    if types <= {int, float}:
+        present = [value for value in values if value is not None]
+        # Whole floats such as 4.0 keep the column int; float64 only when a
+        # value has a fraction, so ints mixed with them don't read back as 4.0.
+        if all(type(value) is int or value.is_integer() for value in present) and (
+            INT_NULL < min(present) and max(present) < 2**63
+        ):
+            return "int"
+        if types == {int}:
+            return "json"
+        return "float"
+    if types == {str}:
+        return "string"
+    return "json"
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: dict = {None: STRING_NULL}
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+
+    def add(self, value: str) -> int:
+        id = self.ids[value] = len(self.offsets) - 1
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+        return id
+
+    def encode(self, values: Iterable[Optional[str]]) -> array:
+        ids = self.ids
+        add = self.add
+        return array("I", [ids[value] if value in ids else add(value) for value in values])
+
+
+def _encode_column(kind: str, values: list, strings: _StringTable) -> array:
+    if kind == "int":
+        return array("q", [INT_NULL if value is None else int(value) for value in values])
+    if kind == "float":
+        return array(
+            "d", [float("nan") if value is None else value for value in values]
+        )
+    if kind == "bool":
+        return array("b", [BOOL_NULL if value is None else value for value in values])
+    if kind == "string":
+        return strings.encode(values)
+    return strings.encode(
+        None if value is None else json.dumps(value, default=str) for value in values
+    )
+
+
+def _padding(offset: int) -> bytes:
+    return b"\x00" * (-offset % 8)
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self._mmap = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+
+        buffer = memoryview(self._mmap)
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a pipedrive snapshot")
+
+        (header_length,) = struct.unpack_from("<I", buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[start : start + header_length]))
+        base = start + header_length
+        base += -base % 8
+
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(
+                f"{path} was written on a {header['byteorder']}-endian machine"
+            )
+
+        self.entity = header["entity"]
+        self.count = header["count"]
+        self.kinds = {column["name"]: column["kind"] for column in header["columns"]}
+
+        self._buffer = buffer
+        self._columns = {
+            column["name"]: buffer[
+                base + column["offset"] : base + column["offset"] + column["size"]
+            ].cast(_TYPECODES[column["kind"]])
+            for column in header["columns"]
+        }
+
+        strings = header["strings"]
+        offsets = base + strings["offsets"]
+        data = base + strings["data"]
+        self._string_offsets = buffer[offsets : offsets + 8 * (strings["count"] + 1)].cast("Q")
+        self._string_data = buffer[data : data + strings["size"]]
+
+        self._index: Optional[dict] = None
+
+    @staticmethod
+    def write(
+        path: str, records: Iterable, entity: Optional[str] = None
+    ) -> "Snapshot":
+        """
+        Write entity objects (anything with `to_dict()`) or plain dicts to a
+        snapshot file, replacing it atomically.
+
+        :param path: str
+        :param records: Iterable of Deal, Person, ... or dicts
+        :param entity: str "deal", "person", ...; defaults to the records' class
+        :return: Snapshot opened on the new file
+
+        Number columns are int64 unless a value has a fraction; then the
+        column is float64 and its whole numbers read back as floats.
+        """
+
+        rows = []
+        for record in records:
+            if entity is None and not isinstance(record, dict):
+                # Lazy search results (LazyDeal, ...) name their entity class.
+                entity_class = getattr(record, "_entity_class", type(record))
+                entity = entity_class.__name__.lower()
+            rows.append(record if isinstance(record, dict) else record.to_dict())
+
+        names = dict.fromkeys(rows[0]) if rows else {}
+        for row in rows:
+            if not row.keys() <= names.keys():
+                names.update(dict.fromkeys(row))
+
+        strings = _StringTable()
+        columns = []
+        for name in names:
+            values = [row.get(name) for row in rows]
+            kind = _kind(values)
+            columns.append((name, kind, _encode_column(kind, values, strings)))
+
+        # Offsets are relative to the first 8-byte boundary after the header.
+        offset = 0
+        layout = []
+        for name, kind, values in columns:
+            size = len(values) * values.itemsize
+            layout.append({"name": name, "kind": kind, "offset": offset, "size": size})
+            offset += size + (-size % 8)
+
+        header_bytes = json.dumps(
+            {
+                "entity": entity,
+                "count": len(rows),
+                "byteorder": sys.byteorder,
+                "columns": layout,
+                "strings": {
+                    "count": len(strings.offsets) - 1,
+                    "offsets": offset,
+                    "data": offset + 8 * len(strings.offsets),
+                    "size": len(strings.data),
+                },
+            }
+        ).encode()
+        prefix = len(MAGIC) + 4 + len(header_bytes)
+
+        partial = f"{path}.part"
+        with open(partial, "wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<I", len(header_bytes)))
+            file.write(header_bytes)
+            file.write(_padding(prefix))
+
+            for _, _, values in columns:
+                data = values.tobytes()
+                file.write(data)
+                file.write(_padding(len(data)))
+
+            file.write(strings.offsets.tobytes())
+            file.write(bytes(strings.data))
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(partial, path)
+        return Snapshot(path)
+
+    def close(self) -> None:
+        for column in self._columns.values():
+            column.release()
+        self._string_offsets.release()
+        self._string_data.release()
+        self._buffer.release()
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> "RecordView":
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("snapshot index out of range")
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator["RecordView"]:
+        for index in range(self.count):
+            yield RecordView(self, index)
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> memoryview:
+        """
+        The raw column: int64 (INT_NULL for None), float64 (NaN), int8
+        booleans (BOOL_NULL), or uint32 string ids (STRING_NULL, see
+        `string`).
+        """
+
+        return self._columns[name]
+
+    def string(self, id: int) -> Optional[str]:
+        if id == STRING_NULL:
+            return None
+        start = self._string_offsets[id]
+        end = self._string_offsets[id + 1]
+        return str(self._string_data[start:end], "utf-8")
+
+    def value(self, name: str, index: int):
+        kind = self.kinds[name]
+        raw = self._columns[name][index]
+
+        if kind == "int":
+            return None if raw == INT_NULL else raw
+        if kind == "float":
+            return None if raw != raw else raw
+        if kind == "bool":
+            return None if raw == BOOL_NULL else bool(raw)
+        if kind == "string":
+            return self.string(raw)
+
+        text = self.string(raw)
+        return None if text is None else json.loads(text)
+
+    def get(self, id) -> Optional["RecordView"]:
+        """Record by `id`, through an index built on first use."""
+
+        if self._index is None:
+            if self.kinds.get("id") == "int":
+                ids = self._columns["id"].tolist()
+            else:
+                ids = [self.value("id", index) for index in range(self.count)]
+            self._index = {id: index for index, id in enumerate(ids)}
+
+        index = self._index.get(id)
+        return RecordView(self, index) if index is not None else None
+
+
+class RecordView:
+    """
+    One snapshot record. Fields are read from the mapping on attribute
+    access; `load()` builds the entity object.
+    """
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: Snapshot, index: int):
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getattr__(self, name: str):
+        if name in self._snapshot.kinds:
+            return self._snapshot.value(name, self._index)
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"RecordView({self._snapshot.entity}, index={self._index})"
+
+    def to_dict(self) -> dict:
+        return {
+            name: self._snapshot.value(name, self._index)
+            for name in self._snapshot.kinds
+        }
+
+    def load(self):
+        """The record as its entity class (Deal, Person, ...), or a dict."""
+
+        entity_class = _entity_classes().get(self._snapshot.entity)
+        if entity_class is None:
+            return self.to_dict()
+        return entity_class(**self.to_dict())
@@ -0,0 +1,272 @@
+"""
+Sharded full sync of deals over a process pool.
+
+The deal listing is split into shards by server-side filters (one per stage
+by default). Each worker process fetches and decodes whole shards with its
+own connection pool and a share of the rate budget, and the results are
+merged in shard order:
+
+    sync = ShardedSync(processes=8)
+
+    for deal in sync.deals():
+        ...
+
+    mirror = {}
+    sync.mirror(mirror)  # id -> Deal, upserts and deletions applied
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from .api import encode_url
+from .batch import raise_fetch_errors
+from .client import Client, get_client
+from .deal import Deal
+from .metadata import get_metadata
+from .pagination import iter_pages, prefetch
+from .scheduling import BACKGROUND, prioritized
+
+
+def stage_shards(pipeline_ids: Optional[Iterable[int]] = None) -> list[dict]:
+    """
+    One shard per stage from the account metadata. Every deal has one stage,
+    so the shards cover all non-deleted deals without overlap.
+
+    :param pipeline_ids: Iterable[int] only stages of these pipelines
+    :return: list[dict] listing filters
+    :raises RuntimeError: if there are no stages, since an empty shard list
+        would look like an account without deals
+    """
+
+    metadata = get_metadata()
+    if pipeline_ids is None:
+        pipeline_ids = metadata.pipelines
+
+    shards = [
+        {"stage_id": stage.id}
+        for pipeline_id in sorted(pipeline_ids)
+        for stage in metadata.pipeline_stages(pipeline_id)
+    ]
+    if not shards:
+        raise RuntimeError("No stages found to shard the deal listing by")
+
+    return shards
+
+
+def status_shards(statuses: Iterable[str] = ("open", "won", "lost")) -> list[dict]:
+    return [{"status": status} for status in statuses]
+
+
+def filter_shards(filter_ids: Iterable[int]) -> list[dict]:
+    """Shards from saved filters, e.g. filters over ID or date ranges."""
+
+    return [{"filter_id": filter_id} for filter_id in filter_ids]
+
+
+def _covered_stages(shards: list[dict]) -> Optional[set]:
+    """Stage ids listed by stage shards, None if the shards filter otherwise."""
+
+    if all(set(shard) == {"stage_id"} for shard in shards):
+        return {shard["stage_id"] for shard in shards}
+    return None
+
+
+# Clients of a worker process, reused across the shards it fetches.
+_worker_clients: dict = {}
+
+
+def _worker_client(settings: tuple) -> Client:
+    client = _worker_clients.get(settings)
+    if client is None:
+        client = _worker_clients[settings] = Client(**dict(settings))
+    return client
+
+
+@prioritized(BACKGROUND)
+def _fetch_shard(params: dict, page_size: int) -> list[Deal]:
+    url = encode_url(entity="deals", params={**params, "limit": page_size})
+    return [
+        Deal.from_dict(result) for page in prefetch(iter_pages(url)) for result in page
+    ]
+
+
+def _fetch_shard_in_worker(task: tuple) -> list[Deal]:
+    settings, params, page_size = task
+    with _worker_client(settings).activate():
+        return _fetch_shard(params, page_size)
+
+
+@dataclass
+class SyncReport:
+    """
+    :param shards: int shards fetched
+    :param deals: int distinct deals seen
+    :param added: int deals new to the mirror
+    :param updated: int deals already in the mirror
+    :param removed: int mirror entries no longer listed
+    :param pruned: bool whether entries were removed; only when every shard
+        completed
+    :param seconds: float wall time
+    """
+
+    shards: int = 0
+    deals: int = 0
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    pruned: bool = False
+    seconds: float = 0.0
+
+
+class ShardedSync:
+    """
+    Fetch every deal with shards spread over worker processes.
+
+    Throughput scales with `processes` until the account's rate limit is
+    reached; the client's `rate_limit` is divided between the workers so
+    together they stay within it. Deals that move between shards while the
+    sync runs can be listed twice (`deals()` yields them once, `mirror()`
+    keeps the later copy) or by no shard (`deals()` misses them until the
+    next sync, `mirror()` looks them up by id before pruning).
+    """
+
+    def __init__(
+        self,
+        shards: Optional[list[dict]] = None,
+        processes: Optional[int] = None,
+        page_size: int = 500,
+        client: Optional[Client] = None,
+        mp_context=None,
+    ):
+        """
+        :param shards: list[dict] listing filters, defaults to `stage_shards()`
+        :param processes: int worker processes, defaults to the CPU count;
+            1 fetches in this process
+        :param page_size: int deals per request
+        :param client: Client defaults to the active client
+        :param mp_context: multiprocessing context for the pool
+        """
+
+        self.client = client or get_client()
+        self.processes = processes or os.cpu_count() or 1
+        self.page_size = page_size
+        self.mp_context = mp_context
+        self._shards = shards
+
+    @property
+    def shards(self) -> list[dict]:
+        if self._shards is None:
+            with self.client.activate():
+                self._shards = stage_shards()
+        return self._shards
+
+    def _worker_settings(self, workers: int) -> tuple:
+        config = self.client.config
+        rate_limit = config.rate_limit
+        if rate_limit is not None:
+            rate_limit = rate_limit / workers
+
+        return (
+            ("company_domain", config.company_domain),
+            ("api_key", config.api_key),
+            ("versions", config.versions),
+            ("pool_size", config.pool_size),
+            ("rate_limit", rate_limit),
+            ("timeout", config.timeout),
+            ("reserved", config.reserved),
+            ("adaptive_concurrency", config.adaptive_concurrency),
+        )
+
+    def iter_shards(self) -> Iterator[tuple[dict, list[Deal]]]:
+        """Yield (shard, deals) in shard order as shards complete."""
+
+        shards = self.shards
+
+        if self.processes <= 1 or len(shards) <= 1:
+            with self.client.activate():
+                for shard in shards:
+                    yield shard, _fetch_shard(shard, self.page_size)
+            return
+
+        workers = min(self.processes, len(shards))
+        settings = self._worker_settings(workers)
+        tasks = [(settings, shard, self.page_size) for shard in shards]
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context) as executor:
+            yield from zip(shards, executor.map(_fetch_shard_in_worker, tasks))
+
+    def deals(self) -> Iterator[Deal]:
+        """Every deal once, in shard order."""
+
+        seen = set()
+        for _, deals in self.iter_shards():
+            for deal in deals:
+                if deal.id not in seen:
+                    seen.add(deal.id)
+                    yield deal
+
+    def mirror(self, target: dict, prune: bool = True) -> SyncReport:
+        """
+        Bring a local id -> Deal mapping in line with the account: new and
+        changed deals are written and, with `prune`, deals no longer listed
+        are removed.
+
+        A shard whose requests fail raises, after the shards before it were
+        written, and nothing is pruned. With stage shards, only entries in
+        one of the sharded stages are pruned, so deals of deleted pipelines
+        (which no shard lists) are kept. Entries no shard listed are looked
+        up by id before they are removed, since a deal that changed stage
+        during the sync can be missing from every shard.
+
+        :param target: dict or any mutable mapping keyed by deal id
+        :param prune: bool remove entries missing from the listing
+        :return: SyncReport
+        """
+
+        shards = self.shards
+        report = SyncReport()
+        started = time.perf_counter()
+        seen = set()
+
+        for _, deals in self.iter_shards():
+            report.shards += 1
+            for deal in deals:
+                if deal.id in seen:
+                    target[deal.id] = deal
+                    continue
+
+                seen.add(deal.id)
+                if deal.id in target:
+                    report.updated += 1
+                else:
+                    report.added += 1
+                target[deal.id] = deal
+
+        if prune and report.shards == len(shards):
+            covered = _covered_stages(shards)
+            unseen = [
+                id
+                for id, deal in target.items()
+                if id not in seen
+                and (covered is None or getattr(deal, "stage_id", None) in covered)
+            ]
+
+            # Raises if a lookup fails, so only deals confirmed gone are removed.
+            with self.client.activate(), raise_fetch_errors():
+                for deal in Deal.get_many(unseen):
+                    seen.add(deal.id)
+                    report.updated += 1
+                    target[deal.id] = deal
+
+            for id in unseen:
+                if id not in seen:
+                    del target[id]
+                    report.removed += 1
+            report.pruned = True
+
+        report.deals = len(seen)
+        report.seconds = time.perf_counter() - started
+        return report
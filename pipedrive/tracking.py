@@ -0,0 +1,59 @@
+from typing import Optional
+
+
+def _snapshot(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class TrackedModel:
+    """
+    Remember the values a model was loaded with, so `save()` can send only
+    the fields that changed since.
+
+    Subclasses list their writable attributes in `_tracked_fields` and call
+    `mark_loaded()` at the end of `__init__`.
+    """
+
+    _tracked_fields: tuple = ()
+
+    def mark_loaded(self, values: Optional[dict] = None) -> None:
+        """
+        Record the current values (or `values`) as the persisted state.
+
+        :param values: dict attribute values, defaults to the object's own
+        """
+
+        source = self.__dict__ if values is None else values
+        self.__dict__["_loaded"] = {
+            name: _snapshot(source.get(name)) for name in self._tracked_fields
+        }
+
+    def changed_fields(self) -> dict:
+        """
+        Tracked attributes whose value differs from the persisted state.
+
+        :return: dict attribute name -> current value
+        """
+
+        current = {name: getattr(self, name) for name in self._tracked_fields}
+        loaded = self.__dict__.get("_loaded", {})
+
+        return {
+            name: value
+            for name, value in current.items()
+            if name not in loaded or loaded[name] != value
+        }
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.changed_fields())
+
+    def _patch(self, values: dict) -> None:
+        """Overwrite attributes in place and mark them persisted."""
+
+        self.__dict__.update(values)
+        self.mark_loaded()
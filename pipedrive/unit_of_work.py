@@ -0,0 +1,219 @@
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .client import Client, get_client
+from .concurrency import map_concurrent
+
+
+def _merge_note(old: Optional[str], new: Optional[str]) -> Optional[str]:
+    if old is None:
+        return new
+    if new is None:
+        return old
+    return f"{old} / {new}"
+
+
+def _merge_participants(old: Optional[list], new: Optional[list]) -> list:
+    return list(dict.fromkeys([*(old or []), *(new or [])]))
+
+
+# Fields whose updates accumulate instead of replacing each other, matching
+# how Activity.update treats them.
+MERGE_RULES = {
+    "note": _merge_note,
+    "participants_ids": _merge_participants,
+}
+
+
+@dataclass
+class FlushReport:
+    """
+    :param updates: int update calls queued
+    :param requests: int PUT requests sent
+    :param failed: list[tuple[str, int]] (entity, id) whose PUT failed
+    :param results: dict[tuple[str, int], object] updated objects by (entity, id)
+
+    Records of different clients are sent separately, but share report
+    entries when their entity and id match.
+    """
+
+    updates: int = 0
+    requests: int = 0
+    failed: list = field(default_factory=list)
+    results: dict = field(default_factory=dict)
+
+    @property
+    def saved(self) -> int:
+        """PUT requests avoided by coalescing."""
+
+        return self.updates - self.requests
+
+
+class _Pending:
+    __slots__ = ("record", "client", "kwargs", "updates")
+
+    def __init__(self, record, client: Client):
+        self.record = record
+        self.client = client
+        self.kwargs = {}
+        self.updates = 0
+
+    def merge(self, kwargs: dict) -> None:
+        for name, value in kwargs.items():
+            rule = MERGE_RULES.get(name)
+            if rule is not None and name in self.kwargs:
+                value = rule(self.kwargs[name], value)
+            self.kwargs[name] = value
+        self.updates += 1
+
+
+_active_buffer: ContextVar[Optional["UpdateBuffer"]] = ContextVar(
+    "pipedrive_update_buffer", default=None
+)
+
+
+class UpdateBuffer:
+    """
+    Opt-in unit of work that coalesces `Deal.update` and `Activity.update`.
+
+    Inside the block, update calls are queued per entity id and merged into
+    one payload: later values win, except `note` and `participants_ids`,
+    which accumulate. The queue is flushed concurrently when the block exits,
+    when `max_pending` records are queued, or `max_delay` seconds after the
+    first queued update.
+
+        with UpdateBuffer() as buffer:
+            deal.update(stage_id=Deal.Stage.sales_sqo)
+            deal.update(tag=Deal.Tag.trial)
+            deal.update(value=1000)
+
+        buffer.report.saved  # 2
+
+    Queued calls return the object unchanged; the updated objects are in
+    `buffer.report.results` after the flush. If the block raises, the
+    updates still queued are discarded (unless `flush_on_error`); automatic
+    flushes that already ran are not undone.
+    """
+
+    def __init__(
+        self,
+        max_pending: Optional[int] = 100,
+        max_delay: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        flush_on_error: bool = False,
+    ):
+        """
+        :param max_pending: int records queued before an automatic flush
+        :param max_delay: float seconds between the first queued update and
+            an automatic flush
+        :param max_workers: int concurrent PUTs, defaults to the client's pool size
+        :param flush_on_error: bool send the queued updates even if the block raises
+        """
+
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self.flush_on_error = flush_on_error
+        self.report = FlushReport()
+
+        self._pending: dict = {}
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._token = None
+
+    @staticmethod
+    def current() -> Optional["UpdateBuffer"]:
+        return _active_buffer.get()
+
+    def __enter__(self) -> "UpdateBuffer":
+        self._token = _active_buffer.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _active_buffer.reset(self._token)
+        self._token = None
+
+        if exc_type is not None and not self.flush_on_error:
+            self.discard()
+        else:
+            self.flush()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, record, kwargs: dict):
+        entity = getattr(record, "_entity_class", type(record)).__name__.lower()
+        client = get_client()
+        # The same id in two accounts is two records, sent with their own client.
+        key = (client, entity, record.id)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending(record, client)
+            pending.merge(kwargs)
+
+            if self.max_delay is not None and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+            full = self.max_pending is not None and len(self._pending) >= self.max_pending
+
+        if full:
+            self.flush()
+
+        return record
+
+    def discard(self) -> int:
+        """Drop the queued updates without sending them; returns how many records."""
+
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending, self._pending = self._pending, {}
+
+        return len(pending)
+
+    def flush(self) -> FlushReport:
+        """Send every queued update, one PUT per record, concurrently."""
+
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return self.report
+
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = next(iter(pending.values())).client.config.pool_size
+
+        token = _active_buffer.set(None)
+        try:
+            results = map_concurrent(_send, pending.values(), max_workers)
+        finally:
+            _active_buffer.reset(token)
+
+        with self._lock:
+            for (_, entity, id), entry, result in zip(pending, pending.values(), results):
+                self.report.updates += entry.updates
+                self.report.requests += 1
+                if result is None:
+                    self.report.failed.append((entity, id))
+                else:
+                    self.report.results[entity, id] = result
+
+        return self.report
+
+
+def _send(pending: _Pending):
+    with pending.client.activate():
+        return pending.record.update(**pending.kwargs)
@@ -0,0 +1,263 @@
+"""
+Change streams over the v1 `recents` endpoint.
+
+A watcher asks Pipedrive only for records changed since its last poll, so an
+idle account costs one empty request per interval, and the interval itself
+stretches while nothing changes or the rate budget runs low:
+
+    for event in Deal.watch():
+        if "stage_id" in event.changes:
+            old, new = event.changes["stage_id"]
+
+    async for event in Activity.watch(min_interval=5):
+        ...
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from .client import Client, get_client, header_budget
+from .diff import CREATED, DELETED
+
+UPDATED = "updated"
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Fraction of the rate budget below which polling slows down.
+LOW_BUDGET = 0.25
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """
+    :param kind: str CREATED, UPDATED or DELETED
+    :param id: record id
+    :param before: previous record, None if created or not seen before
+    :param after: current record, None if deleted
+    :param changes: dict field -> (old, new), empty unless `before` is known
+    """
+
+    kind: str
+    id: Any
+    before: Any = None
+    after: Any = None
+    changes: dict = field(default_factory=dict)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def _is_deleted(data: Optional[dict]) -> bool:
+    return not data or bool(data.get("deleted")) or data.get("active_flag") is False
+
+
+def _changes(before, after) -> dict:
+    old = before.to_dict()
+    new = after.to_dict()
+    return {
+        name: (old.get(name), value)
+        for name, value in new.items()
+        if old.get(name) != value
+    }
+
+
+def _budget(response, client: Client) -> tuple[float, float]:
+    """Fraction of the rate budget left (0..1) and seconds until it resets."""
+
+    fraction = 1.0
+    reset = 0.0
+
+    budget = header_budget(response)
+    if budget is not None:
+        fraction = budget
+        if budget <= 0:
+            reset = float(response.headers.get("x-ratelimit-reset") or 0)
+
+    limiter = client.rate_limiter
+    if limiter is not None:
+        fraction = min(fraction, limiter.available / limiter.capacity)
+
+    return max(fraction, 0.0), reset
+
+
+class Watcher:
+    """
+    Poll `recents` for one item type and turn what changed into WatchEvents.
+
+    The watcher keeps the last copy of every record it has seen (or was
+    given as `baseline`) to fill in `before` and `changes`. The poll
+    interval halves after a poll that found changes, grows by half after an
+    empty one, and is pushed towards `max_interval` as the remaining rate
+    budget drops below LOW_BUDGET.
+    """
+
+    def __init__(
+        self,
+        item: str,
+        decode: Callable[[dict], Any],
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        since: Optional[str] = None,
+        baseline: Union[dict, Iterable, None] = None,
+        filter_function: Optional[Callable[[Any], bool]] = None,
+        page_size: int = 500,
+        client: Optional[Client] = None,
+    ):
+        """
+        :param item: str recents item type, "deal" or "activity"
+        :param decode: Callable building a record from its v1 dict
+        :param min_interval: float shortest wait between polls, in seconds
+        :param max_interval: float longest wait between polls, in seconds
+        :param since: str UTC "YYYY-MM-DD HH:MM:SS" to start from, defaults
+            to now
+        :param baseline: dict id -> record or Iterable of records already
+            known, e.g. a `ShardedSync` mirror
+        :param filter_function: Callable[[record], bool] only report records
+            accepted before or after the change
+        :param page_size: int records per request
+        :param client: Client defaults to the active client
+        """
+
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Expected 0 < min_interval <= max_interval")
+
+        self.item = item
+        self.decode = decode
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.since = since or _now()
+        self.filter_function = filter_function
+        self.page_size = page_size
+        self.client = client or get_client()
+
+        self._started = self.since
+        if isinstance(baseline, dict):
+            self._known = dict(baseline)
+        else:
+            self._known = {record.id: record for record in baseline or ()}
+
+    def _fetch(self) -> tuple[list[dict], Any]:
+        items = []
+        start = 0
+        latest = self.since
+
+        with self.client.activate():
+            while True:
+                url = self.client.encode_url(
+                    entity="recents",
+                    params={
+                        "since_timestamp": self.since,
+                        "items": self.item,
+                        "start": start,
+                        "limit": self.page_size,
+                    },
+                )
+                response = self.client.request("GET", url)
+                response.raise_for_status()
+                response_json = response.json()
+
+                items += response_json.get("data") or []
+
+                additional_data = response_json.get("additional_data") or {}
+                latest = max(latest, additional_data.get("last_timestamp_on_page") or latest)
+
+                pagination = additional_data.get("pagination") or {}
+                if not pagination.get("more_items_in_collection"):
+                    break
+                start = pagination["next_start"]
+
+        # `since_timestamp` is inclusive: records changed in the last second
+        # come back on the next poll and are dropped as unchanged then.
+        self.since = latest
+        return items, response
+
+    def _event(self, id, data: Optional[dict]) -> Optional[WatchEvent]:
+        before = self._known.get(id)
+
+        if _is_deleted(data):
+            if before is None:
+                return None
+            del self._known[id]
+            return WatchEvent(DELETED, id, before=before)
+
+        after = self._known[id] = self.decode(data)
+
+        if before is not None:
+            changes = _changes(before, after)
+            if not changes:
+                return None
+            return WatchEvent(UPDATED, id, before=before, after=after, changes=changes)
+
+        if (data.get("add_time") or "") >= self._started:
+            return WatchEvent(CREATED, id, after=after)
+        return WatchEvent(UPDATED, id, after=after)
+
+    def _accepts(self, event: WatchEvent) -> bool:
+        if self.filter_function is None:
+            return True
+        return any(
+            record is not None and self.filter_function(record)
+            for record in (event.before, event.after)
+        )
+
+    def poll(self) -> list[WatchEvent]:
+        """One round trip: the events since the previous poll."""
+
+        items, response = self._fetch()
+
+        # Keep the latest copy of records listed more than once.
+        latest = {}
+        for item in items:
+            if item.get("item") == self.item:
+                latest[item["id"]] = item.get("data")
+
+        events = []
+        for id, data in latest.items():
+            event = self._event(id, data)
+            if event is not None and self._accepts(event):
+                events.append(event)
+
+        self._adapt(bool(events), response)
+        return events
+
+    def _adapt(self, changed: bool, response) -> None:
+        if changed:
+            interval = max(self.min_interval, self.interval / 2)
+        else:
+            interval = min(self.max_interval, self.interval * 1.5)
+
+        fraction, reset = _budget(response, self.client)
+        if fraction < LOW_BUDGET:
+            interval += (self.max_interval - interval) * (1 - fraction / LOW_BUDGET)
+
+        self.interval = max(interval, reset)
+
+    def __iter__(self) -> Iterator[WatchEvent]:
+        while True:
+            try:
+                events = self.poll()
+            except Exception as e:
+                print(f"Error polling {self.item} changes - {e}")
+                events = []
+                self.interval = self.max_interval
+
+            yield from events
+            time.sleep(self.interval)
+
+    async def __aiter__(self):
+        while True:
+            try:
+                events = await asyncio.to_thread(self.poll)
+            except Exception as e:
+                print(f"Error polling {self.item} changes - {e}")
+                events = []
+                self.interval = self.max_interval
+
+            for event in events:
+                yield event
+            await asyncio.sleep(self.interval)
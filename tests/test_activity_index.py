@@ -0,0 +1,105 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from pipedrive.activity import Activity
+from pipedrive.activity_index import ActivityIndex, activity_interval
+
+
+def _activity(id, due_date, due_time=None, duration=None, user_id=1) -> Activity:
+    return Activity(
+        id=id, due_date=due_date, due_time=due_time, duration=duration, user_id=user_id
+    )
+
+
+ACTIVITIES = [
+    _activity(1, "2024-05-06", "14:00", "01:00"),
+    _activity(2, "2024-05-06", "14:30", "00:30"),
+    _activity(3, "2024-05-06", "15:00", "30"),
+    _activity(4, "2024-05-06", "14:15", "00:30", user_id=2),
+    _activity(5, "2024-05-07"),
+    _activity(6, None),
+]
+
+
+@pytest.fixture
+def index():
+    return ActivityIndex(ACTIVITIES)
+
+
+def _ids(activities) -> list:
+    return [activity.id for activity in activities]
+
+
+def test_activity_interval():
+    assert activity_interval(ACTIVITIES[0]) == (
+        datetime(2024, 5, 6, 14),
+        datetime(2024, 5, 6, 15),
+    )
+    assert activity_interval(ACTIVITIES[2])[1] == datetime(2024, 5, 6, 15, 30)
+    assert activity_interval(ACTIVITIES[4]) == (datetime(2024, 5, 7), datetime(2024, 5, 8))
+    assert activity_interval(ACTIVITIES[5]) is None
+
+
+def test_undated_activities_are_not_indexed(index):
+    assert len(index) == 5
+
+
+def test_overlapping_is_half_open(index):
+    assert _ids(index.overlapping("2024-05-06 14:00", "2024-05-06 15:00")) == [1, 4, 2]
+    assert _ids(index.overlapping("2024-05-06 15:00", "2024-05-06 15:10")) == [3]
+    assert _ids(index.overlapping("2024-05-06 13:00", "2024-05-06 14:00")) == []
+
+
+def test_filters(index):
+    assert _ids(index.overlapping("2024-05-06", "2024-05-07", user_id=2)) == [4]
+    assert _ids(index.at("2024-05-06 14:20")) == [1, 4]
+    assert _ids(index.on("2024-05-07")) == [5]
+
+
+def test_conflicts_with(index):
+    assert _ids(index.conflicts_with(ACTIVITIES[0])) == [2]
+    assert _ids(index.conflicts_with(ACTIVITIES[0], user_id=2)) == [4]
+    assert index.conflicts_with(ACTIVITIES[5]) == []
+
+
+def test_conflicts_pair_activities_of_the_same_owner(index):
+    assert {(a.id, b.id) for a, b in index.conflicts()} == {(1, 2)}
+
+
+def test_queries_match_a_scan_of_every_activity():
+    generator = random.Random(7)
+    activities = []
+    for id in range(300):
+        day = f"2024-05-{generator.randint(1, 5):02d}"
+        if generator.random() < 0.1:
+            activities.append(_activity(id, day, user_id=generator.randint(1, 3)))
+        else:
+            time = f"{generator.randint(0, 23):02d}:{generator.choice([0, 15, 30, 45]):02d}"
+            duration = f"{generator.randint(0, 3):02d}:{generator.choice([0, 30]):02d}"
+            activities.append(
+                _activity(id, day, time, duration, user_id=generator.randint(1, 3))
+            )
+
+    index = ActivityIndex(activities)
+    intervals = {activity.id: activity_interval(activity) for activity in activities}
+
+    for _ in range(50):
+        start = datetime(2024, 5, 1) + timedelta(minutes=15 * generator.randint(0, 500))
+        end = start + timedelta(minutes=15 * generator.randint(1, 16))
+        expected = {
+            id for id, (low, high) in intervals.items() if low < end and high > start
+        }
+        assert set(_ids(index.overlapping(start, end))) == expected
+
+    expected_pairs = {
+        frozenset((a.id, b.id))
+        for a in activities
+        for b in activities
+        if a.id < b.id
+        and a.user_id == b.user_id
+        and intervals[a.id][0] < intervals[b.id][1]
+        and intervals[b.id][0] < intervals[a.id][1]
+    }
+    assert {frozenset((a.id, b.id)) for a, b in index.conflicts()} == expected_pairs
@@ -0,0 +1,88 @@
+from pipedrive.dedupe import EMAIL, PHONE, MergeCandidate, _DisjointSet, find_duplicates
+from pipedrive.person import Person
+
+
+def _person(id, emails=(), phones=(), deals=0, activities=0) -> dict:
+    return {
+        "id": id,
+        "email": [{"value": email} for email in emails],
+        "phone": [{"value": phone} for phone in phones],
+        "open_deals_count": deals,
+        "closed_deals_count": 0,
+        "activities_count": activities,
+    }
+
+
+def test_disjoint_set_keeps_the_earliest_root():
+    sets = _DisjointSet()
+    for _ in range(5):
+        sets.add()
+
+    sets.union(3, 4)
+    sets.union(4, 1)
+
+    assert {sets.find(position) for position in (1, 3, 4)} == {1}
+    assert sets.find(0) == 0
+    assert sets.find(2) == 2
+
+
+def test_groups_are_joined_transitively():
+    candidates = find_duplicates(
+        [
+            _person(1, emails=["ada@acme.com"]),
+            _person(2, emails=[" ADA@acme.com "], phones=["+55 11 99999-9999"]),
+            _person(3, phones=["(11) 99999-9999"]),
+            _person(4, emails=["other@acme.com"]),
+        ]
+    )
+
+    assert candidates == [
+        MergeCandidate(
+            survivor_id=1, duplicate_ids=[2, 3], reasons=[EMAIL, PHONE], shared_keys=2
+        )
+    ]
+
+
+def test_survivor_has_the_most_deals_then_activities():
+    candidates = find_duplicates(
+        [
+            _person(1, emails=["a@x.com"], activities=5),
+            _person(2, emails=["a@x.com"], deals=1),
+            _person(3, emails=["a@x.com"], deals=1, activities=2),
+        ]
+    )
+
+    assert candidates[0].survivor_id == 3
+    assert candidates[0].duplicate_ids == [2, 1]
+
+
+def test_keys_to_join_on():
+    records = [_person(1, phones=["+5511999999999"]), _person(2, phones=["11999999999"])]
+
+    assert find_duplicates(records, keys=(EMAIL,)) == []
+    assert find_duplicates(records, keys=(PHONE,))[0].reasons == [PHONE]
+
+
+def test_email_groups_rank_first():
+    candidates = find_duplicates(
+        [
+            _person(1, phones=["+5511999999999"]),
+            _person(2, phones=["+5511999999999"]),
+            _person(3, emails=["b@x.com"]),
+            _person(4, emails=["b@x.com"]),
+        ]
+    )
+
+    assert [candidate.survivor_id for candidate in candidates] == [3, 1]
+
+
+def test_person_objects():
+    persons = [
+        Person(id=2, email="a@x.com"),
+        Person(id=1, emails=["a@x.com"]),
+    ]
+
+    candidates = find_duplicates(persons)
+
+    assert candidates[0].survivor_id == 1
+    assert candidates[0].duplicate_ids == [2]
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from pipedrive.diff import (
+    CREATED,
+    DELETED,
+    OWNER_CHANGED,
+    STAGE_CHANGED,
+    STATUS_CHANGED,
+    VALUE_CHANGED,
+    Change,
+    diff,
+    summarize,
+)
+from pipedrive.snapshot import Snapshot
+
+OLD = [
+    {"id": 1, "stage_id": 10, "owner_id": 7, "value": 100, "status": "open"},
+    {"id": 2, "stage_id": 10, "owner_id": 7, "value": 100, "status": "open"},
+    {"id": 4, "stage_id": 11, "owner_id": 8, "value": None, "status": "open"},
+]
+NEW = [
+    {"id": 4, "stage_id": 12, "owner_id": 9, "value": 50, "status": "won"},
+    {"id": 1, "stage_id": 10, "owner_id": 7, "value": 100, "status": "open"},
+    {"id": 3, "stage_id": 10, "owner_id": 7, "value": 0, "status": "open"},
+]
+
+EXPECTED = [
+    Change(DELETED, 2),
+    Change(CREATED, 3),
+    Change(STAGE_CHANGED, 4, "stage_id", 11, 12),
+    Change(OWNER_CHANGED, 4, "owner_id", 8, 9),
+    Change(VALUE_CHANGED, 4, "value", None, 50),
+    Change(STATUS_CHANGED, 4, "status", "open", "won"),
+]
+
+
+def test_records():
+    assert list(diff(OLD, NEW)) == EXPECTED
+
+
+def test_mirrors():
+    old = {row["id"]: row for row in OLD}
+    new = {row["id"]: row for row in NEW}
+
+    assert list(diff(old, new)) == EXPECTED
+
+
+def test_snapshots(tmp_path):
+    with Snapshot.write(str(tmp_path / "old.snap"), OLD) as old, Snapshot.write(
+        str(tmp_path / "new.snap"), NEW
+    ) as new:
+        assert list(diff(old, new)) == EXPECTED
+        assert list(diff(old, NEW)) == EXPECTED
+
+
+def test_custom_fields():
+    changes = diff(OLD, NEW, fields={"value": VALUE_CHANGED})
+
+    assert [change.kind for change in changes] == [DELETED, CREATED, VALUE_CHANGED]
+
+
+def test_summarize():
+    assert summarize(diff(OLD, NEW)) == {
+        DELETED: 1,
+        CREATED: 1,
+        STAGE_CHANGED: 1,
+        OWNER_CHANGED: 1,
+        VALUE_CHANGED: 1,
+        STATUS_CHANGED: 1,
+    }
+
+
+def _naive(old: list, new: list) -> list:
+    old = {row["id"]: row for row in old}
+    new = {row["id"]: row for row in new}
+
+    changes = []
+    for id in sorted(old.keys() | new.keys()):
+        if id not in new:
+            changes.append(Change(DELETED, id))
+        elif id not in old:
+            changes.append(Change(CREATED, id))
+        elif old[id]["stage_id"] != new[id]["stage_id"]:
+            changes.append(
+                Change(STAGE_CHANGED, id, "stage_id", old[id]["stage_id"], new[id]["stage_id"])
+            )
+    return changes
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000])
+def test_blocks_match_a_naive_comparison(chunk_size):
+    generator = random.Random(chunk_size)
+    old = [
+        {"id": id, "stage_id": generator.randint(1, 3)}
+        for id in generator.sample(range(300), 120)
+    ]
+    new = [
+        {"id": id, "stage_id": generator.randint(1, 3)}
+        for id in generator.sample(range(300), 120)
+    ]
+
+    changes = diff(old, new, fields={"stage_id": STAGE_CHANGED}, chunk_size=chunk_size)
+
+    assert list(changes) == _naive(old, new)
@@ -0,0 +1,99 @@
+import random
+from typing import NamedTuple, Optional
+
+import pytest
+
+from pipedrive.name_index import NameIndex, normalize_name, trigrams
+
+
+class Record(NamedTuple):
+    id: int
+    name: Optional[str]
+
+
+NAMES = [
+    "ACME, Inc.",
+    "Acme Brasil Ltda",
+    "Café & Co",
+    "Globex Corporation",
+    "Initech S.A.",
+    "",
+    None,
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(Record(id, name) for id, name in enumerate(NAMES))
+
+
+def test_normalize_name():
+    assert normalize_name("ACME, Inc.") == "acme"
+    assert normalize_name("Café & Co") == "cafe and"
+    assert normalize_name("Initech S.A.") == "initech"
+    assert normalize_name("Ltda") == "ltda"
+    assert normalize_name(None) == ""
+
+
+def test_exact(index):
+    assert [record.id for record in index.exact("acme inc")] == [0]
+    assert index.exact("") == []
+
+
+def test_search_ranks_by_similarity(index):
+    matches = index.search("Acme", threshold=0.2)
+
+    assert [match.record.id for match in matches] == [0, 1]
+    assert matches[0].score == 1.0
+    assert matches[0].name == "acme"
+    assert 0.2 <= matches[1].score < 1.0
+
+
+def test_threshold_and_limit(index):
+    assert [match.record.id for match in index.search("Acme", threshold=0.9)] == [0]
+    assert len(index.search("Acme", limit=1, threshold=0.2)) == 1
+    assert index.search("Umbrella") == []
+    assert index.search("") == []
+
+
+def test_best(index):
+    assert index.best("Globex Corp").record.id == 3
+    assert index.best("Globe", threshold=0.95) is None
+
+
+def test_add_replaces_and_remove(index):
+    index.add(Record(3, "Umbrella Corporation"))
+
+    assert index.best("Globex Corporation") is None
+    assert index.best("Umbrella Corporation").record.id == 3
+
+    index.remove(3)
+    assert index.search("Umbrella Corporation") == []
+    assert len(index) == len(NAMES) - 1
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+@pytest.mark.parametrize("threshold", [0.2, 0.4, 0.6, 0.8])
+def test_search_matches_a_scan_of_every_name(threshold):
+    generator = random.Random(threshold)
+    words = ["acme", "acne", "globex", "globe", "init", "initech", "cafe", "co"]
+    names = [
+        " ".join(generator.choice(words) for _ in range(generator.randint(1, 3)))
+        for _ in range(200)
+    ]
+    index = NameIndex(Record(id, name) for id, name in enumerate(names))
+
+    for query in words + ["acme globex", "cafe co init"]:
+        query_grams = trigrams(normalize_name(query))
+        expected = {
+            id
+            for id, name in enumerate(names)
+            if _jaccard(query_grams, trigrams(normalize_name(name))) >= threshold
+        }
+
+        matches = index.search(query, limit=len(names), threshold=threshold)
+
+        assert {match.record.id for match in matches} == expected
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+from pipedrive.rate_limit import ConcurrencyLimiter, RateLimiter
+from pipedrive.scheduling import BACKGROUND, INTERACTIVE, NORMAL
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+def test_rate_limiter_validates_arguments():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+    with pytest.raises(ValueError):
+        RateLimiter(10, reserved=1)
+
+
+def test_reserved_share_is_left_for_interactive_requests():
+    limiter = RateLimiter(rate=0.001, burst=10, reserved=0.2)
+
+    taken = 0
+    while limiter.try_acquire(NORMAL):
+        taken += 1
+
+    assert taken == 8
+    assert not limiter.try_acquire(BACKGROUND)
+    assert limiter.try_acquire(INTERACTIVE)
+    assert limiter.try_acquire(INTERACTIVE)
+    assert not limiter.try_acquire(INTERACTIVE)
+
+
+def test_pause_holds_back_all_but_interactive_requests():
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.pause(60)
+
+    assert not limiter.try_acquire(NORMAL)
+    assert not limiter.try_acquire(BACKGROUND)
+    assert limiter.try_acquire(INTERACTIVE)
+
+
+def test_concurrency_limiter_validates_bounds():
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(maximum=2, minimum=3)
+
+
+def test_smooth_responses_grow_the_limit_additively():
+    limiter = ConcurrencyLimiter(maximum=8, initial=4)
+
+    started = limiter.acquire()
+    limiter.release(started, latency=0.1)
+
+    assert limiter._limit == pytest.approx(4.25)
+    assert limiter.snapshot()["increases"] == 1
+
+
+def test_limit_never_exceeds_maximum():
+    limiter = ConcurrencyLimiter(maximum=2, initial=2)
+
+    for _ in range(10):
+        limiter.release(limiter.acquire(), latency=0.1)
+
+    assert limiter.limit == 2
+
+
+def test_congestion_halves_the_limit_once_per_round_trip():
+    limiter = ConcurrencyLimiter(maximum=16, initial=16)
+
+    first = limiter.acquire()
+    second = limiter.acquire()
+    limiter.release(first, latency=0.1, throttled=True)
+    # Started before the decrease, so it reports the same congestion.
+    limiter.release(second, latency=0.1, throttled=True)
+
+    assert limiter.limit == 8
+    assert limiter.snapshot()["decreases"] == 1
+
+    limiter.release(limiter.acquire(), latency=0.1, failed=True)
+    assert limiter.limit == 4
+
+
+def test_limit_stays_at_minimum():
+    limiter = ConcurrencyLimiter(maximum=4, minimum=2, initial=2)
+
+    limiter.release(limiter.acquire(), latency=0.1, throttled=True)
+
+    assert limiter.limit == 2
+
+
+def test_low_budget_and_latency_count_as_congestion():
+    limiter = ConcurrencyLimiter(maximum=8)
+    limiter.release(limiter.acquire(), latency=0.1, budget=0.05)
+    assert limiter.limit == 4
+
+    limiter = ConcurrencyLimiter(maximum=8, latency_tolerance=3.0)
+    limiter.release(limiter.acquire(), latency=0.1)
+    # Slow answers while another request is in flight leave the baseline
+    # where it is.
+    held = limiter.acquire()
+    limiter.release(limiter.acquire(), latency=2.0)
+    assert limiter.snapshot()["baseline_latency"] == 0.1
+    assert limiter.limit < 8
+    limiter.release(held, latency=0.1)
+
+
+def test_baseline_follows_unloaded_latency_upwards():
+    limiter = ConcurrencyLimiter(maximum=8)
+
+    limiter.release(limiter.acquire(), latency=0.1)
+    for _ in range(50):
+        limiter.release(limiter.acquire(), latency=0.5)
+
+    assert limiter.snapshot()["baseline_latency"] == pytest.approx(0.5, abs=0.01)
+    assert limiter.limit == 8
+
+
+def test_throttled_samples_do_not_move_the_latency_baseline():
+    limiter = ConcurrencyLimiter(maximum=8)
+
+    limiter.release(limiter.acquire(), latency=0.5)
+    limiter.release(limiter.acquire(), latency=0.001, throttled=True)
+
+    assert limiter.snapshot()["baseline_latency"] == 0.5
+
+
+def test_waiting_requests_are_served_by_priority():
+    limiter = ConcurrencyLimiter(maximum=1)
+    held = limiter.acquire()
+    order = []
+
+    def request(level: int) -> None:
+        started = limiter.acquire(level)
+        order.append(level)
+        limiter.release(started, latency=0.0)
+
+    background = threading.Thread(target=request, args=(BACKGROUND,))
+    background.start()
+    _wait_for(lambda: limiter._waiting[BACKGROUND] == 1)
+
+    interactive = threading.Thread(target=request, args=(INTERACTIVE,))
+    interactive.start()
+    _wait_for(lambda: limiter._waiting[INTERACTIVE] == 1)
+
+    limiter.release(held, latency=0.0)
+    background.join(2)
+    interactive.join(2)
+
+    assert order == [INTERACTIVE, BACKGROUND]
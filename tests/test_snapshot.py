@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+from pipedrive.deal import Deal
+from pipedrive.proxy import _proxy_class
+from pipedrive.snapshot import Snapshot
+
+ROWS = [
+    {"id": 3, "title": "Acme", "value": 10, "score": 0.5, "won": True, "tags": ["a"]},
+    {"id": 1, "title": "Café", "value": None, "score": 2, "won": None, "tags": None},
+    {"id": 2, "title": None, "value": 4.0, "score": None, "won": False, "tags": {"k": 1}},
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = Snapshot.write(str(tmp_path / "deals.snap"), ROWS, entity="deal")
+    yield snapshot
+    snapshot.close()
+
+
+def test_round_trip(snapshot):
+    assert len(snapshot) == 3
+    assert snapshot.entity == "deal"
+    assert [record.to_dict() for record in snapshot] == [
+        {"id": 3, "title": "Acme", "value": 10, "score": 0.5, "won": True, "tags": ["a"]},
+        {"id": 1, "title": "Café", "value": None, "score": 2.0, "won": None, "tags": None},
+        {"id": 2, "title": None, "value": 4, "score": None, "won": False, "tags": {"k": 1}},
+    ]
+
+
+def test_column_kinds(snapshot):
+    assert snapshot.kinds == {
+        "id": "int",
+        "title": "string",
+        "value": "int",
+        "score": "float",
+        "won": "bool",
+        "tags": "json",
+    }
+    assert math.isnan(snapshot.column("score")[2])
+
+
+def test_whole_floats_keep_ints(snapshot):
+    value = snapshot.get(2).value
+    assert value == 4 and type(value) is int
+
+
+def test_get_by_id_and_index(snapshot):
+    assert snapshot.get(1).title == "Café"
+    assert snapshot.get(99) is None
+    assert snapshot[-1].id == 2
+    with pytest.raises(IndexError):
+        snapshot[3]
+    with pytest.raises(AttributeError):
+        snapshot[0].missing
+
+
+def test_rows_with_different_fields(tmp_path):
+    path = str(tmp_path / "rows.snap")
+    with Snapshot.write(path, [{"id": 1}, {"id": 2, "extra": "x"}]) as snapshot:
+        assert [record.to_dict() for record in snapshot] == [
+            {"id": 1, "extra": None},
+            {"id": 2, "extra": "x"},
+        ]
+
+
+def test_empty_snapshot(tmp_path):
+    with Snapshot.write(str(tmp_path / "empty.snap"), []) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.fields == []
+
+
+def test_entity_and_load_from_objects(tmp_path):
+    deal = Deal(id=5, title="Acme", value=100)
+    lazy_deal = _proxy_class(Deal)(id=6, title="Lazy")
+
+    path = str(tmp_path / "objects.snap")
+    with Snapshot.write(path, [deal, lazy_deal]) as snapshot:
+        assert snapshot.entity == "deal"
+
+        loaded = snapshot.get(5).load()
+        assert isinstance(loaded, Deal)
+        assert loaded.title == "Acme"
+        assert loaded.value == 100
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.snap"
+    path.write_bytes(b"not a snapshot")
+
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
@@ -0,0 +1,108 @@
+import pytest
+
+from pipedrive import unit_of_work
+from pipedrive.client import Client
+from pipedrive.deal import Deal
+from pipedrive.unit_of_work import UpdateBuffer, _Pending
+
+
+@pytest.fixture
+def client():
+    return Client(company_domain="acme", api_key="key")
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """PUTs a flush would send, as (client domain, entity id, payload)."""
+
+    calls = []
+
+    def send(pending):
+        calls.append(
+            (pending.client.config.company_domain, pending.record.id, pending.kwargs)
+        )
+        return pending.record
+
+    monkeypatch.setattr(unit_of_work, "_send", send)
+    return calls
+
+
+def test_later_values_win_and_notes_and_participants_accumulate():
+    pending = _Pending(record=None, client=None)
+
+    pending.merge({"subject": "a", "note": "first", "participants_ids": [1, 2]})
+    pending.merge({"subject": "b", "note": None, "participants_ids": [2, 3]})
+    pending.merge({"note": "second", "done": True})
+
+    assert pending.kwargs == {
+        "subject": "b",
+        "note": "first / second",
+        "participants_ids": [1, 2, 3],
+        "done": True,
+    }
+    assert pending.updates == 3
+
+
+def test_updates_to_one_record_are_coalesced(client, sent):
+    with client.activate(), UpdateBuffer() as buffer:
+        deal = Deal(id=7)
+        buffer.enqueue(deal, {"title": "a"})
+        buffer.enqueue(deal, {"title": "b", "value": 1})
+        buffer.enqueue(Deal(id=8), {"value": 2})
+
+    assert sent == [("acme", 7, {"title": "b", "value": 1}), ("acme", 8, {"value": 2})]
+    assert buffer.report.updates == 3
+    assert buffer.report.requests == 2
+    assert buffer.report.saved == 1
+    assert set(buffer.report.results) == {("deal", 7), ("deal", 8)}
+
+
+def test_same_id_under_two_clients_stays_apart(client, sent):
+    other = Client(company_domain="globex", api_key="key")
+
+    with UpdateBuffer() as buffer:
+        with client.activate():
+            buffer.enqueue(Deal(id=7), {"title": "a"})
+        with other.activate():
+            buffer.enqueue(Deal(id=7), {"title": "b"})
+
+    assert sorted(sent) == [("acme", 7, {"title": "a"}), ("globex", 7, {"title": "b"})]
+
+
+def test_max_pending_flushes_early(client, sent):
+    with client.activate(), UpdateBuffer(max_pending=2) as buffer:
+        buffer.enqueue(Deal(id=1), {"value": 1})
+        buffer.enqueue(Deal(id=2), {"value": 2})
+        assert len(sent) == 2
+        buffer.enqueue(Deal(id=3), {"value": 3})
+
+    assert len(sent) == 3
+
+
+def test_error_in_the_block_discards_queued_updates(client, sent):
+    with pytest.raises(KeyError), client.activate():
+        with UpdateBuffer() as buffer:
+            buffer.enqueue(Deal(id=7), {"title": "a"})
+            raise KeyError("boom")
+
+    assert sent == []
+    assert len(buffer) == 0
+
+
+def test_flush_on_error(client, sent):
+    with pytest.raises(KeyError), client.activate():
+        with UpdateBuffer(flush_on_error=True) as buffer:
+            buffer.enqueue(Deal(id=7), {"title": "a"})
+            raise KeyError("boom")
+
+    assert sent == [("acme", 7, {"title": "a"})]
+
+
+def test_deal_update_is_queued_inside_the_block(client, sent):
+    deal = Deal(id=7, title="old")
+
+    with client.activate(), UpdateBuffer():
+        assert deal.update(title="new") is deal
+        assert sent == []
+
+    assert sent == [("acme", 7, {"title": "new"})]